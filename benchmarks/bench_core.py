@@ -0,0 +1,90 @@
+"""
+Core processing benchmark: throughput and peak memory of `JSONProcessor`,
+`NDJSONProcessor` and `DocumentProfile` over synthetic inputs (see generators.py).
+
+Every (shape, size, operation) case runs in a fresh process, so the peak
+RSS growth reported for it is not hidden by an earlier, bigger case.
+
+    python benchmarks/bench_core.py
+    python benchmarks/bench_core.py --sizes 1MB,100MB,500MB --shapes records,ndjson
+    python benchmarks/bench_core.py --save main        # write baselines/main.json
+    python benchmarks/bench_core.py --compare main     # exit code 1 on regressions
+"""
+
+import argparse
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from common import BenchResult, add_baseline_arguments, best_of, finish, repeats_for
+from generators import SHAPES, parse_size
+
+from tjson.core.metrics import peak_memory_bytes
+from tjson.core.ndjson import NDJSONProcessor
+from tjson.core.processor import JSONProcessor
+from tjson.core.profile import DocumentProfile
+
+DEFAULT_SIZES = "1KB,64KB,1MB,16MB"
+
+# Operations timed for every document shape; NDJSON has its own
+OPERATIONS = {
+    "pretty": lambda data: JSONProcessor.process(data, use_cache=False),
+    "minify": lambda data: JSONProcessor.process(data, minify=True, use_cache=False),
+    "pretty_bytes": lambda data: JSONProcessor.process_bytes(data, use_cache=False),
+    "minify_bytes": lambda data: JSONProcessor.process_bytes(data, minify=True, use_cache=False),
+    "validate": JSONProcessor.validate,
+    "profile": lambda data: DocumentProfile(JSONProcessor.parse(data, use_cache=False)),
+}
+
+
+def _consume_ndjson(data: bytes) -> None:
+    for _ in NDJSONProcessor.process_stream(data):
+        pass
+
+
+def operations_for(shape: str) -> list[str]:
+    return ["stream"] if shape == "ndjson" else list(OPERATIONS)
+
+
+def run_case(shape: str, size_name: str, operation: str) -> BenchResult:
+    """Runs in a child process: generates the input, then times the operation."""
+    data = SHAPES[shape](parse_size(size_name))
+    function = _consume_ndjson if operation == "stream" else OPERATIONS[operation]
+
+    before = peak_memory_bytes()
+    seconds = best_of(lambda: function(data), repeats_for(len(data)))
+    after = peak_memory_bytes()
+    return BenchResult(
+        case=f"core/{shape}/{size_name}/{operation}",
+        seconds=seconds,
+        input_bytes=len(data),
+        peak_rss_bytes=None if before is None else after - before,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma separated (default {DEFAULT_SIZES})")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma separated (default all)")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    shapes = args.shapes.split(",")
+    unknown = set(shapes) - set(SHAPES)
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(sorted(unknown))}")
+
+    results: list[BenchResult] = []
+    context = multiprocessing.get_context("spawn")
+    for size_name in args.sizes.split(","):
+        for shape in shapes:
+            for operation in operations_for(shape):
+                print(f"running {shape} {size_name} {operation}...", file=sys.stderr)
+                # A fresh process per case, so each gets its own peak RSS
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    results.append(pool.submit(run_case, shape, size_name, operation).result())
+    return finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+Query engine benchmark.
+
+Builds a synthetic Kubernetes-style API dump (default 100MB), parses it once
+the way the TUI does, then times compiling and evaluating a few typical
+queries against the parsed tree, with and without rendering the matches.
+
+    python benchmarks/bench_query.py [--size-mb 100] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import orjson
+
+from tjson.core.processor import JSONProcessor
+from tjson.core.query import QueryEngine
+from tjson.utils import format_size
+
+QUERIES = [
+    ".items[*].metadata.name",
+    ".items[-1].status.conditions[0].type",
+    ".items[100:200].spec.containers[*].image",
+    "$..image",
+]
+
+
+def make_item(i: int) -> dict:
+    return {
+        "apiVersion": "v1",
+        "kind": "Pod",
+        "metadata": {
+            "name": f"worker-{i:08d}",
+            "namespace": f"team-{i % 40}",
+            "labels": {"app": f"svc-{i % 300}", "tier": "backend", "release": "stable"},
+            "uid": f"{i:032x}",
+        },
+        "spec": {
+            "containers": [
+                {
+                    "name": "main",
+                    "image": f"registry.local/svc-{i % 300}:1.{i % 17}",
+                    "ports": [{"containerPort": 8080, "protocol": "TCP"}],
+                    "env": [{"name": f"VAR_{k}", "value": str(k * i)} for k in range(4)],
+                },
+                {"name": "sidecar", "image": "registry.local/proxy:2.4", "args": ["--v=2"]},
+            ],
+            "nodeName": f"node-{i % 97}",
+        },
+        "status": {
+            "phase": "Running",
+            "conditions": [{"type": "Ready", "status": "True"}, {"type": "Scheduled", "status": "True"}],
+        },
+    }
+
+
+def make_document(size_bytes: int) -> bytes:
+    sample = len(orjson.dumps(make_item(0)))
+    count = max(size_bytes // sample, 1)
+    return orjson.dumps({"kind": "List", "items": [make_item(i) for i in range(count)]})
+
+
+def timed(function) -> tuple[float, object]:
+    start = time.perf_counter()
+    value = function()
+    return time.perf_counter() - start, value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=100)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per query (best is reported)")
+    args = parser.parse_args()
+
+    data = make_document(int(args.size_mb * 1024 * 1024))
+    parse_seconds, _ = timed(lambda: JSONProcessor.parse(data))
+    lookup_seconds, _ = timed(lambda: JSONProcessor.parse(data))
+    print(
+        f"input {format_size(len(data))}: parsed in {parse_seconds * 1000:.0f} ms, "
+        f"cached tree lookup {lookup_seconds * 1000:.0f} ms\n"
+    )
+
+    print(f"{'query':<45} {'compile':>9} {'matches':>10} {'evaluate':>10} {'+render':>10}")
+    for query in QUERIES:
+        QueryEngine.compile.cache_clear()
+        compile_seconds, _ = timed(lambda: QueryEngine.compile(query))
+        tree = JSONProcessor.parse(data)  # Cache hit: no reparse per query
+
+        evaluate, render = [], []
+        matches = 0
+        for _ in range(args.repeat):
+            seconds, matches = timed(lambda: sum(1 for _ in QueryEngine.evaluate(query, tree)))
+            evaluate.append(seconds)
+            seconds, _ = timed(
+                lambda: b"".join(
+                    orjson.dumps(match, option=orjson.OPT_APPEND_NEWLINE)
+                    for match in QueryEngine.evaluate(query, tree)
+                )
+            )
+            render.append(seconds)
+
+        print(
+            f"{query:<45} {compile_seconds * 1e6:>7.0f} µs {matches:>10,} "
+            f"{min(evaluate) * 1000:>7.1f} ms {min(render) * 1000:>7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Cold start benchmark: how long a fresh `tjson` process takes to be useful.
+
+    headless     `python -m tjson check -q tiny.json`, end to end
+    import-cli   cumulative `-X importtime` of tjson.cli (the headless entry point)
+    import-app   cumulative `-X importtime` of tjson.app (the TUI)
+    first-frame  process start until the TUI's first frame (headless driver)
+
+Each is the best of several fresh interpreters. The run also checks the
+modules meant to load on first use: the headless start must not import
+Textual, pyperclip or multiprocessing, and the first frame must not import
+the dialogs, diff mode, the clipboard, NDJSON or the query engine.
+
+Exits with status 1 when a time is over its budget (--budget-*; the defaults
+leave room for a slow laptop, CI can pass its own) or a lazy module was
+imported eagerly. --save / --compare work as in the other benchmarks.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --budget-headless-ms 150 --compare main
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import orjson
+
+from common import BenchResult, add_baseline_arguments, finish
+
+REPEATS = 5
+
+# Milliseconds; generous on purpose, regressions are caught with --compare
+DEFAULT_BUDGET_HEADLESS_MS = 400
+DEFAULT_BUDGET_FIRST_FRAME_MS = 2000
+
+# Modules (and their submodules) that must not be imported at that point
+LAZY_HEADLESS = (
+    "textual",
+    "pyperclip",
+    "tree_sitter",
+    "multiprocessing",
+    "tjson.ui",
+    "tjson.core.ndjson",
+    "tjson.core.profile",
+)
+LAZY_FIRST_FRAME = (
+    "pyperclip",
+    "tjson.services.clipboard",
+    "tjson.ui.screens.file_picker",
+    "tjson.ui.screens.file_prompt",
+    "tjson.ui.screens.diff_screen",
+    "tjson.ui.screens.profile_screen",
+    "tjson.core.ndjson",
+    "tjson.core.query",
+    "tjson.core.diff",
+    "tjson.core.profile",
+)
+
+# Runs in the child: prints a line at the first frame, then the loaded modules
+FIRST_FRAME_SCRIPT = """
+import sys
+from tjson.app import TJSONApp
+
+app = TJSONApp()
+
+async def first_frame(pilot):
+    await pilot.pause()
+    print("frame", flush=True)
+    print(" ".join(sorted(sys.modules)), flush=True)
+    app.exit()
+
+app.run(headless=True, auto_pilot=first_frame, size=(160, 50))
+"""
+
+
+def child_env() -> dict[str, str]:
+    # Benchmarks run from a checkout: make sure the children see the same tjson
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source, env.get("PYTHONPATH")]))
+    return env
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """Cumulative import time of `module` in seconds, and every module it loaded."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=child_env(),
+        check=True,
+    )
+    cumulative = 0.0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, microseconds, name = line.split("|")
+        modules.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(microseconds) / 1e6
+    return cumulative, modules
+
+
+def headless_start(path: str) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "tjson", "check", "-q", path],
+        capture_output=True,
+        env=child_env(),
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def first_frame() -> tuple[float, set[str]]:
+    """Seconds from spawning the TUI until its first frame, and the modules loaded by then."""
+    start = time.perf_counter()
+    child = subprocess.Popen(
+        [sys.executable, "-c", FIRST_FRAME_SCRIPT],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=child_env(),
+    )
+    try:
+        if child.stdout.readline().strip() != "frame":
+            raise RuntimeError("the TUI exited before its first frame")
+        seconds = time.perf_counter() - start
+        modules = set(child.stdout.readline().split())
+    finally:
+        child.wait(timeout=30)
+    return seconds, modules
+
+
+def eager_imports(modules: set[str], lazy: tuple[str, ...]) -> list[str]:
+    """The entries of `lazy` found (themselves or a submodule) among `modules`."""
+    return [
+        prefix
+        for prefix in lazy
+        if any(name == prefix or name.startswith(prefix + ".") for name in modules)
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeats", type=int, default=REPEATS, help=f"fresh processes per case (default {REPEATS})")
+    parser.add_argument("--budget-headless-ms", type=float, default=DEFAULT_BUDGET_HEADLESS_MS)
+    parser.add_argument("--budget-first-frame-ms", type=float, default=DEFAULT_BUDGET_FIRST_FRAME_MS)
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="tjson-bench-") as directory:
+        path = os.path.join(directory, "tiny.json")
+        with open(path, "wb") as f:
+            f.write(orjson.dumps({"ok": True}))
+        headless = min(headless_start(path) for _ in range(args.repeats))
+
+    cli_runs = [import_time("tjson.cli") for _ in range(args.repeats)]
+    app_runs = [import_time("tjson.app") for _ in range(args.repeats)]
+    frame_runs = [first_frame() for _ in range(args.repeats)]
+
+    results = [
+        BenchResult("startup/headless", headless),
+        BenchResult("startup/import-cli", min(seconds for seconds, _ in cli_runs)),
+        BenchResult("startup/import-app", min(seconds for seconds, _ in app_runs)),
+        BenchResult("startup/first-frame", min(seconds for seconds, _ in frame_runs)),
+    ]
+    status = finish(args, results)
+
+    failures = []
+    if headless * 1000 > args.budget_headless_ms:
+        failures.append(f"headless start {headless * 1000:.0f} ms > budget {args.budget_headless_ms:.0f} ms")
+    frame = results[-1].seconds
+    if frame * 1000 > args.budget_first_frame_ms:
+        failures.append(f"first frame {frame * 1000:.0f} ms > budget {args.budget_first_frame_ms:.0f} ms")
+    for name in eager_imports(cli_runs[0][1], LAZY_HEADLESS):
+        failures.append(f"headless start imports {name}")
+    for name in eager_imports(frame_runs[0][1], LAZY_FIRST_FRAME):
+        failures.append(f"first frame imports {name}")
+
+    print()
+    for failure in failures:
+        print(f"BUDGET: {failure}")
+    print(f"{len(failures)} budget failure(s)")
+    return 1 if failures else status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""
+End-to-end TUI latency benchmark, driven headless through Textual's
+`run_test` pilot.
+
+Three scenarios per (shape, size), each timed until the output pane shows
+the new result:
+
+    paste      the whole document replaces the editor text
+               (edit -> debounce -> worker -> update_ui_with_result)
+    keystroke  one character typed into an already processed document
+    load       the document is opened as a file (read -> process -> index)
+
+Documents are pretty printed first, as files being edited usually are
+(`--minified` keeps them on one line, a much harder case for the editor).
+Paste and keystroke only run up to EDITOR_LOAD_LIMIT; bigger documents are
+never edited in the TUI. The phase breakdown of the last run is printed to
+stderr, the same numbers the performance HUD shows.
+
+    python benchmarks/bench_ui.py
+    python benchmarks/bench_ui.py --sizes 1MB,100MB --shapes records --compare main
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import orjson
+
+from common import BenchResult, add_baseline_arguments, finish
+from generators import SHAPES, parse_size
+
+from tjson.app import TJSONApp
+from tjson.config import EDITOR_LOAD_LIMIT
+from tjson.core.processor import JSONProcessor
+from tjson.ui.screens.main_screen import MainScreen
+from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.output_viewer import OutputViewer
+
+DEFAULT_SIZES = "1KB,64KB,1MB,16MB"
+DEFAULT_SHAPES = "records,many_keys,ndjson"
+SCENARIOS = ("paste", "keystroke", "load")
+
+# Give up on a single run after this long
+TIMEOUT_SECONDS = 600
+POLL_SECONDS = 0.005
+
+
+def repeats_for(size: int) -> int:
+    # The UI is slower and noisier than the core: fewer, but more than one
+    return 5 if size <= 1024 * 1024 else 1
+
+
+async def wait_for_output(pilot, screen: MainScreen, previous) -> None:
+    """Waits until the output shows a new buffer and no run or load is in flight."""
+    view = screen.query_one("#output-pane", OutputViewer).line_view
+    deadline = time.perf_counter() + TIMEOUT_SECONDS
+    while view.index is previous or screen.processing_busy or screen.file_loader:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("the output was not updated in time")
+        await pilot.pause(POLL_SECONDS)
+
+
+def report_phases(case: str, screen: MainScreen) -> None:
+    runs = screen.metrics.latest(1)
+    if runs:
+        phases = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in runs[0].phases.items())
+        print(f"  {case}: {phases}", file=sys.stderr)
+
+
+async def run_scenario(case: str, scenario: str, ndjson: bool, data: bytes, path: str) -> BenchResult:
+    app = TJSONApp()
+    best = float("inf")
+    async with app.run_test(size=(160, 50)) as pilot:
+        screen = app.screen
+        assert isinstance(screen, MainScreen)
+        output = screen.query_one("#output-pane", OutputViewer)
+        input_pane = screen.query_one("#input-pane", EditorPane)
+        if ndjson and scenario != "load":
+            screen.query_one("#ndjson-switch").value = True
+        await pilot.pause()
+
+        text = data.decode("utf-8")
+        if scenario == "keystroke":
+            input_pane.set_text(text)
+            await wait_for_output(pilot, screen, None)
+            input_pane.text_area.focus()
+            input_pane.text_area.move_cursor((0, 0))
+
+        for i in range(repeats_for(len(data))):
+            previous = output.line_view.index
+            start = time.perf_counter()
+            if scenario == "paste":
+                # Trailing whitespace keeps every repeat a cache miss
+                input_pane.set_text(text + " " * (i + 1))
+            elif scenario == "keystroke":
+                await pilot.press("space")
+            else:
+                screen.load_file_content(path)
+            await wait_for_output(pilot, screen, previous)
+            best = min(best, time.perf_counter() - start)
+            if scenario == "load":
+                # The next repeat would otherwise be a cache hit
+                JSONProcessor.clear_cache()
+        report_phases(case, screen)
+    return BenchResult(case=case, seconds=best, input_bytes=len(data))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma separated (default {DEFAULT_SIZES})")
+    parser.add_argument("--shapes", default=DEFAULT_SHAPES, help=f"comma separated (default {DEFAULT_SHAPES})")
+    parser.add_argument(
+        "--scenarios", default=",".join(SCENARIOS), help="comma separated (default all)"
+    )
+    parser.add_argument("--minified", action="store_true", help="keep documents on a single line")
+    add_baseline_arguments(parser)
+    args = parser.parse_args(argv)
+
+    results: list[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="tjson-bench-") as directory:
+        for size_name in args.sizes.split(","):
+            for shape in args.shapes.split(","):
+                data = SHAPES[shape](parse_size(size_name))
+                if shape != "ndjson" and not args.minified:
+                    data = orjson.dumps(orjson.loads(data), option=orjson.OPT_INDENT_2)
+                variant = f"{shape}-minified" if args.minified and shape != "ndjson" else shape
+                extension = ".ndjson" if shape == "ndjson" else ".json"
+                path = os.path.join(directory, f"{shape}-{size_name}{extension}")
+                with open(path, "wb") as f:
+                    f.write(data)
+
+                for scenario in args.scenarios.split(","):
+                    if scenario != "load" and len(data) > EDITOR_LOAD_LIMIT:
+                        continue
+                    case = f"ui/{variant}/{size_name}/{scenario}"
+                    print(f"running {case}...", file=sys.stderr)
+                    results.append(
+                        asyncio.run(run_scenario(case, scenario, shape == "ndjson", data, path))
+                    )
+                os.remove(path)
+    return finish(args, results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
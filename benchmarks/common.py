@@ -0,0 +1,169 @@
+"""Result files, baselines and the comparison report shared by the benchmarks."""
+
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+import orjson
+
+from tjson.utils import format_size
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+# Slower (or bigger) than the baseline by more than this counts as a regression
+DEFAULT_THRESHOLD = 0.15
+# Differences below these are timer and allocator noise, never a regression
+TIME_NOISE_SECONDS = 0.001
+RSS_NOISE_BYTES = 1024 * 1024
+
+
+@dataclass
+class BenchResult:
+    case: str  # Unique id, e.g. "core/records/16MB/pretty"
+    seconds: float  # Best of the repeats
+    input_bytes: int = 0
+    peak_rss_bytes: Optional[int] = None  # Growth of the peak RSS during the case
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.input_bytes / self.seconds / 1024 / 1024 if self.seconds else 0.0
+
+
+def best_of(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def repeats_for(size: int) -> int:
+    """More repeats for small inputs, where timings are noisy."""
+    if size <= 64 * 1024:
+        return 20
+    if size <= 16 * 1024 * 1024:
+        return 5
+    return 1
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f} µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def print_results(results: list[BenchResult]) -> None:
+    print(f"{'case':<44} {'time':>10} {'throughput':>12} {'peak RSS +':>11}")
+    for result in results:
+        throughput = f"{result.mb_per_second:.1f} MB/s" if result.input_bytes else "-"
+        rss = format_size(result.peak_rss_bytes) if result.peak_rss_bytes is not None else "-"
+        print(
+            f"{result.case:<44} {format_seconds(result.seconds):>10} {throughput:>12} {rss:>11}"
+        )
+
+
+# --- BASELINES ---
+
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith(".json") else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(name: str, results: list[BenchResult]) -> str:
+    """Merges `results` into the named baseline (other cases are kept)."""
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    existing = load_baseline(name) or {}
+    existing.update({result.case: asdict(result) for result in results})
+    document = {
+        "machine": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "saved_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": existing,
+    }
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(document, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    return path
+
+
+def load_baseline(name: str) -> Optional[dict[str, dict]]:
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())["results"]
+
+
+def compare(name: str, results: list[BenchResult], threshold: float = DEFAULT_THRESHOLD) -> int:
+    """
+    Prints each case against the baseline. Returns the number of regressions:
+    cases slower, or with a peak RSS growth larger, than baseline * (1 + threshold).
+    """
+    baseline = load_baseline(name)
+    if baseline is None:
+        print(f"No baseline named {name!r} ({baseline_path(name)})")
+        return 0
+
+    regressions = 0
+    print(f"\nComparison with baseline {name!r} (threshold {threshold:.0%})")
+    print(f"{'case':<44} {'baseline':>10} {'now':>10} {'change':>8} {'RSS change':>11}  verdict")
+    for result in results:
+        old = baseline.get(result.case)
+        if old is None:
+            print(f"{result.case:<44} {'-':>10} {format_seconds(result.seconds):>10} {'':>8} {'':>11}  new")
+            continue
+
+        change = result.seconds / old["seconds"] - 1 if old["seconds"] else 0.0
+        noise = abs(result.seconds - old["seconds"]) < TIME_NOISE_SECONDS
+        rss_change = None
+        old_rss = old.get("peak_rss_bytes")
+        if result.peak_rss_bytes is not None and old_rss is not None:
+            if abs(result.peak_rss_bytes - old_rss) < RSS_NOISE_BYTES:
+                rss_change = 0.0
+            else:
+                rss_change = result.peak_rss_bytes / max(old_rss, RSS_NOISE_BYTES) - 1
+
+        verdict = "ok"
+        if (change > threshold and not noise) or (rss_change is not None and rss_change > threshold):
+            verdict = "REGRESSION"
+            regressions += 1
+        elif change < -threshold and not noise:
+            verdict = "faster"
+        rss_text = f"{rss_change:+.0%}" if rss_change is not None else "-"
+        print(
+            f"{result.case:<44} {format_seconds(old['seconds']):>10} "
+            f"{format_seconds(result.seconds):>10} {change:>+8.0%} {rss_text:>11}  {verdict}"
+        )
+    print(f"\n{regressions} regression(s)")
+    return regressions
+
+
+def add_baseline_arguments(parser) -> None:
+    parser.add_argument("--save", metavar="NAME", help="save the results as baseline NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against baseline NAME")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"relative slowdown counted as a regression (default {DEFAULT_THRESHOLD})",
+    )
+
+
+def finish(args, results: list[BenchResult]) -> int:
+    """Prints, saves and compares as requested; the exit code is 1 on regressions."""
+    print_results(results)
+    if args.save:
+        print(f"\nSaved baseline: {save_baseline(args.save, results)}")
+    if args.compare and compare(args.compare, results, args.threshold):
+        return 1
+    return 0
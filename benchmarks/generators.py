@@ -0,0 +1,140 @@
+"""
+Deterministic synthetic JSON inputs of a requested size.
+
+Every generator appends small serialized pieces to a bytearray until the
+target size is reached, so building a 500MB input costs about 500MB of
+memory, and the same (shape, size) always yields the same bytes.
+"""
+
+import random
+from typing import Callable
+
+import orjson
+
+SIZES = {
+    "1KB": 1024,
+    "64KB": 64 * 1024,
+    "1MB": 1024 * 1024,
+    "16MB": 16 * 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+    "500MB": 500 * 1024 * 1024,
+}
+
+
+def parse_size(text: str) -> int:
+    """'16MB' -> bytes (also accepts a plain number of bytes)."""
+    text = text.strip().upper()
+    if text in SIZES:
+        return SIZES[text]
+    for unit, factor in (("GB", 1024**3), ("MB", 1024**2), ("KB", 1024), ("B", 1)):
+        if text.endswith(unit):
+            return int(float(text[: -len(unit)]) * factor)
+    return int(text)
+
+
+def _join_items(size: int, make_item: Callable[[random.Random, int], bytes], open_: bytes, close: bytes) -> bytes:
+    """`open_ item, item, ... close` with items added until `size` bytes."""
+    rng = random.Random(size)
+    out = bytearray(open_)
+    i = 0
+    while len(out) < size:
+        if i:
+            out += b","
+        out += make_item(rng, i)
+        i += 1
+    out += close
+    return bytes(out)
+
+
+def deep(size: int) -> bytes:
+    """Chains of nested objects/arrays, 200 levels deep, repeated in a list."""
+    depth = 200
+
+    def item(rng: random.Random, i: int) -> bytes:
+        opens = []
+        closes = []
+        for level in range(depth):
+            if level % 2:
+                opens.append(b"[")
+                closes.append(b"]")
+            else:
+                opens.append(b'{"level%d":' % level)
+                closes.append(b"}")
+        return b"".join(opens) + b"%d" % rng.randint(0, 10**6) + b"".join(reversed(closes))
+
+    return _join_items(size, item, b"[", b"]")
+
+
+def wide(size: int) -> bytes:
+    """One flat array of numbers (ints and floats)."""
+
+    def item(rng: random.Random, i: int) -> bytes:
+        if i % 2:
+            return orjson.dumps(rng.random() * 1000)
+        return b"%d" % (rng.getrandbits(31) - 2**30)
+
+    return _join_items(size, item, b"[", b"]")
+
+
+def long_strings(size: int) -> bytes:
+    """Array of 64KB strings with some escapes and non-ASCII text."""
+    chunk = ("lorem ipsum \\\"quoted\\\" ünïcödé → ✓ " * 2000)[: 64 * 1024].encode()
+
+    def item(rng: random.Random, i: int) -> bytes:
+        return b'"' + chunk + b'"'
+
+    return _join_items(size, item, b"[", b"]")
+
+
+def many_keys(size: int) -> bytes:
+    """One object with a huge number of short keys and small values."""
+
+    def item(rng: random.Random, i: int) -> bytes:
+        kind = i % 5
+        if kind == 0:
+            return b'"k%x":%d' % (i, rng.randint(0, 100))
+        if kind == 4:
+            return b'"k%x":{"n":%d}' % (i, i)
+        return b'"k%x":' % i + (b'"v"', b"true", b"null")[kind - 1]
+
+    return _join_items(size, item, b"{", b"}")
+
+
+def records(size: int) -> bytes:
+    """API-style array of small records (the common real-world case)."""
+
+    def item(rng: random.Random, i: int) -> bytes:
+        return orjson.dumps(
+            {
+                "id": i,
+                "name": f"user-{i}",
+                "active": i % 3 != 0,
+                "score": round(rng.random() * 100, 3),
+                "tags": ["a", "b", "c"][: i % 4],
+                "address": {"city": "Pune", "zip": f"{411000 + i % 100}"},
+            }
+        )
+
+    return _join_items(size, item, b"[", b"]")
+
+
+def ndjson(size: int) -> bytes:
+    """JSON Lines: one small record per line."""
+    rng = random.Random(size)
+    out = bytearray()
+    i = 0
+    while len(out) < size:
+        out += orjson.dumps({"ts": 1700000000 + i, "level": "info", "msg": f"event {i}", "v": rng.random()})
+        out += b"\n"
+        i += 1
+    return bytes(out)
+
+
+SHAPES: dict[str, Callable[[int], bytes]] = {
+    "deep": deep,
+    "wide": wide,
+    "long_strings": long_strings,
+    "many_keys": many_keys,
+    "records": records,
+    "ndjson": ndjson,
+}
@@ -0,0 +1,7 @@
+import sys
+
+from tjson.cli import main
+
+# Guarded: worker processes started with "spawn" re-import this module
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,32 @@
 from textual.app import App
-from textual.widgets import TextArea
 from tjson.ui.screens.main_screen import MainScreen
-from tjson.ui.styles.syntax_theme import CYBERPUNK_THEME
+from tjson.services.stdin_reader import StdinReader
 import os
 
 
 class TJSONApp(App):
     CSS_PATH = os.path.join("ui", "styles", "main.tcss")
 
+    def __init__(
+        self, stdin_reader: StdinReader | None = None, trace_path: str | None = None
+    ):
+        super().__init__()
+        # Piped input (`cat data.json | tjson`), read once the main screen is up
+        self.stdin_reader = stdin_reader
+        # JSON Lines file receiving the timings of every run (--trace)
+        self.trace_path = trace_path
+
     def on_mount(self):
         # 1. Register the custom theme with the global TextArea registry
 
         # TextArea.register_theme(CYBERPUNK_THEME)
-        self.push_screen(MainScreen())
+        self.push_screen(
+            MainScreen(stdin_reader=self.stdin_reader, trace_path=self.trace_path)
+        )
 
 
-def run():
+def run(stdin_reader: StdinReader | None = None, trace_path: str | None = None):
     # print(f"Available Languages: {TextArea.available_languages}")
     # print(f"Available Themes: {TextArea.available_themes}")
-    app = TJSONApp()
+    app = TJSONApp(stdin_reader=stdin_reader, trace_path=trace_path)
     app.run()
-
-
-run()
@@ -0,0 +1,618 @@
+"""
+Headless command line interface.
+
+    tjson                      Launch the TUI
+    tjson fmt  FILES...        Pretty print files in place (or into --output-dir)
+    tjson min  FILES...        Minify files in place (or into --output-dir, --gzip)
+    tjson check FILES...       Validate files, exit 1 if any is invalid
+    tjson diff OLD NEW         List added/removed/changed paths, exit 1 if any
+    tjson profile FILE         Size, count and types by path, as JSON
+    ... | tjson fmt -          Read stdin, write the result to stdout
+
+FILES may be paths, directories (searched for JSON/NDJSON files) or glob
+patterns. Files are processed in parallel on a process pool sized to the
+machine. JSON Lines files (*.ndjson, *.jsonl or --ndjson) are instead split
+into chunks of lines, and the chunks of each file are spread over the pool.
+"""
+
+import argparse
+import glob
+import gzip
+import lzma
+import mmap
+import os
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Optional
+
+import orjson
+
+from tjson.config import GZIP_LEVEL
+from tjson.core.processor import JSONProcessor
+from tjson.services.file_writer import FileWriter
+from tjson.services.stdin_reader import StdinReader
+from tjson.utils import format_size
+
+# Process pools, NDJSON, diff and the TUI are imported by the commands that use
+# them: `tjson check a.json` should not pay for multiprocessing or Textual
+# (benchmarks/bench_startup.py keeps an eye on it)
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+@dataclass
+class FileTask:
+    path: str
+    command: str  # "fmt", "min" or "check"
+    output_path: Optional[str] = None
+    check_only: bool = False  # Report files that would change, don't write
+    ndjson: bool = False
+    compress: bool = False  # gzip the output
+
+
+@dataclass
+class FileReport:
+    path: str
+    ok: bool
+    seconds: float
+    input_bytes: int = 0
+    output_bytes: int = 0
+    changed: bool = False
+    error: Optional[str] = None
+
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+
+# Path meaning "read stdin, write stdout"
+STDIN_PATH = "-"
+
+# How many broken lines of an NDJSON file are listed in its report
+MAX_REPORTED_LINE_ERRORS = 10
+
+
+def run_task(task: FileTask) -> FileReport:
+    """Processes one file. Runs inside a pool worker, so it must stay picklable."""
+    start = time.perf_counter()
+    try:
+        with open(task.path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        return FileReport(task.path, False, time.perf_counter() - start, error=str(e))
+
+    if task.command == "check":
+        result = JSONProcessor.validate(data)
+        return FileReport(
+            task.path,
+            result.is_valid,
+            time.perf_counter() - start,
+            input_bytes=len(data),
+            error=result.error_message,
+        )
+
+    result = JSONProcessor.process_bytes(data, minify=task.command == "min", use_cache=False)
+    if not result.is_valid:
+        return FileReport(
+            task.path,
+            False,
+            time.perf_counter() - start,
+            input_bytes=len(data),
+            error=result.error_message,
+        )
+
+    output = result.formatted_bytes
+    changed = not is_same_output(data, output)
+    try:
+        # In place, unchanged files are left alone (keeps mtimes stable for make & co)
+        if not task.check_only and (changed or task.output_path):
+            with FileWriter.open_atomic(task.output_path or task.path, task.compress) as f:
+                f.write(output)
+                f.write(b"\n")
+    except OSError as e:
+        return FileReport(
+            task.path, False, time.perf_counter() - start, len(data), error=str(e)
+        )
+
+    return FileReport(
+        task.path,
+        True,
+        time.perf_counter() - start,
+        input_bytes=len(data),
+        output_bytes=len(output) + 1,
+        changed=changed,
+    )
+
+
+def is_same_output(data: bytes, output: bytes) -> bool:
+    """Whether `data` is `output` plus the trailing newline, compared without building it."""
+    return len(data) == len(output) + 1 and data.endswith(b"\n") and data.startswith(output)
+
+
+def run_ndjson_task(task: FileTask, executor: "Executor") -> FileReport:
+    """
+    Processes one JSON Lines file in the calling process, spreading its chunks
+    over `executor`. The file is mmap'd and the output streamed to a temp file,
+    so neither is ever held in memory as a whole.
+    """
+    from tjson.core.ndjson import NDJSONProcessor
+
+    start = time.perf_counter()
+    try:
+        with open(task.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+    except (OSError, ValueError) as e:
+        return FileReport(task.path, False, time.perf_counter() - start, error=str(e))
+
+    target = None
+    if task.command != "check" and not task.check_only:
+        try:
+            target = FileWriter.open_atomic(task.output_path or task.path, task.compress)
+        except OSError as e:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            return FileReport(task.path, False, time.perf_counter() - start, size, error=str(e))
+
+    error_count = 0
+    messages: list[str] = []
+    written = 0
+    changed = False
+    try:
+        for chunk in NDJSONProcessor.process_stream(
+            data,
+            minify=task.command == "min",
+            validate_only=task.command == "check",
+            executor=executor,
+        ):
+            error_count += len(chunk.errors)
+            for error in chunk.errors[: MAX_REPORTED_LINE_ERRORS - len(messages)]:
+                messages.append(f"line {error.line_number}: {error.message}")
+            if task.command == "check":
+                continue
+            # Compare as we go instead of keeping the output around
+            if not changed and chunk.output != data[written : written + len(chunk.output)]:
+                changed = True
+            written += len(chunk.output)
+            if target:
+                target.write(chunk.output)
+
+        changed = changed or (task.command != "check" and written != size)
+        if target:
+            # Never replace a file with a version that silently dropped broken lines
+            if error_count or not (changed or task.output_path):
+                target.discard()
+            else:
+                target.commit()
+    except OSError as e:
+        if target:
+            target.discard()
+        return FileReport(task.path, False, time.perf_counter() - start, size, error=str(e))
+    except BaseException:
+        if target:
+            target.discard()
+        raise
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    error = None
+    if error_count:
+        more = error_count - len(messages)
+        error = "\n".join(messages + ([f"... and {more} more"] if more else []))
+    return FileReport(
+        task.path,
+        not error_count,
+        time.perf_counter() - start,
+        input_bytes=size,
+        output_bytes=written,
+        changed=changed,
+        error=error,
+    )
+
+
+def run_stdin_task(task: FileTask) -> FileReport:
+    """
+    Reads stdin to EOF and writes the result to stdout.
+
+    Used as a pipeline filter, so stdout carries nothing but the output;
+    reports go to stderr.
+    """
+    start = time.perf_counter()
+    data = StdinReader(sys.stdin.fileno()).load()
+    if not task.compress:
+        return filter_stdin(task, data, sys.stdout.buffer, start)
+    with gzip.GzipFile(
+        filename="", mode="wb", fileobj=sys.stdout.buffer, compresslevel=GZIP_LEVEL
+    ) as out:
+        report = filter_stdin(task, data, out, start)
+    sys.stdout.buffer.flush()
+    return report
+
+
+def filter_stdin(task: FileTask, data: bytearray, out: BinaryIO, start: float) -> FileReport:
+    from tjson.core.ndjson import NDJSONProcessor
+
+    validate_only = task.command == "check"
+
+    if task.ndjson:
+        error_count = 0
+        messages: list[str] = []
+        changed = False
+        written = 0
+        for chunk in NDJSONProcessor.process_stream(
+            data, minify=task.command == "min", validate_only=validate_only
+        ):
+            error_count += len(chunk.errors)
+            for error in chunk.errors[: MAX_REPORTED_LINE_ERRORS - len(messages)]:
+                messages.append(f"line {error.line_number}: {error.message}")
+            if validate_only:
+                continue
+            changed = changed or chunk.output != data[written : written + len(chunk.output)]
+            written += len(chunk.output)
+            if not task.check_only:
+                out.write(chunk.output)
+        out.flush()
+        error = "\n".join(messages) if error_count else None
+        return FileReport(
+            STDIN_PATH,
+            not error_count,
+            time.perf_counter() - start,
+            input_bytes=len(data),
+            output_bytes=written,
+            changed=changed or (not validate_only and written != len(data)),
+            error=error,
+        )
+
+    if validate_only:
+        result = JSONProcessor.validate(data)
+    else:
+        result = JSONProcessor.process_bytes(data, minify=task.command == "min", use_cache=False)
+    if not result.is_valid:
+        return FileReport(
+            STDIN_PATH, False, time.perf_counter() - start, len(data), error=result.error_message
+        )
+
+    output = b"" if validate_only else result.formatted_bytes
+    if not task.check_only and not validate_only:
+        out.write(output)
+        out.write(b"\n")
+        out.flush()
+    return FileReport(
+        STDIN_PATH,
+        True,
+        time.perf_counter() - start,
+        input_bytes=len(data),
+        output_bytes=0 if validate_only else len(output) + 1,
+        changed=not validate_only and not is_same_output(data, output),
+    )
+
+
+def expand_paths(patterns: Iterable[str]) -> list[str]:
+    """Expands directories and glob patterns into a de-duplicated file list."""
+    paths: dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                match
+                for extension in (".json",) + NDJSON_EXTENSIONS
+                for match in glob.glob(
+                    os.path.join(pattern, "**", f"*{extension}"), recursive=True
+                )
+            )
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            if not os.path.isdir(match):
+                paths.setdefault(match, None)
+    return list(paths)
+
+
+def output_path_for(path: str, output_dir: Optional[str], suffix: str = "") -> Optional[str]:
+    """Mirrors relative input paths under output_dir; absolute ones keep their name."""
+    if not output_dir:
+        return None
+    relative = os.path.normpath(path)
+    if os.path.isabs(relative) or relative.startswith(".."):
+        relative = os.path.basename(relative)
+    return os.path.join(output_dir, relative + suffix)
+
+
+def run_tasks(tasks: list[FileTask], jobs: int) -> Iterable[FileReport]:
+    """Yields reports in input order, fanning out over processes when worthwhile."""
+    workers = max(1, min(jobs, len(tasks)))
+    if workers == 1:
+        yield from map(run_task, tasks)
+        return
+
+    # Batch small files per round-trip to keep IPC overhead low on big fixture sets
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(run_task, tasks, chunksize=chunksize)
+
+
+def run_all(tasks: list[FileTask], jobs: int) -> Iterable[FileReport]:
+    """Whole-document files in parallel first, then NDJSON files one by one."""
+    yield from run_tasks([task for task in tasks if not task.ndjson], jobs)
+
+    ndjson_tasks = [task for task in tasks if task.ndjson]
+    if not ndjson_tasks:
+        return
+    from tjson.core.ndjson import NDJSONProcessor
+
+    executor = NDJSONProcessor.create_executor(jobs)
+    try:
+        for task in ndjson_tasks:
+            yield run_ndjson_task(task, executor)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def print_report(report: FileReport, command: str, check_only: bool, file=None) -> None:
+    if not report.ok:
+        status = "FAIL"
+    elif report.changed and command != "check":
+        status = "WOULD FIX" if check_only else "FIXED"
+    else:
+        status = "OK"
+    line = f"{status:<9} {report.seconds * 1000:>9.1f} ms  {format_size(report.input_bytes):>9}  {report.path}"
+    if report.error:
+        for error_line in report.error.splitlines():
+            line += f"\n          {error_line}"
+    print(line, file=file)
+
+
+def run_stdin(args: argparse.Namespace) -> int:
+    task = FileTask(
+        STDIN_PATH,
+        args.command,
+        check_only=getattr(args, "check", False),
+        ndjson=args.ndjson,
+        compress=getattr(args, "gzip", False),
+    )
+    report = run_stdin_task(task)
+    if not args.quiet or not report.ok:
+        print_report(report, args.command, task.check_only, file=sys.stderr)
+    return 1 if not report.ok or (task.check_only and report.changed) else 0
+
+
+def read_tree(path: str) -> Any:
+    """Loads (decompressing if needed) and parses one side of a diff."""
+    from tjson.services.file_loader import FileLoader
+
+    return JSONProcessor.parse(FileLoader(path).load(), use_cache=False)
+
+
+def run_diff(args: argparse.Namespace) -> int:
+    """Prints the changes from OLD to NEW; exit 0 if identical, 1 if not, 2 on errors."""
+    from tjson.core.diff import JSONDiff, SubtreeHashes
+
+    start = time.perf_counter()
+    try:
+        old, new = read_tree(args.old), read_tree(args.new)
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        print(f"tjson: {e}", file=sys.stderr)
+        return 2
+    except orjson.JSONDecodeError as e:
+        print(f"tjson: invalid JSON: {e}", file=sys.stderr)
+        return 2
+    parsed = time.perf_counter()
+    old_hashes, new_hashes = SubtreeHashes(old), SubtreeHashes(new)
+    hashed = time.perf_counter()
+
+    counts: Counter = Counter()
+    try:
+        for change in JSONDiff.diff(old, new, old_hashes, new_hashes):
+            counts[change.kind] += 1
+            if not args.quiet:
+                print(JSONDiff.format(change))
+    except BrokenPipeError:
+        # `tjson diff a b | head`: the reader has seen enough
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    end = time.perf_counter()
+
+    print(
+        f"{counts['added']} added, {counts['removed']} removed, {counts['changed']} changed "
+        f"in {end - start:.2f} s (parse {parsed - start:.2f} s, hash {hashed - parsed:.2f} s, "
+        f"diff {end - hashed:.2f} s)",
+        file=sys.stderr,
+    )
+    return 1 if counts else 0
+
+
+def run_profile(args: argparse.Namespace) -> int:
+    """Prints the document's profile as JSON; exit 2 if it can't be read or parsed."""
+    from tjson.core.profile import DocumentProfile
+
+    start = time.perf_counter()
+    try:
+        tree = read_tree(args.file)
+    except (OSError, EOFError, lzma.LZMAError) as e:
+        print(f"tjson: {e}", file=sys.stderr)
+        return 2
+    except orjson.JSONDecodeError as e:
+        print(f"tjson: invalid JSON: {e}", file=sys.stderr)
+        return 2
+    parsed = time.perf_counter()
+    profile = DocumentProfile(tree)
+    end = time.perf_counter()
+
+    report = profile.to_dict(args.sort, args.limit or None)
+    try:
+        sys.stdout.buffer.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.buffer.flush()
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    print(
+        f"{format_size(profile.total_bytes)} (minified), {len(profile.paths)} paths, "
+        f"depth {profile.max_depth} in {end - start:.2f} s "
+        f"(parse {parsed - start:.2f} s, profile {end - parsed:.2f} s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="tjson", description="Terminal JSON workspace. Run without a command for the TUI."
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help="TUI: append the phase timings of every run to FILE as JSON lines",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+
+    for name, help_text in (
+        ("fmt", "pretty print files (2-space indent)"),
+        ("min", "minify files"),
+        ("check", "validate files"),
+    ):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument(
+            "paths",
+            nargs="*",
+            help="files, directories or glob patterns; '-' (or nothing, when piped) for stdin",
+        )
+        sub.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="worker processes (default: number of CPUs)",
+        )
+        sub.add_argument("-q", "--quiet", action="store_true", help="only print failures and the summary")
+        sub.add_argument(
+            "--ndjson",
+            action="store_true",
+            help="treat every file as JSON Lines (default for *.ndjson and *.jsonl)",
+        )
+        if name != "check":
+            sub.add_argument(
+                "-o", "--output-dir", help="write results here instead of in place"
+            )
+            sub.add_argument(
+                "--check",
+                action="store_true",
+                help="don't write anything, exit 1 if any file would change",
+            )
+            sub.add_argument(
+                "--gzip",
+                action="store_true",
+                help="gzip the output (with --output-dir, adds .gz to file names; or stdout)",
+            )
+
+    diff = subparsers.add_parser("diff", help="compare two documents structurally")
+    diff.add_argument("old", help="original document (may be gzip/bz2/xz compressed)")
+    diff.add_argument("new", help="document to compare against it")
+    diff.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+
+    profile = subparsers.add_parser(
+        "profile", help="report size, count and types by path, as JSON"
+    )
+    profile.add_argument("file", help="document to profile (may be gzip/bz2/xz compressed)")
+    profile.add_argument(
+        "-s",
+        "--sort",
+        choices=("bytes", "count", "items", "depth", "path"),  # core.profile.SORT_KEYS
+        default="bytes",
+        help="order of the paths (default: largest first)",
+    )
+    profile.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=100,
+        help="paths and keys listed (default: 100, 0 for all)",
+    )
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    if args.command is None:
+        if StdinReader.is_piped() and not sys.stdout.isatty():
+            # `... | tjson | ...` has no terminal to draw on: act as a filter
+            return main(["fmt", "--quiet", STDIN_PATH])
+
+        # No subcommand: interactive mode, streaming piped input if there is any
+        from tjson.app import run
+
+        try:
+            stdin_reader = StdinReader.detach()
+        except OSError as e:
+            print(f"tjson: no terminal to run on ({e}), formatting stdin instead", file=sys.stderr)
+            return main(["fmt", "--quiet", STDIN_PATH])
+        run(stdin_reader=stdin_reader, trace_path=args.trace)
+        return 0
+    if args.command == "diff":
+        return run_diff(args)
+    if args.command == "profile":
+        return run_profile(args)
+
+    if not args.paths and StdinReader.is_piped():
+        args.paths = [STDIN_PATH]
+    if STDIN_PATH in args.paths:
+        if len(args.paths) > 1:
+            print(f"tjson: '{STDIN_PATH}' cannot be combined with other paths", file=sys.stderr)
+            return 2
+        return run_stdin(args)
+    if not args.paths:
+        print("tjson: no input files given", file=sys.stderr)
+        return 2
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("tjson: no input files matched", file=sys.stderr)
+        return 1
+
+    check_only = getattr(args, "check", False)
+    output_dir = getattr(args, "output_dir", None)
+    compress = getattr(args, "gzip", False)
+    if compress and not output_dir:
+        # Compressing in place would replace the JSON files with gzip files
+        print("tjson: --gzip needs --output-dir (or stdin)", file=sys.stderr)
+        return 2
+    tasks = [
+        FileTask(
+            path,
+            args.command,
+            output_path_for(path, output_dir, ".gz" if compress else ""),
+            check_only,
+            ndjson=args.ndjson or path.lower().endswith(NDJSON_EXTENSIONS),
+            compress=compress,
+        )
+        for path in paths
+    ]
+    if output_dir and not check_only:
+        for task in tasks:
+            os.makedirs(os.path.dirname(task.output_path) or ".", exist_ok=True)
+
+    start = time.perf_counter()
+    failed = changed = total_bytes = 0
+    for report in run_all(tasks, args.jobs):
+        total_bytes += report.input_bytes
+        failed += not report.ok
+        changed += report.ok and report.changed
+        if not args.quiet or not report.ok:
+            print_report(report, args.command, check_only)
+    elapsed = time.perf_counter() - start
+
+    throughput = total_bytes / elapsed if elapsed else 0
+    summary = (
+        f"{len(tasks)} files, {format_size(total_bytes)} in {elapsed:.2f} s "
+        f"({format_size(throughput)}/s, {len(tasks) / elapsed if elapsed else 0:.0f} files/s)"
+    )
+    if args.command != "check":
+        summary += f", {changed} {'would change' if check_only else 'changed'}"
+    summary += f", {failed} failed"
+    print(summary)
+
+    return 1 if failed or (check_only and changed) else 0
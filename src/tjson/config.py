@@ -0,0 +1,73 @@
+"""Tunable limits shared by the UI and services."""
+
+# Files bigger than this are not loaded into the input editor; the raw bytes go
+# straight to the processor and the editor only shows a read-only preview.
+EDITOR_LOAD_LIMIT = 2 * 1024 * 1024  # 2MB
+
+# How much of a large file is shown in the input editor preview
+PREVIEW_BYTES = 64 * 1024  # 64KB
+
+# Loading anything above this raises a warning toast
+LARGE_FILE_WARNING_MB = 500
+
+# Memory budget of JSONProcessor's cache of parsed trees and rendered outputs
+RESULT_CACHE_BYTES = 512 * 1024 * 1024  # 512MB
+
+# Memory budget of the parsed trees and rendered outputs kept for open tabs;
+# the least recently shown tabs lose theirs first and rebuild them when shown
+DOCUMENT_STATE_BYTES = 1024 * 1024 * 1024  # 1GB
+
+# Memory budget of the file picker's cached directory scans
+FILE_INDEX_CACHE_BYTES = 64 * 1024 * 1024  # 64MB
+
+# Rough size of a parsed Python tree relative to its JSON text, used to
+# charge parsed trees against the cache budget
+PARSED_SIZE_FACTOR = 6
+
+# Syntax highlighting tiers of the input editor, by document size:
+#   up to FULL       tree-sitter, whole document
+#   up to VIEWPORT   tree-sitter, only the visible lines plus a margin
+#   up to TOKENIZER  per-line regex tokenizer, no syntax tree at all
+#   above            no highlighting
+HIGHLIGHT_FULL_LIMIT = 256 * 1024  # 256KB
+HIGHLIGHT_VIEWPORT_LIMIT = 2 * 1024 * 1024  # 2MB
+HIGHLIGHT_TOKENIZER_LIMIT = 32 * 1024 * 1024  # 32MB
+
+# Lines highlighted above and below the viewport in the "viewport" tier
+HIGHLIGHT_MARGIN_LINES = 100
+
+# Debounce between the last edit and processing, derived from the expected
+# processing time of the input (see core.scheduler.AdaptiveDebounce)
+DEBOUNCE_MIN_SECONDS = 0.05
+DEBOUNCE_MAX_SECONDS = 2.0
+# Wait this many times the expected processing time before starting a run
+DEBOUNCE_COST_FACTOR = 1.5
+
+# Diff mode recomputes the diff this long after the last edit of either side
+DIFF_DEBOUNCE_SECONDS = 0.3
+
+# Edits to inputs bigger than this, or expected to take longer than
+# ON_DEMAND_SECONDS to process, wait for an explicit "Process" (F5)
+ON_DEMAND_BYTES = 64 * 1024 * 1024  # 64MB
+ON_DEMAND_SECONDS = 5.0
+
+# Edits to input documents bigger than this are first revalidated by
+# reparsing only the container around the edit (core.validation)
+INCREMENTAL_VALIDATION_BYTES = 256 * 1024  # 256KB
+
+# "Save Output" writes the output in chunks of this size (progress and
+# cancellation happen between chunks)
+EXPORT_CHUNK_BYTES = 8 * 1024 * 1024  # 8MB
+
+# Paste / Copy give up when the system clipboard tool takes longer than this
+CLIPBOARD_TIMEOUT_SECONDS = 10.0
+
+# Follow mode (growing JSON Lines files): seconds between polls of the file,
+# how much of its end is shown when following starts, and how many of the
+# latest records the output keeps
+FOLLOW_POLL_SECONDS = 0.5
+FOLLOW_TAIL_BYTES = 256 * 1024  # 256KB
+FOLLOW_MAX_RECORDS = 10_000
+
+# zlib level of gzip output: 6 is about 3x faster than 9 for a few % larger files
+GZIP_LEVEL = 6
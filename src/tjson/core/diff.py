@@ -0,0 +1,272 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional, Union
+
+import orjson
+
+ADDED, REMOVED, CHANGED = "added", "removed", "changed"
+
+# Keys that can be written as `.key` in a path; others use `["key"]`
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$-]*")
+_MASK = (1 << 64) - 1
+
+# Longest rendering of a scalar value in a formatted change
+VALUE_PREVIEW = 80
+
+
+@dataclass(frozen=True)
+class Change:
+    """
+    One difference between two documents.
+
+    Paths use the query bar syntax (`.items[3].name`), so they can be pasted
+    there. Array items are numbered in the old document for removals and in
+    the new one for additions and changes.
+    """
+
+    kind: str  # ADDED, REMOVED or CHANGED
+    path: str
+    old: Any = None
+    new: Any = None
+
+
+class SubtreeHashes:
+    """
+    Merkle-style hash of every object and array of a parsed document.
+
+    Computed bottom-up in one iterative pass: a container's hash combines its
+    children's hashes (order-independent for objects, ordered for arrays), so
+    two subtrees can be compared in O(1) once both documents are hashed.
+    Scalars are hashed with their type, so 1, 1.0 and true stay different.
+
+    Equal hashes only mean "probably equal": Python's hash() maps -1 and -2,
+    or n and n + 2**61 - 1, to the same value, so callers confirm a match
+    with `same` before skipping a subtree.
+    """
+
+    def __init__(self, tree: Any) -> None:
+        self.tree = tree  # Keeps every container alive: hashes are keyed by id()
+        self._hashes: dict[int, int] = {}
+        self._build()
+
+    def _build(self) -> None:
+        # Pre-order list of containers; walked backwards, children come before parents
+        order: list[Union[dict, list]] = []
+        stack = [self.tree] if type(self.tree) in (dict, list) else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            for child in node.values() if type(node) is dict else node:
+                child_type = type(child)
+                if child_type is dict or child_type is list:
+                    stack.append(child)
+
+        hashes = self._hashes
+        for node in reversed(order):
+            if type(node) is dict:
+                total = 0
+                for key, value in node.items():
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        total += hash((key, hashes[id(value)]))
+                    else:
+                        total += hash((key, value_type, value))
+                hashes[id(node)] = hash((dict, total & _MASK))
+            else:
+                items = []
+                for value in node:
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        items.append(hashes[id(value)])
+                    else:
+                        items.append(hash((value_type, value)))
+                hashes[id(node)] = hash((list, tuple(items)))
+
+    def of(self, value: Any) -> int:
+        """Hash of any value of this document (containers are looked up, scalars hashed)."""
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            return self._hashes[id(value)]
+        return hash((value_type, value))
+
+
+def same(a: Any, b: Any) -> bool:
+    """Exact equality of two values, confirming equal hashes (1 and true differ)."""
+    return type(a) is type(b) and a == b
+
+
+def _unique_positions(keys: list[int], start: int, end: int) -> dict[int, int]:
+    """Position of every hash that occurs exactly once in keys[start:end]."""
+    positions: dict[int, int] = {}
+    repeated = set()
+    for position in range(start, end):
+        key = keys[position]
+        if key in positions:
+            repeated.add(key)
+        positions[key] = position
+    for key in repeated:
+        del positions[key]
+    return positions
+
+
+def child_path(path: str, key: Union[str, int]) -> str:
+    """`.a` + "b" -> `.a.b`; `.a` + 0 -> `.a[0]`; odd keys are quoted (`.a["b c"]`)."""
+    if type(key) is int:
+        step = f"[{key}]"
+    elif _IDENTIFIER.fullmatch(key):
+        return f"{path}.{key}" if path != "." else f".{key}"
+    else:
+        step = f"[{orjson.dumps(key).decode()}]"
+    return f"{path}{step}" if path != "." else f".{step}"
+
+
+def preview(value: Any) -> str:
+    """Short rendering of a value: containers are summarized, scalars truncated."""
+    if type(value) is dict:
+        return f"{{…{len(value)} keys}}"
+    if type(value) is list:
+        return f"[…{len(value)} items]"
+    text = orjson.dumps(value).decode()
+    if len(text) > VALUE_PREVIEW:
+        text = text[: VALUE_PREVIEW - 1] + "…"
+    return text
+
+
+class JSONDiff:
+    """
+    Structural diff of two parsed documents.
+
+    Both trees are hashed once (`SubtreeHashes`); the walk then skips every
+    pair of subtrees with equal hashes once `==` confirms them, without
+    diffing inside, so documents that are 99% identical cost little more than
+    hashing and comparing them. Arrays are
+    aligned on the hashes of their items, so an insertion reports one added
+    item instead of shifting every item after it (see `align`).
+    """
+
+    @staticmethod
+    def diff(
+        old: Any,
+        new: Any,
+        old_hashes: Optional[SubtreeHashes] = None,
+        new_hashes: Optional[SubtreeHashes] = None,
+    ) -> Iterator[Change]:
+        """Yields the changes lazily, in document order."""
+        old_hashes = old_hashes or SubtreeHashes(old)
+        new_hashes = new_hashes or SubtreeHashes(new)
+
+        # Work items: (path, old, new) pairs to compare, or Changes ready to emit
+        stack: list[Union[tuple[str, Any, Any], Change]] = [(".", old, new)]
+        while stack:
+            item = stack.pop()
+            if type(item) is Change:
+                yield item
+                continue
+            path, a, b = item
+            a_type, b_type = type(a), type(b)
+
+            if a_type is dict and b_type is dict:
+                if old_hashes.of(a) == new_hashes.of(b) and a == b:
+                    continue
+                work: list = []
+                for key, value in a.items():
+                    if key not in b:
+                        work.append(Change(REMOVED, child_path(path, key), old=value))
+                    elif old_hashes.of(value) != new_hashes.of(b[key]) or not same(value, b[key]):
+                        work.append((child_path(path, key), value, b[key]))
+                for key, value in b.items():
+                    if key not in a:
+                        work.append(Change(ADDED, child_path(path, key), new=value))
+                stack.extend(reversed(work))
+
+            elif a_type is list and b_type is list:
+                if old_hashes.of(a) == new_hashes.of(b) and a == b:
+                    continue
+                stack.extend(reversed(JSONDiff._diff_lists(path, a, b, old_hashes, new_hashes)))
+
+            elif a_type is not b_type or a != b:
+                yield Change(CHANGED, path, old=a, new=b)
+
+    @staticmethod
+    def _diff_lists(
+        path: str, a: list, b: list, old_hashes: SubtreeHashes, new_hashes: SubtreeHashes
+    ) -> list:
+        work: list = []
+        for i, j in JSONDiff.align(
+            [old_hashes.of(value) for value in a],
+            [new_hashes.of(value) for value in b],
+            lambda i, j: same(a[i], b[j]),
+        ):
+            if j is None:
+                work.append(Change(REMOVED, child_path(path, i), old=a[i]))
+            elif i is None:
+                work.append(Change(ADDED, child_path(path, j), new=b[j]))
+            else:
+                work.append((child_path(path, j), a[i], b[j]))
+        return work
+
+    @staticmethod
+    def align(
+        a: list[int], b: list[int], equal: Optional[Callable[[int, int], bool]] = None
+    ) -> Iterator[tuple[Optional[int], Optional[int]]]:
+        """
+        Aligns two arrays given the hashes of their items, in linear time.
+
+        Yields `(i, j)` for items edited in place, `(i, None)` for removed and
+        `(None, j)` for added items; equal items are skipped. The common prefix
+        and suffix are trimmed, then the rest is walked in step: on a mismatch,
+        an item that occurs exactly once on each side (patience diff's anchors)
+        tells which side skipped ahead. Items without an anchor are paired as
+        edits, so an array edited in place never looks shifted.
+
+        `equal(i, j)`, if given, confirms that items with equal hashes are equal.
+        """
+
+        def match(i: int, j: int) -> bool:
+            return a[i] == b[j] and (equal is None or equal(i, j))
+
+        start, a_end, b_end = 0, len(a), len(b)
+        while start < a_end and start < b_end and match(start, start):
+            start += 1
+        while a_end > start and b_end > start and match(a_end - 1, b_end - 1):
+            a_end -= 1
+            b_end -= 1
+
+        a_anchors = _unique_positions(a, start, a_end)
+        b_anchors = _unique_positions(b, start, b_end)
+        i = j = start
+        while i < a_end and j < b_end:
+            if match(i, j):
+                i += 1
+                j += 1
+                continue
+            # Where the old item reappears in b, where the new one was in a
+            next_j = b_anchors.get(a[i], -1) if a[i] in a_anchors else -1
+            next_i = a_anchors.get(b[j], -1) if b[j] in b_anchors else -1
+            added = next_j - j if next_j > j else None
+            removed = next_i - i if next_i > i else None
+            if added is not None and (removed is None or added <= removed):
+                for skipped in range(j, next_j):
+                    yield None, skipped
+                j = next_j
+            elif removed is not None:
+                for skipped in range(i, next_i):
+                    yield skipped, None
+                i = next_i
+            else:
+                yield i, j
+                i += 1
+                j += 1
+        for skipped in range(i, a_end):
+            yield skipped, None
+        for skipped in range(j, b_end):
+            yield None, skipped
+
+    @staticmethod
+    def format(change: Change) -> str:
+        """One line per change: `+ path: new`, `- path: old`, `~ path: old → new`."""
+        if change.kind == ADDED:
+            return f"+ {change.path}: {preview(change.new)}"
+        if change.kind == REMOVED:
+            return f"- {change.path}: {preview(change.old)}"
+        return f"~ {change.path}: {preview(change.old)} → {preview(change.new)}"
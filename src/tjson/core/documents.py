@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional, Union
+
+from tjson.config import DOCUMENT_STATE_BYTES, PARSED_SIZE_FACTOR
+from tjson.core.cache import CacheStats, ResultCache
+from tjson.core.line_index import LineIndex
+
+# View settings an output was rendered with: (minify, ndjson, query)
+Settings = tuple[bool, bool, str]
+
+
+@dataclass
+class DocumentState:
+    """
+    What a document can rebuild from its input: the rendered output with its
+    line index, and the parsed tree (single JSON documents only).
+    """
+
+    settings: Settings
+    output: Union[bytes, bytearray]
+    index: Optional[LineIndex]
+    tree: Any = None
+    # JSONProcessor.content_key of the input the tree was parsed from
+    tree_key: Optional[Hashable] = None
+    input_bytes: int = 0
+
+    @property
+    def size(self) -> int:
+        """Estimated memory: the output, its line offsets and the parsed tree."""
+        size = len(self.output) + 64
+        if self.index is not None:
+            size += 8 * self.index.line_count
+        if self.tree is not None:
+            size += self.input_bytes * PARSED_SIZE_FACTOR
+        return size
+
+
+@dataclass(eq=False)
+class Document:
+    """
+    One open tab. Its input stays for as long as the tab is open: the editor
+    text, or the raw bytes of a large file or paste that bypass the editor.
+    """
+
+    id: str  # Also the id of its tab widget
+    name: str
+    text: str = ""
+    data: Optional[bytearray] = None
+    # Plain file the input was loaded from (what Follow tails)
+    file_path: Optional[str] = None
+    minify: bool = False
+    ndjson: bool = False
+    query: str = ""
+
+    @property
+    def raw(self) -> Union[str, bytearray]:
+        return self.data if self.data is not None else self.text
+
+    @property
+    def settings(self) -> Settings:
+        return (self.minify, self.ndjson, self.query)
+
+
+class DocumentTabs:
+    """
+    The open documents, in tab order, and the parsed/rendered state of each.
+
+    States share one memory budget (a `ResultCache` keyed by document):
+    storing one past the budget evicts the least recently shown documents'
+    states, never their inputs, so an evicted tab rebuilds its output from
+    its input when it is shown again.
+    """
+
+    def __init__(self, max_bytes: int = DOCUMENT_STATE_BYTES) -> None:
+        self.documents: list[Document] = []
+        self.states = ResultCache(max_bytes)
+        self._next_id = 1
+
+    def open(self, name: Optional[str] = None, after: Optional[Document] = None) -> Document:
+        """Adds an empty document, at the end or right after `after`."""
+        document = Document(f"doc-{self._next_id}", name or f"Untitled {self._next_id}")
+        self._next_id += 1
+        position = self.documents.index(after) + 1 if after else len(self.documents)
+        self.documents.insert(position, document)
+        return document
+
+    def close(self, document: Document) -> Optional[Document]:
+        """Removes a document and its state; returns the neighbour to show, if any."""
+        position = self.documents.index(document)
+        self.documents.remove(document)
+        self.states.discard(document.id)
+        if not self.documents:
+            return None
+        return self.documents[min(position, len(self.documents) - 1)]
+
+    def get(self, document_id: str) -> Optional[Document]:
+        for document in self.documents:
+            if document.id == document_id:
+                return document
+        return None
+
+    def store(self, document: Document, state: DocumentState) -> bool:
+        """Keeps a document's state; False if it alone is over the whole budget."""
+        if not self.states.put(document.id, state, state.size):
+            self.forget(document)  # An older state would be stale
+            return False
+        return True
+
+    def forget(self, document: Document) -> None:
+        """Drops a document's state, which no longer matches its input."""
+        self.states.discard(document.id)
+
+    def state_of(self, document: Document) -> Optional[DocumentState]:
+        """The document's state if it was kept and matches its current settings."""
+        state = self.states.get(document.id)
+        if state is None or state.settings != document.settings:
+            return None
+        return state
+
+    def stats(self) -> CacheStats:
+        return self.states.stats()
@@ -0,0 +1,100 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Union
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class LineIndex:
+    """
+    Newline-offset index over a UTF-8 buffer.
+
+    Stores the byte offset where every line starts in a compact array
+    (8 bytes per line), so any line can be sliced out of the buffer in O(1)
+    without ever splitting the whole document into Python strings.
+    """
+
+    # Bytes scanned per step while building the index
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, data: Buffer) -> None:
+        self.data = data
+        self.starts = array("Q", [0])
+        # Longest line in bytes (used for the horizontal scroll range)
+        self.max_width = 0
+        # Length of the last, not yet newline-terminated line
+        self._open_line = 0
+        self._scan(0)
+
+    def extend(self, chunk: bytes) -> None:
+        """Appends bytes to the buffer and indexes only the new part."""
+        if not isinstance(self.data, bytearray):
+            self.data = bytearray(self.data)
+        start = len(self.data)
+        self.data += chunk
+        self._scan(start)
+
+    def _scan(self, pos: int) -> None:
+        view = memoryview(self.data)
+        total = len(view)
+        carry = self._open_line  # Line left open by the previous chunk
+        while pos < total:
+            end = min(pos + self.CHUNK_SIZE, total)
+            parts = bytes(view[pos:end]).split(b"\n")
+
+            # 1. Every part except the last one is terminated by a newline,
+            #    and the next line starts right after it
+            starts = accumulate((len(part) + 1 for part in parts[:-1]), initial=pos)
+            next(starts)
+            self.starts.extend(starts)
+
+            # 2. Track the widest line, including lines spanning chunk boundaries
+            if len(parts) == 1:
+                carry += len(parts[0])
+            else:
+                widest = max(map(len, parts[1:-1]), default=0)
+                self.max_width = max(self.max_width, carry + len(parts[0]), widest)
+                carry = len(parts[-1])
+            pos = end
+        view.release()
+        self._open_line = carry
+        self.max_width = max(self.max_width, carry)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts)
+
+    def line_bytes(self, line_no: int) -> bytes:
+        """Raw bytes of a 0-based line, without the trailing newline."""
+        return self.range_bytes(line_no, line_no)
+
+    def line_length(self, line_no: int) -> int:
+        """Length of a 0-based line in bytes, without materializing it."""
+        start = self.starts[line_no]
+        if line_no + 1 < len(self.starts):
+            return self.starts[line_no + 1] - 1 - start
+        return len(self.data) - start
+
+    def line_slice(self, line_no: int, start: int, end: int) -> str:
+        """Decodes bytes start..end of a line (for windows into very long lines)."""
+        line_start = self.starts[line_no]
+        end = min(end, self.line_length(line_no))
+        chunk = bytes(self.data[line_start + start : line_start + end])
+        return chunk.decode("utf-8", errors="replace")
+
+    def line(self, line_no: int) -> str:
+        return self.line_bytes(line_no).decode("utf-8", errors="replace")
+
+    def range_bytes(self, first_line: int, last_line: int) -> bytes:
+        """Raw bytes of lines first_line..last_line (inclusive, 0-based)."""
+        start = self.starts[first_line]
+        if last_line + 1 < len(self.starts):
+            end = self.starts[last_line + 1] - 1
+        else:
+            end = len(self.data)
+        return bytes(self.data[start:end])
+
+    def line_at_offset(self, offset: int) -> int:
+        """0-based line containing the given byte offset."""
+        return bisect_right(self.starts, offset) - 1
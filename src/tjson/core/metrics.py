@@ -0,0 +1,86 @@
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import orjson
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """Peak resident set size of this process so far, None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class RunMetrics:
+    """Timings of one run (processing, query, editor load...), phase by phase."""
+
+    kind: str
+    input_bytes: int = 0
+    output_bytes: int = 0
+    # Phase name -> seconds, in the order the phases ran
+    phases: dict[str, float] = field(default_factory=dict)
+    # How far the run raised the process's peak RSS (see `peak_growth`)
+    peak_growth_bytes: Optional[int] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def __post_init__(self) -> None:
+        self._peak_at_start = peak_memory_bytes()
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.phases.values())
+
+    def peak_growth(self) -> Optional[int]:
+        """
+        Growth of the process's peak RSS since the run started, None where
+        unavailable. The peak is a high-water mark: a run that stays below
+        an earlier, bigger one reports 0.
+        """
+        peak = peak_memory_bytes()
+        if peak is None or self._peak_at_start is None:
+            return None
+        return peak - self._peak_at_start
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+class MetricsLog:
+    """
+    Ring buffer of the most recent `RunMetrics`.
+
+    With a `trace_path`, every record is also appended to that file as one
+    JSON line, for offline analysis of a whole session.
+    """
+
+    def __init__(self, capacity: int = 100, trace_path: Optional[str] = None) -> None:
+        self.runs: deque[RunMetrics] = deque(maxlen=capacity)
+        self.trace_path = trace_path
+        self._lock = threading.Lock()
+
+    def record(self, run: RunMetrics) -> None:
+        if run.peak_growth_bytes is None:
+            run.peak_growth_bytes = run.peak_growth()
+        with self._lock:
+            self.runs.append(run)
+            if self.trace_path:
+                line = dict(asdict(run), total_seconds=run.total_seconds)
+                with open(self.trace_path, "ab") as trace:
+                    trace.write(orjson.dumps(line, option=orjson.OPT_APPEND_NEWLINE))
+
+    def latest(self, count: int = 1) -> list[RunMetrics]:
+        """Up to `count` most recent runs, newest first."""
+        with self._lock:
+            return list(reversed(self.runs))[:count]
@@ -0,0 +1,190 @@
+import contextlib
+import mmap
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional, Union
+
+import orjson
+
+# Anything with a C-level find(): plain bytes, a growing bytearray or an mmap'd file
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+@dataclass
+class LineError:
+    line_number: int  # 1-based, in the whole input
+    message: str
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of one chunk of lines, in input order."""
+
+    first_line: int  # 1-based line number of the chunk's first line
+    line_count: int
+    records: int
+    output: bytes  # Reformatted records, one per line ("" when validating only)
+    errors: list[LineError] = field(default_factory=list)
+
+
+def process_chunk(chunk: bytes, minify: bool, validate_only: bool = False) -> ChunkResult:
+    """
+    Parses and reformats one chunk of complete lines.
+
+    Runs in pool workers, so it only takes picklable arguments. Line numbers
+    in the result are relative to the chunk (first_line = 1) and are shifted
+    by the caller once the chunk's position is known.
+    """
+    option = 0 if minify else orjson.OPT_INDENT_2
+    out: list[bytes] = []
+    errors: list[LineError] = []
+    records = 0
+    lines = chunk.split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()  # The chunk's trailing newline doesn't start a line
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue  # Tolerate blank lines between records
+        try:
+            parsed = orjson.loads(line)
+        except orjson.JSONDecodeError as e:
+            errors.append(LineError(number, str(e)))
+            continue
+        records += 1
+        if not validate_only:
+            out.append(orjson.dumps(parsed, option=option))
+            out.append(b"\n")
+
+    return ChunkResult(1, len(lines), records, b"".join(out), errors)
+
+
+class NDJSONProcessor:
+    """
+    JSON Lines / NDJSON processing.
+
+    The input is cut on line boundaries into byte chunks which are parsed and
+    reformatted in parallel worker processes. Results come back in input order
+    through a bounded window, so only a few chunks' worth of parsed records
+    exist at any time, and every broken line is reported with its number
+    instead of failing the whole document.
+    """
+
+    CHUNK_SIZE = 4 * 1024 * 1024  # 4MB of lines per task
+
+    @staticmethod
+    def iter_chunks(data: Buffer, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+        """Yields (start, end) byte ranges that each end on a newline (or EOF)."""
+        total = len(data)
+        start = 0
+        while start < total:
+            end = start + chunk_size
+            if end >= total:
+                end = total
+            else:
+                newline = data.find(b"\n", end)
+                end = total if newline == -1 else newline + 1
+            yield start, end
+            start = end
+
+    @staticmethod
+    def create_executor(workers: Optional[int] = None) -> Executor:
+        # "spawn" is safe from threaded hosts (the TUI); fork of a threaded process is not
+        NDJSONProcessor._ensure_resource_tracker()
+        return ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    @staticmethod
+    def _ensure_resource_tracker() -> None:
+        """
+        Textual swaps sys.stderr for a capture object whose fileno() is -1, and the
+        multiprocessing resource tracker fails to start with it. Start it against
+        the real stderr before any worker process is spawned.
+        """
+        from multiprocessing import resource_tracker
+
+        if sys.__stderr__ is None or sys.stderr is sys.__stderr__:
+            return
+        with contextlib.redirect_stderr(sys.__stderr__):
+            resource_tracker.ensure_running()
+
+    @staticmethod
+    def process_stream(
+        data: Buffer,
+        minify: bool = False,
+        validate_only: bool = False,
+        executor: Optional[Executor] = None,
+        chunk_size: int = CHUNK_SIZE,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[ChunkResult]:
+        """
+        Yields one ChunkResult per chunk, in input order, with absolute line numbers.
+
+        Args:
+            data: The whole input (bytes, bytearray or mmap).
+            minify: One compact record per line; otherwise each record is pretty printed.
+            validate_only: Only parse, produce no output.
+            executor: Pool to run chunks on; one is created for the call if missing.
+                Inputs that fit in a single chunk always run inline.
+            should_cancel: Polled between chunks; stops the stream when True.
+        """
+        view = memoryview(data)
+        ranges = NDJSONProcessor.iter_chunks(data, chunk_size)
+
+        # A single chunk isn't worth a round-trip to another process
+        inline = len(view) <= chunk_size
+        owned_executor = None
+        if executor is None and not inline:
+            executor = owned_executor = NDJSONProcessor.create_executor()
+
+        pending: deque[Future] = deque()
+        try:
+            next_line = 1
+            if inline:
+                for start, end in ranges:
+                    if should_cancel and should_cancel():
+                        return
+                    result = process_chunk(bytes(view[start:end]), minify, validate_only)
+                    next_line = NDJSONProcessor._renumber(result, next_line)
+                    yield result
+                return
+
+            # Keep a bounded number of chunks in flight so memory stays flat
+            window = getattr(executor, "_max_workers", os.cpu_count() or 1) * 2
+            for start, end in ranges:
+                if should_cancel and should_cancel():
+                    break
+                pending.append(
+                    executor.submit(process_chunk, bytes(view[start:end]), minify, validate_only)
+                )
+                if len(pending) >= window:
+                    result = pending.popleft().result()
+                    next_line = NDJSONProcessor._renumber(result, next_line)
+                    yield result
+
+            while pending:
+                if should_cancel and should_cancel():
+                    break
+                result = pending.popleft().result()
+                next_line = NDJSONProcessor._renumber(result, next_line)
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            if owned_executor is not None:
+                owned_executor.shutdown(wait=False, cancel_futures=True)
+            view.release()
+
+    @staticmethod
+    def _renumber(result: ChunkResult, first_line: int) -> int:
+        """Shifts chunk-relative line numbers; returns the next chunk's first line."""
+        result.first_line = first_line
+        for error in result.errors:
+            error.line_number += first_line - 1
+        return first_line + result.line_count
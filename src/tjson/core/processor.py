@@ -1,6 +1,22 @@
+import hashlib
+import mmap
+import re
+import time
+
 import orjson
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Hashable, Optional, Union
+
+from tjson.config import PARSED_SIZE_FACTOR, RESULT_CACHE_BYTES
+from tjson.core.cache import ResultCache
+from tjson.core.metrics import RunMetrics
+from tjson.core.validation import ErrorPosition
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# JSON whitespace, matched from the start to test for blank input without a copy
+_BLANK = re.compile(rb"[ \t\n\r]*")
+_BLANK_TEXT = re.compile(r"[ \t\n\r]*")
 
 
 @dataclass
@@ -8,30 +24,170 @@ class ProcessingResult:
     formatted_text: str
     is_valid: bool
     error_message: Optional[str] = None
+    # True when the caller cancelled the run between phases (no output)
+    cancelled: bool = False
+    # Per-phase timings and sizes of the run that produced this result
+    # (hash, parse, dump, decode); callers may add their own phases
+    metrics: Optional[RunMetrics] = None
+    # The output as UTF-8 bytes, set by `process_bytes` instead of formatted_text
+    formatted_bytes: Optional[bytes] = None
+    # Where the input is invalid (error_message is its text form)
+    error: Optional[ErrorPosition] = None
+    # JSONProcessor.content_key of the input, when the run used the cache
+    content_key: Optional[Hashable] = None
+
+    def to_bytes(self) -> bytes:
+        """The output as UTF-8 bytes, without a copy when the run produced bytes."""
+        if self.formatted_bytes is not None:
+            return self.formatted_bytes
+        return self.formatted_text.encode("utf-8")
 
 
 class JSONProcessor:
     """
     High-performance JSON processing using Rust-based 'orjson'.
+
+    Parsed trees and rendered outputs of recent inputs are kept in a shared,
+    byte-budgeted LRU cache, so toggling minify or undoing back to an earlier
+    input does not parse the document again.
     """
 
+    cache = ResultCache(RESULT_CACHE_BYTES)
+    # (key, tree) of the latest document too big for the cache budget, so
+    # repeated queries on a huge input still skip the parse
+    _oversized_tree: Optional[tuple[Hashable, Any]] = None
+
+    @staticmethod
+    def content_key(raw_text: Union[str, bytes, bytearray]) -> Hashable:
+        """Fast identity for an input document, used as the cache key."""
+        if isinstance(raw_text, str):
+            # Not hash(): it is only 61 bits wide, and a collision would serve
+            # another document's output. The encoded copy is cheap: large
+            # inputs arrive as bytes, str is editor-sized
+            data = raw_text.encode("utf-8", "surrogatepass")
+            return ("str", len(raw_text), hashlib.blake2b(data, digest_size=16).digest())
+        # blake2b reads bytes/bytearray/memoryview without copying them
+        return ("bytes", len(raw_text), hashlib.blake2b(raw_text, digest_size=16).digest())
+
+    @staticmethod
+    def validate(raw_text: Union[str, bytes, bytearray]) -> ProcessingResult:
+        """Parses only, without formatting. The result carries no text."""
+        try:
+            orjson.loads(raw_text)
+            return ProcessingResult("", True, None)
+        except orjson.JSONDecodeError as e:
+            return ProcessingResult("", False, str(e), error=ErrorPosition.from_decode_error(e))
+
+    @staticmethod
+    def parse(raw_text: Union[str, bytes, bytearray], use_cache: bool = True) -> Any:
+        """
+        The parsed tree of a document, shared with `process` through the cache.
+
+        Raises:
+            orjson.JSONDecodeError: If the input is not valid JSON.
+        """
+        if not use_cache:
+            return orjson.loads(raw_text)
+        key = JSONProcessor.content_key(raw_text)
+        parsed = JSONProcessor._cached_tree(key)
+        if parsed is None:
+            parsed = orjson.loads(raw_text)
+            JSONProcessor._store_tree(key, parsed, len(raw_text))
+        return parsed
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Forgets every parsed tree and rendered output."""
+        JSONProcessor.cache.clear()
+        JSONProcessor._oversized_tree = None
+
+    @staticmethod
+    def cached_tree(key: Hashable) -> Any:
+        """The parsed tree of the input with this `content_key`, None if not cached."""
+        return JSONProcessor._cached_tree(key)
+
+    @staticmethod
+    def remember_tree(key: Hashable, tree: Any, raw_size: int) -> None:
+        """Puts back a tree parsed earlier (kept elsewhere), so the next run skips the parse."""
+        if JSONProcessor._cached_tree(key) is None:
+            JSONProcessor._store_tree(key, tree, raw_size)
+
+    @staticmethod
+    def _cached_tree(key: Hashable) -> Any:
+        oversized = JSONProcessor._oversized_tree
+        if oversized is not None and oversized[0] == key:
+            return oversized[1]
+        return JSONProcessor.cache.get(("tree", key))
+
+    @staticmethod
+    def _store_tree(key: Hashable, tree: Any, raw_size: int) -> None:
+        if JSONProcessor.cache.put(("tree", key), tree, raw_size * PARSED_SIZE_FACTOR):
+            JSONProcessor._oversized_tree = None
+        else:
+            JSONProcessor._oversized_tree = (key, tree)
+
+    @staticmethod
+    def is_blank(raw_text: Union[str, Buffer]) -> bool:
+        """Empty or whitespace only, checked in place instead of on a stripped copy."""
+        pattern = _BLANK_TEXT if isinstance(raw_text, str) else _BLANK
+        return pattern.match(raw_text).end() == len(raw_text)
+
     @staticmethod
-    def process(raw_text: str, minify: bool = False) -> ProcessingResult:
+    def process_bytes(
+        raw: Union[str, Buffer],
+        minify: bool = False,
+        use_cache: bool = True,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> ProcessingResult:
         """
-        Parses and formats JSON.
+        Parses and formats JSON into UTF-8 bytes (`ProcessingResult.formatted_bytes`).
+
+        The input is read in place: bytes, bytearray, memoryview or mmap (e.g. a
+        mapped file) are parsed without a copy, and the output is never decoded,
+        so at most the input, the parsed tree and the output exist at once.
 
         Args:
-            raw_text: The input JSON string.
+            raw: The input JSON, raw UTF-8 bytes or a string.
             minify: If True, removes all whitespace. If False, pretty prints (2-space indent).
+            use_cache: Look up / store the parsed tree and output in `JSONProcessor.cache`.
+            should_cancel: Polled before each phase (parse, dump); when it returns
+                True the run stops early and returns a result with `cancelled=True`.
         """
-        if not raw_text.strip():
-            return ProcessingResult("", True, None)
+        metrics = RunMetrics("process", input_bytes=len(raw))
+        if JSONProcessor.is_blank(raw):
+            return ProcessingResult("", True, None, metrics=metrics, formatted_bytes=b"")
+
+        cache = JSONProcessor.cache if use_cache else None
+        start = time.perf_counter()
+        key = JSONProcessor.content_key(raw) if cache else None
 
+        # 0. Same input and mode as before: nothing to do
+        if cache:
+            cached = cache.get(("output", key, minify))
+            metrics.add_phase("hash", time.perf_counter() - start)
+            if cached is not None:
+                metrics.output_bytes = len(cached.formatted_bytes or b"")
+                return replace(cached, metrics=metrics)
+
+        # orjson reads bytes, bytearray and memoryview, but not mmap objects
+        source = memoryview(raw) if isinstance(raw, mmap.mmap) else raw
         try:
-            # 1. Parse (High speed)
-            parsed = orjson.loads(raw_text)
+            # 1. Parse (High speed), unless a previous run already did
+            parsed: Any = JSONProcessor._cached_tree(key) if cache else None
+            if parsed is None:
+                if should_cancel and should_cancel():
+                    return ProcessingResult("", False, None, cancelled=True, metrics=metrics)
+                start = time.perf_counter()
+                parsed = orjson.loads(source)
+                metrics.add_phase("parse", time.perf_counter() - start)
+                if cache:
+                    JSONProcessor._store_tree(key, parsed, len(raw))
+
+            if should_cancel and should_cancel():
+                return ProcessingResult("", False, None, cancelled=True, metrics=metrics)
 
             # 2. Format
+            start = time.perf_counter()
             if minify:
                 # orjson.dumps defaults to minified (no whitespace) - extremely fast
                 bytes_output = orjson.dumps(parsed)
@@ -41,14 +197,54 @@ class JSONProcessor:
                 # It does not support arbitrary 4-space indentation.
                 bytes_output = orjson.dumps(parsed, option=orjson.OPT_INDENT_2)
 
-            # 3. Decode bytes back to string for the UI
-            formatted = bytes_output.decode("utf-8")
-
-            return ProcessingResult(formatted, True, None)
+            metrics.add_phase("dump", time.perf_counter() - start)
+            metrics.output_bytes = len(bytes_output)
+            result = ProcessingResult(
+                "", True, None, metrics=metrics, formatted_bytes=bytes_output, content_key=key
+            )
 
         except orjson.JSONDecodeError as e:
             # Handle error (e.g., "line 1 column 5")
-            return ProcessingResult("", False, str(e))
+            metrics.add_phase("parse", time.perf_counter() - start)
+            result = ProcessingResult(
+                "", False, str(e), metrics=metrics, error=ErrorPosition.from_decode_error(e)
+            )
         except Exception as e:
             # Catch generic errors
-            return ProcessingResult("", False, f"Unexpected error: {str(e)}")
+            return ProcessingResult("", False, f"Unexpected error: {str(e)}", metrics=metrics)
+        finally:
+            if source is not raw:
+                source.release()
+
+        if cache:
+            # Cached without metrics: they describe this run, hits get their own
+            cache.put(
+                ("output", key, minify),
+                replace(result, metrics=None),
+                len(result.formatted_bytes or b"") + 64,
+            )
+        return result
+
+    @staticmethod
+    def process(
+        raw_text: Union[str, Buffer],
+        minify: bool = False,
+        use_cache: bool = True,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> ProcessingResult:
+        """
+        Parses and formats JSON into a string (`ProcessingResult.formatted_text`).
+
+        Same as `process_bytes` plus a decode of the output; prefer
+        `process_bytes` when the output ends up as bytes anyway (files,
+        pipes, the output viewer).
+        """
+        result = JSONProcessor.process_bytes(raw_text, minify, use_cache, should_cancel)
+        if not result.formatted_bytes:
+            return replace(result, formatted_bytes=None)
+
+        # 3. Decode bytes back to string
+        start = time.perf_counter()
+        formatted = result.formatted_bytes.decode("utf-8")
+        result.metrics.add_phase("decode", time.perf_counter() - start)
+        return replace(result, formatted_text=formatted, formatted_bytes=None)
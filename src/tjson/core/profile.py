@@ -0,0 +1,221 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+import orjson
+
+from tjson.core.diff import child_path
+
+# JSON type of every Python type orjson parses to
+TYPE_NAMES = {
+    dict: "object",
+    list: "array",
+    str: "string",
+    int: "integer",
+    float: "float",
+    bool: "boolean",
+    type(None): "null",
+}
+
+# Path step standing for every item of an array (`.items[*].name`)
+ANY_ITEM = "[*]"
+# Path step standing for the members of an object past MAX_KEYS distinct keys
+ANY_MEMBER = "*"
+# Children key of that path (can't clash with a real key)
+_OTHER_KEYS = object()
+
+# Orders of `DocumentProfile.sorted_paths`: attribute, and whether largest first
+SORT_KEYS = {
+    "bytes": ("bytes", True),
+    "count": ("count", True),
+    "items": ("items", True),
+    "depth": ("depth", True),
+    "path": ("path", False),
+}
+
+
+@dataclass(eq=False, slots=True)
+class PathStats:
+    """
+    What a document holds at one path.
+
+    Array items are merged into a single `[*]` step, so `.items[*].name`
+    sums the names of every item: the paths are the document's schema, not
+    its individual values. Objects used as maps (ids as keys) would make a
+    path per id, so past `DocumentProfile.MAX_KEYS` distinct keys the other
+    members of a path are merged into a `.*` step.
+    """
+
+    path: str
+    depth: int
+    count: int = 0  # Values found at this path
+    bytes: int = 0  # Their minified serialized size, summed
+    items: int = 0  # Members / items of the objects and arrays among them
+    types: Counter = field(default_factory=Counter)  # JSON type -> values
+    # Child path by key (None: array items), found without building strings
+    children: dict[object, "PathStats"] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Scalars found here and not measured yet (see DocumentProfile._flush)
+    scalars: list = field(default_factory=list, init=False, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "path": self.path,
+            "depth": self.depth,
+            "count": self.count,
+            "bytes": self.bytes,
+            "items": self.items,
+            "types": dict(self.types.most_common()),
+        }
+
+
+class DocumentProfile:
+    """
+    Size-by-path, depth, key frequency and type histograms of a parsed document.
+
+    Built in one iterative pass (no recursion limit). Everything is summed per
+    path rather than per value: a container only adds its brackets and
+    separators to its path, and scalars are queued on their path and measured
+    in batches, with one `orjson.dumps` of the whole batch. The paths are then
+    walked deepest first, adding each one's size (and its key's, once per
+    value) to its parent's; key frequencies come from the same walk. Sizes are those of the minified document, so the
+    root's size is what `tjson min` would write (without the newline).
+    """
+
+    # Queued scalars are measured every this many containers (bounds the queues)
+    FLUSH_CONTAINERS = 65536
+    # Distinct keys tracked as paths of their own under one path
+    MAX_KEYS = 1000
+
+    def __init__(self, tree: Any) -> None:
+        self.root = PathStats(".", 0)
+        self.paths: dict[str, PathStats] = {".": self.root}
+        self.keys: Counter = Counter()  # Object key -> occurrences
+        self.max_depth = 0
+        # Every path but the root with its parent and its key (None for array
+        # items), in creation order: a path is created after its parent
+        self._edges: list[tuple[PathStats, PathStats, Optional[str]]] = []
+        self._build(tree)
+        self._finish()
+        self.types: Counter = Counter()  # JSON type -> values, whole document
+        for stats in self.paths.values():
+            self.types.update(stats.types)
+
+    @property
+    def total_bytes(self) -> int:
+        return self.root.bytes
+
+    def _child(self, stats: PathStats, key: Optional[str]) -> PathStats:
+        """The path of `key` (None: array items) under `stats`, created on first use."""
+        children = stats.children
+        if key is None:
+            path = stats.path + ANY_ITEM
+        elif len(children) < self.MAX_KEYS:
+            path = child_path(stats.path, key)
+        else:
+            # One more distinct key: counted and measured here, one by one
+            self.keys[key] += 1
+            stats.bytes += len(orjson.dumps(key))
+            child = children.get(_OTHER_KEYS)
+            if child is None:
+                path = "." + ANY_MEMBER if stats.path == "." else f"{stats.path}.{ANY_MEMBER}"
+                child = children[_OTHER_KEYS] = self.paths[path] = PathStats(path, stats.depth + 1)
+                self._edges.append((child, stats, None))
+            return child
+        child = children[key] = self.paths[path] = PathStats(path, stats.depth + 1)
+        self._edges.append((child, stats, key))
+        return child
+
+    def _build(self, tree: Any) -> None:
+        root_type = type(tree)
+        if root_type is not dict and root_type is not list:
+            self.root.scalars.append(tree)
+            return
+
+        # Object/array counts use the Python types, named in _finish()
+        stack: list[tuple[Union[dict, list], PathStats]] = [(tree, self.root)]
+        max_depth = 0
+        visited = 0
+        next_flush = self.FLUSH_CONTAINERS
+        while stack:
+            node, stats = stack.pop()
+            size = len(node)
+            stats.types[type(node)] += 1
+            stats.items += size
+            if stats.depth >= max_depth:
+                max_depth = stats.depth + 1
+            visited += 1
+            if visited == next_flush:
+                self._flush()
+                # Documents with many paths flush less often (each flush visits them all)
+                next_flush += max(self.FLUSH_CONTAINERS, len(self.paths))
+            # Brackets and commas (plus colons for objects)
+            if not size:
+                stats.bytes += 2
+                continue
+
+            if type(node) is dict:
+                stats.bytes += 1 + 2 * size
+                children = stats.children
+                for key, value in node.items():
+                    child = children.get(key) or self._child(stats, key)
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        stack.append((value, child))
+                    else:
+                        child.scalars.append(value)
+            else:
+                stats.bytes += 1 + size
+                child = stats.children.get(None) or self._child(stats, None)
+                scalars = child.scalars
+                for value in node:
+                    value_type = type(value)
+                    if value_type is dict or value_type is list:
+                        stack.append((value, child))
+                    else:
+                        scalars.append(value)
+        self.max_depth = max_depth
+
+    def _flush(self) -> None:
+        """Measures the queued scalars of every path, a whole batch per dumps call."""
+        for stats in self.paths.values():
+            scalars = stats.scalars
+            if scalars:
+                # Minus the brackets and commas of the batch itself
+                stats.bytes += len(orjson.dumps(scalars)) - len(scalars) - 1
+                stats.types.update(map(type, scalars))
+                scalars.clear()
+
+    def _finish(self) -> None:
+        self._flush()
+        for stats in self.paths.values():
+            stats.types = Counter(
+                {TYPE_NAMES[value_type]: count for value_type, count in stats.types.items()}
+            )
+            stats.count = stats.types.total()
+        # Children before their parents; keys are counted once per path too
+        for child, parent, key in reversed(self._edges):
+            parent.bytes += child.bytes
+            if key is not None:
+                parent.bytes += child.count * len(orjson.dumps(key))
+                self.keys[key] += child.count
+        self._edges.clear()
+
+    def sorted_paths(self, sort: str = "bytes", limit: Optional[int] = None) -> list[PathStats]:
+        """The paths in one of the SORT_KEYS orders (ties keep document order)."""
+        attribute, reverse = SORT_KEYS[sort]
+        paths = sorted(
+            self.paths.values(), key=lambda stats: getattr(stats, attribute), reverse=reverse
+        )
+        return paths if limit is None else paths[:limit]
+
+    def to_dict(self, sort: str = "bytes", limit: Optional[int] = None) -> dict:
+        return {
+            "bytes": self.total_bytes,
+            "max_depth": self.max_depth,
+            "path_count": len(self.paths),
+            "types": dict(self.types.most_common()),
+            "keys": dict(self.keys.most_common(limit)),
+            "paths": [stats.to_dict() for stats in self.sorted_paths(sort, limit)],
+        }
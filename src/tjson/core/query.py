@@ -0,0 +1,285 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+# One step of a compiled query: maps a stream of values to a stream of values
+Step = Callable[[Iterable[Any]], Iterator[Any]]
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$-]*")
+_INTEGER = re.compile(r"-?\d+")
+_SPACE = re.compile(r"\s*")
+
+# Dotted fields that are fused into a single lookup loop
+Fields = tuple[str, ...]
+Selector = Union[str, int, slice]
+
+
+class QueryError(ValueError):
+    """The query text is not valid; the message points at the position."""
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """
+    A parsed query, ready to run against any number of documents.
+
+    Evaluation chains one generator per step, so matches are produced lazily
+    and a caller can stream (or stop) them without building the full list.
+    """
+
+    text: str
+    steps: tuple[Step, ...]
+
+    def evaluate(self, tree: Any) -> Iterator[Any]:
+        values: Iterable[Any] = (tree,)
+        for step in self.steps:
+            values = step(values)
+        return iter(values)
+
+
+def _fields_step(names: Fields) -> Step:
+    """`.a.b.c`: one loop with chained lookups instead of a generator per name."""
+    if len(names) == 1:
+        (name,) = names
+
+        def step(values: Iterable[Any]) -> Iterator[Any]:
+            for value in values:
+                if type(value) is dict and name in value:
+                    yield value[name]
+
+        return step
+
+    def step(values: Iterable[Any]) -> Iterator[Any]:
+        for value in values:
+            for name in names:
+                if type(value) is not dict or name not in value:
+                    break
+                value = value[name]
+            else:
+                yield value
+
+    return step
+
+
+def _wildcard(values: Iterable[Any]) -> Iterator[Any]:
+    """`[*]` / `.*`: every member of objects and arrays."""
+    for value in values:
+        if type(value) is dict:
+            yield from value.values()
+        elif type(value) is list:
+            yield from value
+
+
+def _descendants(values: Iterable[Any]) -> Iterator[Any]:
+    """`..`: each value followed by all its descendants, in document order."""
+    for value in values:
+        # Iterative pre-order walk: deep documents don't hit the recursion limit
+        stack = [iter((value,))]
+        while stack:
+            for item in stack[-1]:
+                yield item
+                if type(item) is dict:
+                    stack.append(iter(item.values()))
+                    break
+                if type(item) is list:
+                    stack.append(iter(item))
+                    break
+            else:
+                stack.pop()
+
+
+def _selectors_step(selectors: tuple[Selector, ...]) -> Step:
+    """`[0]`, `[-1]`, `[1:5]`, `["key"]` and unions of them (`[0, 2]`)."""
+
+    def step(values: Iterable[Any]) -> Iterator[Any]:
+        for value in values:
+            value_type = type(value)
+            for selector in selectors:
+                if type(selector) is str:
+                    if value_type is dict and selector in value:
+                        yield value[selector]
+                elif value_type is list:
+                    if type(selector) is slice:
+                        yield from value[selector]
+                    elif -len(value) <= selector < len(value):
+                        yield value[selector]
+
+    return step
+
+
+class _Parser:
+    """Recursive-descent parser for the query subset, see `QueryEngine`."""
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.pos = 0
+        self.steps: list[Step] = []
+        self.fields: list[str] = []  # Pending dotted names, fused when flushed
+
+    def error(self, message: str) -> QueryError:
+        return QueryError(f"{message} at position {self.pos + 1}: {self.text}")
+
+    def peek(self, token: str) -> bool:
+        return self.text.startswith(token, self.pos)
+
+    def skip_space(self) -> None:
+        self.pos = _SPACE.match(self.text, self.pos).end()
+
+    def flush_fields(self) -> None:
+        if self.fields:
+            self.steps.append(_fields_step(tuple(self.fields)))
+            self.fields = []
+
+    def add(self, step: Step) -> None:
+        self.flush_fields()
+        self.steps.append(step)
+
+    def parse(self) -> tuple[Step, ...]:
+        self.skip_space()
+        if self.peek("$"):
+            self.pos += 1  # JSONPath root
+        elif self.peek(".") and not self.peek(".."):
+            # jq: a lone "." is the identity, ".a" is a field
+            self.pos += 1
+            self.parse_member()
+
+        while True:
+            self.skip_space()
+            if self.pos == len(self.text):
+                break
+            if self.peek(".."):
+                self.pos += 2
+                self.add(_descendants)
+                if not self.peek("["):
+                    self.parse_member(required=True)
+            elif self.peek("."):
+                self.pos += 1
+                self.parse_member(required=True)
+            elif self.peek("["):
+                self.parse_brackets()
+            else:
+                raise self.error(f"Unexpected {self.text[self.pos]!r}")
+
+        self.flush_fields()
+        return tuple(self.steps)
+
+    def parse_member(self, required: bool = False) -> None:
+        """The part after a dot: a name, `*`, or jq's `.[...]`."""
+        if self.peek("*"):
+            self.pos += 1
+            self.add(_wildcard)
+            return
+        if self.peek("["):
+            self.parse_brackets()
+            return
+        match = _IDENTIFIER.match(self.text, self.pos)
+        if match:
+            self.fields.append(match.group())
+            self.pos = match.end()
+        elif required:
+            raise self.error("Expected a field name")
+
+    def parse_brackets(self) -> None:
+        self.pos += 1  # "["
+        self.skip_space()
+        if self.peek("]") or self.peek("*"):
+            # jq's `[]` and JSONPath's `[*]`
+            if self.peek("*"):
+                self.pos += 1
+                self.skip_space()
+            self.expect("]")
+            self.add(_wildcard)
+            return
+
+        selectors: list[Selector] = []
+        while True:
+            self.skip_space()
+            selectors.append(self.parse_selector())
+            self.skip_space()
+            if self.peek(","):
+                self.pos += 1
+                continue
+            self.expect("]")
+            break
+
+        if len(selectors) == 1 and type(selectors[0]) is str:
+            self.fields.append(selectors[0])  # `["key"]` is just a field
+        else:
+            self.add(_selectors_step(tuple(selectors)))
+
+    def parse_selector(self) -> Selector:
+        if self.peek('"') or self.peek("'"):
+            return self.parse_string()
+
+        # Index or slice: [n], [start:stop], [start:stop:step]
+        parts: list[Optional[int]] = []
+        while True:
+            self.skip_space()
+            match = _INTEGER.match(self.text, self.pos)
+            if match:
+                parts.append(int(match.group()))
+                self.pos = match.end()
+                self.skip_space()
+            else:
+                parts.append(None)
+            if not self.peek(":") or len(parts) == 3:
+                break
+            self.pos += 1
+
+        if len(parts) == 1:
+            if parts[0] is None:
+                raise self.error("Expected an index, a slice or a quoted key")
+            return parts[0]
+        if len(parts) == 3 and parts[2] == 0:
+            raise self.error("Slice step cannot be zero")
+        return slice(*parts)
+
+    def parse_string(self) -> str:
+        quote = self.text[self.pos]
+        chars: list[str] = []
+        self.pos += 1
+        while self.pos < len(self.text):
+            char = self.text[self.pos]
+            if char == "\\" and self.pos + 1 < len(self.text):
+                chars.append(self.text[self.pos + 1])
+                self.pos += 2
+                continue
+            self.pos += 1
+            if char == quote:
+                return "".join(chars)
+            chars.append(char)
+        raise self.error("Unterminated string")
+
+    def expect(self, token: str) -> None:
+        if not self.peek(token):
+            raise self.error(f"Expected {token!r}")
+        self.pos += len(token)
+
+
+class QueryEngine:
+    """
+    Path queries over parsed JSON: a subset shared by jq and JSONPath.
+
+        .items[*].metadata.name     $.items[*].metadata.name
+        .items[0]  .items[-1]       .items[2:10]  .items[0, 3]
+        .spec["app.kubernetes.io"]  ..name (any depth)   .*  .[]
+
+    Queries are compiled once into a chain of generator steps and the
+    compiled form is cached, so re-running a query (e.g. after an edit)
+    only pays for the evaluation.
+    """
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def compile(text: str) -> CompiledQuery:
+        """
+        Raises:
+            QueryError: If the query is not valid.
+        """
+        return CompiledQuery(text, _Parser(text).parse())
+
+    @staticmethod
+    def evaluate(text: str, tree: Any) -> Iterator[Any]:
+        """Compiles (or reuses) the query and yields its matches lazily."""
+        return QueryEngine.compile(text).evaluate(tree)
@@ -0,0 +1,57 @@
+import threading
+from typing import Optional
+
+from tjson.config import (
+    DEBOUNCE_COST_FACTOR,
+    DEBOUNCE_MAX_SECONDS,
+    DEBOUNCE_MIN_SECONDS,
+    ON_DEMAND_BYTES,
+    ON_DEMAND_SECONDS,
+)
+
+
+class AdaptiveDebounce:
+    """
+    Picks how long to wait after an edit before processing the input.
+
+    Keeps a moving average of the observed processing cost per byte, so the
+    delay follows what this machine actually needs for a given input size:
+    a few KB get processed almost immediately, while a document that takes
+    seconds to parse waits until the typing has really stopped. Past the
+    on-demand limits `delay_for` returns None and nothing runs automatically.
+    """
+
+    # Weight of the newest sample in the moving average
+    SMOOTHING = 0.3
+    # Assumed cost before anything was measured (~100MB/s)
+    DEFAULT_SECONDS_PER_BYTE = 1 / (100 * 1024 * 1024)
+    # Smaller runs are dominated by fixed overhead and are not recorded
+    MIN_SAMPLE_BYTES = 64 * 1024
+
+    def __init__(self) -> None:
+        self.seconds_per_byte = self.DEFAULT_SECONDS_PER_BYTE
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, size: int, seconds: float) -> None:
+        """Adds a measured run (called from processing workers)."""
+        if size < self.MIN_SAMPLE_BYTES or seconds <= 0:
+            return
+        sample = seconds / size
+        with self._lock:
+            if self.samples == 0:
+                self.seconds_per_byte = sample
+            else:
+                self.seconds_per_byte += self.SMOOTHING * (sample - self.seconds_per_byte)
+            self.samples += 1
+
+    def estimate(self, size: int) -> float:
+        """Expected processing time of an input of `size` bytes, in seconds."""
+        return size * self.seconds_per_byte
+
+    def delay_for(self, size: int) -> Optional[float]:
+        """Debounce in seconds, or None if the input should only be processed on demand."""
+        cost = self.estimate(size)
+        if size > ON_DEMAND_BYTES or cost > ON_DEMAND_SECONDS:
+            return None
+        return min(max(cost * DEBOUNCE_COST_FACTOR, DEBOUNCE_MIN_SECONDS), DEBOUNCE_MAX_SECONDS)
@@ -0,0 +1,212 @@
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+Buffer = Union[bytes, bytearray]
+
+ALL, KEYS, VALUES = "all", "keys", "values"
+
+# A string token, with the colon that makes it an object key
+_STRING = re.compile(rb'"[^"\\\n]*+(?:\\.[^"\\\n]*+)*+"(\s*:)?')
+# Text outside strings that can belong to a value (number, true, null...)
+_LITERAL = re.compile(rb'[^\s{}\[\],:"]+')
+
+# Matches found so far and bytes scanned, reported after every chunk
+SearchCallback = Callable[[int, int], None]
+
+
+class SearchError(ValueError):
+    """The search text is not a valid pattern."""
+
+
+class SearchCancelled(Exception):
+    """Raised when a scan is cancelled."""
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    What to look for in the output.
+
+    Written in the search bar as plain text, `/regex/`, and either with a
+    `key:` or `value:` prefix to only match inside object keys or values.
+    Case-insensitive unless the text has an uppercase letter (smart case).
+    """
+
+    text: str
+    regex: bool = False
+    scope: str = ALL  # ALL, KEYS or VALUES
+    ignore_case: bool = False
+
+    @staticmethod
+    def parse(text: str) -> "SearchQuery":
+        scope = ALL
+        for prefix, prefix_scope in (("key:", KEYS), ("value:", VALUES)):
+            if text.startswith(prefix):
+                text, scope = text[len(prefix) :], prefix_scope
+                break
+        regex = len(text) > 2 and text.startswith("/") and text.endswith("/")
+        if regex:
+            text = text[1:-1]
+        return SearchQuery(text, regex, scope, ignore_case=text == text.lower())
+
+    def compile(self) -> "re.Pattern[bytes]":
+        """
+        Raises:
+            SearchError: If the pattern is invalid or matches empty text.
+        """
+        source = self.text.encode("utf-8")
+        if not self.regex:
+            source = re.escape(source)
+        flags = re.MULTILINE | (re.IGNORECASE if self.ignore_case else 0)
+        try:
+            pattern = re.compile(source, flags)
+        except re.error as e:
+            raise SearchError(f"Invalid pattern: {e}") from e
+        if pattern.fullmatch(b""):
+            raise SearchError("The pattern matches empty text")
+        return pattern
+
+
+class _Strings:
+    """
+    Walks the string tokens of a JSON buffer, in step with increasing match
+    offsets, to tell keys from values. JSON strings never hold a raw newline,
+    so the walk restarts from the line of each match instead of the top.
+    """
+
+    def __init__(self, data: Buffer) -> None:
+        self.data = data
+        self.pos = 0  # Outside of any string
+        self.token: Optional[re.Match] = None  # First string at or after pos, once found
+
+    def scope_of(self, start: int, end: int, limit: int) -> Optional[str]:
+        """KEYS or VALUES for the match start..end, None if it straddles tokens."""
+        data = self.data
+        newline = data.rfind(b"\n", self.pos, start)
+        if newline >= 0:
+            self.pos = newline + 1
+            self.token = None
+        while True:
+            token = self.token
+            if token is None:
+                quote = data.find(b'"', self.pos, start + 1)
+                if quote < 0:
+                    # Between strings: only a literal is part of a value
+                    return VALUES if _LITERAL.fullmatch(data, start, end) else None
+                token = _STRING.match(data, quote, limit)
+                if token is None:
+                    return VALUES  # Inside a string longer than the window; keys are short
+                self.token = token
+            if token.end() > start:
+                break
+            self.pos = token.end()
+            self.token = None
+        if end > token.end():
+            return None
+        return KEYS if token.group(1) is not None else VALUES
+
+
+class OutputSearch:
+    """
+    Byte offsets of every match of a `SearchQuery` in an output buffer.
+
+    The scan runs in a worker thread, CHUNK_BYTES at a time: the regex
+    engine holds the GIL for as long as a call lasts, so bounded calls keep
+    the UI responsive, and progress and cancellation happen between chunks.
+    Matches are kept in two compact arrays (16 bytes per match) that the UI
+    can already navigate while the scan goes on. The index is tied to the
+    buffer and its length at the start (`covers`), and is reused as long as
+    the output is unchanged.
+    """
+
+    CHUNK_BYTES = 4 * 1024 * 1024
+    # Chunks are searched this far past their end, so a match crossing a
+    # chunk boundary is still found (unless it is longer than this)
+    OVERLAP_BYTES = 4096
+    # Stop collecting after this many matches
+    MAX_MATCHES = 5_000_000
+
+    def __init__(self, data: Buffer, query: SearchQuery) -> None:
+        """
+        Raises:
+            SearchError: If the query is not a valid pattern.
+        """
+        self.data = data
+        self.query = query
+        self.size = len(data)
+        self.pattern = query.compile()
+        self.starts = array("Q")
+        self.ends = array("Q")
+        self.scanned = 0
+        self.complete = False
+        self.truncated = False
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def covers(self, data: Buffer, query: SearchQuery) -> bool:
+        """True while this index is valid for `data` (same buffer, same length) and `query`."""
+        return data is self.data and len(data) == self.size and query == self.query
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def scan(self, on_progress: Optional[SearchCallback] = None) -> None:
+        """
+        Finds every match. Runs in a worker thread.
+
+        Raises:
+            SearchCancelled: If `cancel()` was called.
+        """
+        data, size, search = self.data, self.size, self.pattern.search
+        strings = _Strings(data) if self.query.scope != ALL else None
+        starts, ends = self.starts, self.ends
+        pos = 0
+        while pos < size:
+            if self.cancelled:
+                raise SearchCancelled()
+            chunk_end = min(pos + self.CHUNK_BYTES, size)
+            limit = min(chunk_end + self.OVERLAP_BYTES, size)
+            while True:
+                match = search(data, pos, limit)
+                if match is None or match.start() >= chunk_end:
+                    break
+                start, end = match.span()
+                pos = end if end > start else start + 1
+                if strings and strings.scope_of(start, end, limit) != self.query.scope:
+                    continue
+                starts.append(start)
+                ends.append(end)
+            if len(starts) >= self.MAX_MATCHES:
+                del starts[self.MAX_MATCHES :], ends[self.MAX_MATCHES :]
+                self.truncated = True
+                break
+            # A match may run past the chunk; the next one resumes after it
+            pos = max(pos, chunk_end)
+            self.scanned = pos
+            if on_progress:
+                on_progress(len(starts), pos)
+        self.scanned = size
+        self.complete = True
+
+    def span(self, number: int) -> tuple[int, int]:
+        return self.starts[number], self.ends[number]
+
+    def first_at_or_after(self, offset: int) -> Optional[int]:
+        """Number of the first match starting at or after `offset`, among those found so far."""
+        number = bisect_left(self.starts, offset)
+        return number if number < len(self.starts) else None
+
+    def last_before(self, offset: int) -> Optional[int]:
+        """Number of the last match starting before `offset`, among those found so far."""
+        number = bisect_left(self.starts, offset) - 1
+        return number if number >= 0 else None
@@ -0,0 +1,153 @@
+import re
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterator, Optional, Union
+
+import orjson
+
+Buffer = Union[bytes, bytearray]
+
+# Everything up to the next structural byte (bracket or comma) in one match.
+# Strings are consumed whole, so brackets and commas inside them are skipped;
+# possessive quantifiers keep the scan linear.
+_STRUCTURAL = re.compile(rb'(?:"[^"\\]*+(?:\\.[^"\\]*+)*+"|[^"{}\[\],]++)*+[{}\[\],]')
+_NON_SPACE = re.compile(rb"[^ \t\r\n]")
+# A scalar value: a string, or a run of literal characters (number, true, null...)
+_SCALAR = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[^,\]} \t\r\n]+')
+
+OBJECT, ARRAY, COMMA = ord("{"), ord("["), ord(",")
+
+
+@dataclass
+class Member:
+    """One direct child of a container, as listed by `StructureIndex.members`."""
+
+    key: Optional[str]  # Object key, None for array items
+    position: int  # Index inside the parent
+    start: int  # Byte range of the value
+    end: int
+    node: int  # Container number for objects/arrays, -1 for scalars
+
+
+class StructureIndex:
+    """
+    Offsets of every object and array in a JSON document.
+
+    Built in a single regex pass that only stops at brackets and commas. Containers are numbered in
+    document order and described by parallel arrays (start/end offsets, depth,
+    parent, direct child count), about 30 bytes per container, so a tree view
+    can list any node's children straight from the buffer without parsing or
+    rendering the rest of the document. Expects valid JSON.
+    """
+
+    def __init__(self, data: Buffer) -> None:
+        self.data = data
+        self.starts = array("Q")
+        self.ends = array("Q")  # Exclusive: one past the closing bracket
+        self.depths = array("H")
+        self.parents = array("q")  # -1 for the root
+        self.child_counts = array("L")
+        self._scan()
+
+    def _scan(self) -> None:
+        data = self.data
+        starts, ends, parents = self.starts, self.ends, self.parents
+        depths, child_counts = self.depths, self.child_counts
+        stack: list[int] = []
+        # Commas seen directly inside each open container
+        commas: list[int] = []
+
+        for match in _STRUCTURAL.finditer(data):
+            pos = match.end() - 1
+            char = data[pos]
+            if char == COMMA:
+                commas[-1] += 1
+            elif char == OBJECT or char == ARRAY:
+                node = len(starts)
+                starts.append(pos)
+                ends.append(0)
+                depths.append(len(stack))
+                parents.append(stack[-1] if stack else -1)
+                child_counts.append(0)
+                stack.append(node)
+                commas.append(0)
+            else:  # Closing bracket
+                node = stack.pop()
+                count = commas.pop()
+                ends[node] = pos + 1
+                if count:
+                    child_counts[node] = count + 1
+                else:
+                    # No commas: one child, or empty if only whitespace inside
+                    inner = _NON_SPACE.search(data, starts[node] + 1, pos + 1)
+                    child_counts[node] = 0 if inner.start() == pos else 1
+
+    # --- NODES ---
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def is_object(self, node: int) -> bool:
+        return self.data[self.starts[node]] == OBJECT
+
+    def size(self, node: int) -> int:
+        """Bytes taken by the container, brackets included."""
+        return self.ends[node] - self.starts[node]
+
+    def node_at(self, offset: int) -> int:
+        """The container whose opening bracket is at `offset`."""
+        node = bisect_left(self.starts, offset)
+        if node == len(self.starts) or self.starts[node] != offset:
+            raise KeyError(offset)
+        return node
+
+    def subtree_end(self, node: int) -> int:
+        """Number of the first container after `node`'s descendants."""
+        return bisect_left(self.starts, self.ends[node], node + 1)
+
+    # --- MEMBERS ---
+
+    def members(
+        self, node: int, from_offset: Optional[int] = None, position: int = 0
+    ) -> Iterator[Member]:
+        """
+        Yields the direct children of a container, lazily and in order.
+
+        Nested containers are skipped by their recorded end offset, so the cost
+        is proportional to the members listed, not to the subtree size. To resume
+        after a member, pass its `end` as `from_offset` and `position + 1`.
+        """
+        data = self.data
+        is_object = self.is_object(node)
+        close = self.ends[node] - 1
+        pos = self.starts[node] + 1 if from_offset is None else from_offset
+
+        while True:
+            pos = _NON_SPACE.search(data, pos).start()
+            if pos >= close:
+                return
+            if data[pos] == COMMA:  # Between members
+                pos = _NON_SPACE.search(data, pos + 1).start()
+
+            key = None
+            if is_object:
+                match = _SCALAR.match(data, pos)
+                key = orjson.loads(match.group())
+                # Skip the colon and the whitespace around it
+                pos = _NON_SPACE.search(data, _NON_SPACE.search(data, match.end()).end()).start()
+
+            if data[pos] == OBJECT or data[pos] == ARRAY:
+                child = self.node_at(pos)
+                end = self.ends[child]
+            else:
+                child = -1
+                end = _SCALAR.match(data, pos).end()
+
+            yield Member(key, position, pos, end, child)
+            position += 1
+            pos = end
+
+    def value_bytes(self, member: Member, limit: int) -> bytes:
+        """The first `limit` bytes of a member's value."""
+        return bytes(self.data[member.start : min(member.end, member.start + limit)])
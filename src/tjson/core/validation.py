@@ -0,0 +1,156 @@
+import re
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import orjson
+
+from tjson.core.structure_index import StructureIndex
+
+Buffer = Union[bytes, bytearray]
+
+# Bytes that can change how brackets pair up or where strings end, and
+# non-ASCII bytes (an edit inside a character breaks the whole document's UTF-8)
+_STRUCTURAL = re.compile(rb'[{}\[\]"\\\x80-\xff]')
+
+# Unchanged prefixes and suffixes are compared this many bytes at a time
+_COMPARE_STEP = 64 * 1024
+
+
+@dataclass(frozen=True)
+class ErrorPosition:
+    """Where a document stops being valid JSON."""
+
+    offset: int  # Byte offset in the UTF-8 document
+    line: int  # 1-based
+    column: int  # 1-based, in characters
+    message: str  # orjson's message, without the position
+
+    def __str__(self) -> str:
+        return f"{self.message}: line {self.line} column {self.column}"
+
+    @staticmethod
+    def from_decode_error(e: orjson.JSONDecodeError) -> "ErrorPosition":
+        """Position of a parse error of a whole document."""
+        # orjson reports a character position in the decoded document
+        prefix = e.doc[: e.pos]
+        offset = e.pos if prefix.isascii() else len(prefix.encode("utf-8", "surrogatepass"))
+        return ErrorPosition(offset, e.lineno, e.colno, e.msg)
+
+    @staticmethod
+    def at(data: Buffer, offset: int, message: str) -> "ErrorPosition":
+        """Position of `offset` in `data`, line and column counted from the top."""
+        line_start = data.rfind(b"\n", 0, offset) + 1
+        column = len(bytes(data[line_start:offset]).decode("utf-8", errors="replace")) + 1
+        return ErrorPosition(offset, data.count(b"\n", 0, offset) + 1, column, message)
+
+
+@dataclass
+class Verdict:
+    """Outcome of `IncrementalValidator.check`."""
+
+    valid: Optional[bool]  # None when only a full parse can tell
+    error: Optional[ErrorPosition] = None
+    region_bytes: int = 0  # Size of the container that was reparsed
+    seconds: float = 0.0
+
+
+def _changes_structure(data: Buffer, start: int, end: int) -> bool:
+    """Whether editing data[start:end] can change more than the values around it."""
+    if _STRUCTURAL.search(data, start, end):
+        return True
+    # A multibyte character cut by the edit has non-ASCII bytes on its edges
+    return (start > 0 and data[start - 1] >= 0x80) or (end < len(data) and data[end] >= 0x80)
+
+
+def _common_prefix(a: Buffer, b: Buffer) -> int:
+    limit = min(len(a), len(b))
+    pos = 0
+    # Whole steps compare in C; only the first differing step is walked
+    while pos < limit and a[pos : pos + _COMPARE_STEP] == b[pos : pos + _COMPARE_STEP]:
+        pos += _COMPARE_STEP
+    pos = min(pos, limit)
+    while pos < limit and a[pos] == b[pos]:
+        pos += 1
+    return pos
+
+
+def _common_suffix(a: Buffer, b: Buffer, limit: int) -> int:
+    length = 0
+    a_end, b_end = len(a), len(b)
+    while length < limit:
+        step = min(_COMPARE_STEP, limit - length)
+        if a[a_end - length - step : a_end - length] != b[b_end - length - step : b_end - length]:
+            break
+        length += step
+    while length < limit and a[a_end - length - 1] == b[b_end - length - 1]:
+        length += 1
+    return length
+
+
+class IncrementalValidator:
+    """
+    Revalidates an edited document by reparsing only the container around the edit.
+
+    Keeps the last document known to be valid (`rebase`) with its structural
+    skeleton (`StructureIndex`: the offsets of every object and array). For
+    a new version, the unchanged prefix and suffix give the edited span, and
+    the innermost container enclosing it in the skeleton is parsed on its own:
+
+    - valid: the document is valid (a valid value replaced another one)
+    - invalid, and the edit added or removed no bracket, quote, backslash
+      (or non-ASCII byte): the containers still pair up the same way, so
+      the document is invalid too, at the same position
+    - otherwise: unknown, a full parse has to decide
+    """
+
+    def __init__(self) -> None:
+        self.data: Optional[bytes] = None
+        self.structure: Optional[StructureIndex] = None
+
+    def rebase(self, data: Buffer, structure: Optional[StructureIndex] = None) -> None:
+        """Makes `data`, which must be valid JSON, the document later versions are compared to."""
+        self.data = bytes(data)
+        self.structure = structure or StructureIndex(self.data)
+
+    def reset(self) -> None:
+        self.data = None
+        self.structure = None
+
+    def check(self, data: Buffer) -> Verdict:
+        start = time.perf_counter()
+        verdict = self._check(data)
+        verdict.seconds = time.perf_counter() - start
+        return verdict
+
+    def _check(self, data: Buffer) -> Verdict:
+        old, structure = self.data, self.structure
+        if old is None or not len(structure):
+            return Verdict(None)
+        prefix = _common_prefix(old, data)
+        if prefix == len(old) == len(data):
+            return Verdict(True)
+        suffix = _common_suffix(old, data, min(len(old), len(data)) - prefix)
+        old_end = len(old) - suffix  # Edited span: old[prefix:old_end] -> data[prefix:new_end]
+        new_end = len(data) - suffix
+
+        # Innermost container opened before the edit and closed after it
+        node = bisect_left(structure.starts, prefix) - 1
+        while node >= 0 and structure.ends[node] - 1 < old_end:
+            node = structure.parents[node]
+        if node < 0:
+            return Verdict(None)  # The edit touches the top-level brackets
+
+        region_start = structure.starts[node]
+        region_end = structure.ends[node] + len(data) - len(old)
+        region = data[region_start:region_end]
+        try:
+            orjson.loads(region)
+            return Verdict(True, region_bytes=len(region))
+        except orjson.JSONDecodeError as e:
+            if _changes_structure(old, prefix, old_end) or _changes_structure(data, prefix, new_end):
+                return Verdict(None, region_bytes=len(region))
+            position = ErrorPosition.from_decode_error(e)
+            error = ErrorPosition.at(data, region_start + position.offset, position.message)
+            return Verdict(False, error, region_bytes=len(region))
@@ -1,8 +1,36 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
 import pyperclip
 
+from tjson.config import CLIPBOARD_TIMEOUT_SECONDS
+
+
+class ClipboardTimeout(Exception):
+    """The system clipboard tool did not answer in time."""
+
+
+@dataclass
+class ClipboardContent:
+    data: bytes  # UTF-8
+    seconds: float  # Time the clipboard tool took
+
+    @property
+    def digest(self) -> bytes:
+        return ClipboardService.digest(self.data)
+
 
 class ClipboardService:
-    """Abstraction over system clipboard."""
+    """
+    Abstraction over system clipboard.
+
+    pyperclip shells out to pbcopy / xclip / wl-copy..., which takes seconds
+    on multi-MB payloads and can hang when nothing owns the clipboard. The
+    `*_bytes` methods are meant for worker threads and give up after a timeout.
+    """
 
     @staticmethod
     def copy(text: str) -> bool:
@@ -12,3 +40,54 @@ class ClipboardService:
         except Exception:
             # Log error here in a real app
             return False
+
+    @staticmethod
+    def paste_bytes(timeout: float = CLIPBOARD_TIMEOUT_SECONDS) -> ClipboardContent:
+        """
+        Reads the clipboard as UTF-8 bytes.
+
+        Raises:
+            ClipboardTimeout: If the clipboard tool takes longer than `timeout`.
+        """
+        start = time.perf_counter()
+        text = ClipboardService._call_with_timeout(pyperclip.paste, timeout)
+        return ClipboardContent((text or "").encode("utf-8"), time.perf_counter() - start)
+
+    @staticmethod
+    def copy_bytes(data: bytes, timeout: float = CLIPBOARD_TIMEOUT_SECONDS) -> float:
+        """
+        Puts UTF-8 `data` on the clipboard. Returns the seconds it took.
+
+        Raises:
+            ClipboardTimeout: If the clipboard tool takes longer than `timeout`.
+        """
+        start = time.perf_counter()
+        text = str(data, "utf-8")
+        ClipboardService._call_with_timeout(lambda: pyperclip.copy(text), timeout)
+        return time.perf_counter() - start
+
+    @staticmethod
+    def digest(data: Union[bytes, bytearray]) -> bytes:
+        """Content hash used to recognize a clipboard that was already pasted."""
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    @staticmethod
+    def _call_with_timeout(function: Callable[[], Any], timeout: float) -> Any:
+        # A hung clipboard tool can't be interrupted from Python: leave it to a
+        # daemon thread and stop waiting for it
+        outcome: dict[str, Any] = {}
+
+        def target() -> None:
+            try:
+                outcome["value"] = function()
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=target, name="clipboard", daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            raise ClipboardTimeout(f"the clipboard did not answer within {timeout:g}s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome.get("value")
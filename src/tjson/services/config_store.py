@@ -4,36 +4,75 @@ from pathlib import Path
 
 
 class ConfigStore:
-    """Manages persistent state (like last opened directory)."""
+    """Manages persistent state (like last opened directory and recent files)."""
 
     # Save file in the user's home directory so it works globally
     CONFIG_FILE = Path.home() / ".tjson_config.json"
 
+    # How many recently opened files are remembered
+    RECENT_FILES_LIMIT = 10
+
     @staticmethod
-    def get_last_path() -> str:
-        """Returns last used path, or current working directory if none exists."""
+    def _load() -> dict:
         try:
             if ConfigStore.CONFIG_FILE.exists():
                 with open(ConfigStore.CONFIG_FILE, "r") as f:
                     data = json.load(f)
-                    path = data.get("last_path", "")
-                    if path and os.path.exists(path):
-                        return path
+                    if isinstance(data, dict):
+                        return data
         except Exception:
             pass  # Ignore errors, fallback to default
-
-        return os.getcwd()
+        return {}
 
     @staticmethod
-    def save_last_path(path: str) -> None:
-        """Saves the directory of the selected file."""
+    def _update(**values) -> None:
+        """Writes `values` into the config file, keeping the other keys."""
         try:
-            # If a file path is passed, get its parent directory
-            if os.path.isfile(path):
-                path = os.path.dirname(path)
-
-            data = {"last_path": path}
+            data = ConfigStore._load()
+            data.update(values)
             with open(ConfigStore.CONFIG_FILE, "w") as f:
                 json.dump(data, f)
         except Exception:
             pass
+
+    @staticmethod
+    def get_last_path() -> str:
+        """Returns last used path, or current working directory if none exists."""
+        path = ConfigStore._load().get("last_path", "")
+        if path and os.path.exists(path):
+            return path
+        return os.getcwd()
+
+    @staticmethod
+    def save_last_path(path: str) -> None:
+        """Saves the directory of the selected file."""
+        # If a file path is passed, get its parent directory
+        if os.path.isfile(path):
+            path = os.path.dirname(path)
+        ConfigStore._update(last_path=path)
+
+    @staticmethod
+    def get_recent_files() -> list[str]:
+        """Recently opened files that still exist, most recent first."""
+        recent = ConfigStore._load().get("recent_files", [])
+        return [path for path in recent if isinstance(path, str) and os.path.isfile(path)]
+
+    @staticmethod
+    def add_recent_file(path: str) -> None:
+        """Moves `path` to the top of the recent files (and remembers its directory)."""
+        path = os.path.abspath(path)
+        recent = [other for other in ConfigStore.get_recent_files() if other != path]
+        ConfigStore._update(
+            recent_files=[path] + recent[: ConfigStore.RECENT_FILES_LIMIT - 1],
+            last_path=os.path.dirname(path),
+        )
+
+    @staticmethod
+    def get_picker_mode() -> str:
+        """"tree" (browse directories) or "search" (fuzzy find JSON files)."""
+        mode = ConfigStore._load().get("picker_mode")
+        return mode if mode in ("tree", "search") else "tree"
+
+    @staticmethod
+    def save_picker_mode(mode: str) -> None:
+        ConfigStore._update(picker_mode=mode)
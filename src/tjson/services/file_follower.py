@@ -0,0 +1,165 @@
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from tjson.config import FOLLOW_POLL_SECONDS, FOLLOW_TAIL_BYTES
+from tjson.services.file_loader import FileLoader
+
+TRUNCATED, ROTATED = "truncated", "rotated"
+
+
+class FollowError(Exception):
+    """The file can't be followed (e.g. it is compressed)."""
+
+
+@dataclass
+class FollowUpdate:
+    lines: bytes  # New complete lines, each ending with a newline
+    # TRUNCATED or ROTATED when the file was cut or replaced: the lines
+    # start over from its beginning and earlier records are gone
+    reset: Optional[str] = None
+
+
+class FileFollower:
+    """
+    Follows a growing JSON Lines file (`tail -F`), off the UI thread.
+
+    Polls the file's size and modification time; when it grew, only the
+    bytes after the last offset are read and the complete lines among them
+    are handed over (a trailing partial line waits for the next poll). The
+    work per poll is proportional to what was appended, not to the file
+    size. A file that shrank was truncated, one with a new inode was
+    rotated: both are followed again from their start.
+    """
+
+    # Bytes read per poll; a bigger backlog is caught up without waiting
+    READ_LIMIT = 8 * 1024 * 1024
+
+    def __init__(self, file_path: str, tail_bytes: int = FOLLOW_TAIL_BYTES) -> None:
+        self.file_path = file_path
+        self.tail_bytes = tail_bytes
+        # Next byte to read, None before the first poll
+        self.offset: Optional[int] = None
+        self.identity: Optional[tuple[int, int]] = None  # (device, inode)
+        self.mtime = 0.0
+        # More bytes are waiting than the last poll read
+        self.behind = False
+        # Bytes after the last newline read so far
+        self._partial = b""
+        # The first read starts mid-file: drop everything up to a newline
+        self._skip_to_line = False
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.file_path)
+
+    def follow(self, on_update: Callable[[FollowUpdate], None]) -> None:
+        """
+        Polls until cancelled, calling `on_update` with every batch of new lines.
+
+        Raises:
+            FollowError: If the file is compressed.
+            OSError: If the file can't be read (a missing file is waited for).
+        """
+        while not self.cancelled:
+            update = self.poll()
+            if update and not self.cancelled:
+                on_update(update)
+            if not self.behind:
+                self._cancel_event.wait(FOLLOW_POLL_SECONDS)
+
+    def poll(self) -> Optional[FollowUpdate]:
+        """Reads what was appended since the last poll; None when nothing was."""
+        try:
+            f = open(self.file_path, "rb")
+        except FileNotFoundError:
+            return None  # Rotated away, the new file isn't there yet
+        with f:
+            # Stat the open file, not the path: it can't be swapped under us
+            stat = os.fstat(f.fileno())
+            identity = (stat.st_dev, stat.st_ino)
+            reset = None
+            if self.offset is None:
+                if FileLoader.sniff_compression(f.read(6)):
+                    raise FollowError(f"{self.name} is compressed and can't be followed")
+                # Like `tail`: start with the last lines only
+                self.offset = max(stat.st_size - self.tail_bytes, 0)
+                self._skip_to_line = self.offset > 0
+            elif identity != self.identity:
+                reset = ROTATED
+            elif stat.st_size < self.offset:
+                reset = TRUNCATED
+            elif stat.st_size == self.offset and stat.st_mtime == self.mtime:
+                return None
+            if reset:
+                self.offset = 0
+                self._partial = b""
+            self.identity = identity
+            self.mtime = stat.st_mtime
+
+            f.seek(self.offset)
+            data = f.read(min(stat.st_size - self.offset, self.READ_LIMIT))
+        self.offset += len(data)
+        self.behind = stat.st_size > self.offset
+
+        if self._skip_to_line:
+            newline = data.find(b"\n")
+            if newline < 0:
+                return None
+            data = data[newline + 1 :]
+            self._skip_to_line = False
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        if not end and not reset:
+            return None
+        return FollowUpdate(data[:end], reset)
+
+
+class RecordRing:
+    """
+    The output of the latest `capacity` records of a followed file.
+
+    Records come in batches (BATCH_BYTES of lines each) and old batches are
+    dropped whole, once the ring is a quarter over capacity, so the view is
+    rebuilt from the ring now and then rather than on every poll. The newest
+    batch is always kept, even when it alone is over capacity.
+    """
+
+    # Records are added in batches of about this many bytes of lines
+    BATCH_BYTES = 64 * 1024
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.batches: deque[tuple[int, bytes]] = deque()
+        self.records = 0
+
+    def append(self, records: int, output: bytes) -> bool:
+        """Adds a batch; True when older batches were dropped (the view must be rebuilt)."""
+        if records:
+            self.batches.append((records, output))
+            self.records += records
+        if self.records <= self.capacity + self.capacity // 4:
+            return False
+        dropped = False
+        while len(self.batches) > 1 and self.records - self.batches[0][0] >= self.capacity:
+            self.records -= self.batches.popleft()[0]
+            dropped = True
+        return dropped
+
+    def clear(self) -> None:
+        self.batches.clear()
+        self.records = 0
+
+    def to_bytes(self) -> bytes:
+        return b"".join(output for _, output in self.batches)
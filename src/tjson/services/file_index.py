@@ -0,0 +1,191 @@
+import heapq
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from tjson.config import FILE_INDEX_CACHE_BYTES
+from tjson.core.cache import ResultCache
+from tjson.services.file_loader import COMPRESSED_EXTENSIONS
+
+JSON_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: str
+    relative_path: str  # From the scanned root; what the filter matches against
+    size: int
+    mtime: float
+
+
+# Number of JSON files found so far, reported while the scan goes on
+ScanCallback = Callable[[int], None]
+
+
+def is_json_file(name: str) -> bool:
+    """True for JSON / JSON Lines files, compressed or not ("a.json", "b.jsonl.gz")."""
+    name = name.lower()
+    for extension in COMPRESSED_EXTENSIONS:
+        if name.endswith(extension):
+            name = name[: -len(extension)]
+            break
+    return name.endswith(JSON_EXTENSIONS)
+
+
+def fuzzy_score(query: str, text: str) -> Optional[int]:
+    """
+    Scores `text` against a fuzzy `query` (its characters in order, gaps
+    allowed), higher is better; None when it does not match. Matches at word
+    starts, consecutive matches and matches in the file name score higher.
+    """
+    text_lower = text.lower()
+    name_start = text_lower.rfind(os.sep) + 1
+    score = 0
+    position = -1
+    for char in query.lower():
+        found = text_lower.find(char, position + 1)
+        if found < 0:
+            return None
+        if found == position + 1:
+            score += 5  # Consecutive
+        if found == 0 or not text_lower[found - 1].isalnum():
+            score += 3  # Start of a word
+        if found >= name_start:
+            score += 2  # In the file name rather than the directories
+        position = found
+    # Shorter paths win ties
+    return score * 1000 - len(text)
+
+
+class FileIndex:
+    """
+    Index of the JSON files under a directory, for the picker's search mode.
+
+    Directories are walked with `os.scandir` (no stat for anything but the
+    matching files) from a worker thread. A first scan fills `entries` batch by
+    batch, so the picker can filter while it goes on. Finished scans are cached
+    per directory, in an LRU bounded by FILE_INDEX_CACHE_BYTES: reopening the
+    picker searches the cached sizes and modification times at once, and the
+    rescan replaces them when it ends. A scan is dropped once the directory's
+    own modification time changes (files added, removed or renamed in it).
+    """
+
+    BATCH_SIZE = 500
+    # Stop scanning after this many matching files
+    MAX_FILES = 200_000
+    SKIPPED_DIRECTORIES = {"node_modules", "__pycache__"}
+    # Estimated memory of a cached entry, besides its two path strings
+    ENTRY_BYTES = 200
+
+    # Root -> (its modification time, entries of its latest complete scan)
+    _cache = ResultCache(FILE_INDEX_CACHE_BYTES)
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        self.entries: list[FileEntry] = list(self.cached(self.root))
+        self.scanned = False
+        self._cancel_event = threading.Event()
+
+    @staticmethod
+    def cached(root: str) -> list[FileEntry]:
+        root = os.path.abspath(root)
+        cached = FileIndex._cache.get(root)
+        if cached is None:
+            return []
+        mtime, entries = cached
+        if FileIndex._mtime(root) != mtime:
+            FileIndex._cache.discard(root)
+            return []
+        return entries
+
+    @staticmethod
+    def _mtime(directory: str) -> Optional[float]:
+        try:
+            return os.stat(directory).st_mtime
+        except OSError:
+            return None
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def scan(self, on_progress: Optional[ScanCallback] = None) -> list[FileEntry]:
+        """
+        Walks the tree (hidden directories excluded, symlinks not followed) and
+        returns every JSON file found. Runs in a worker thread; `on_progress`
+        is called every BATCH_SIZE files and at the end.
+        """
+        incremental = not self.entries
+        # Taken first, so changes made during the scan invalidate it
+        mtime = self._mtime(self.root)
+        found: list[FileEntry] = []
+        pending = [self.root]
+        reported = 0
+        while pending and not self.cancelled and len(found) < self.MAX_FILES:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        name = entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if not name.startswith(".") and name not in self.SKIPPED_DIRECTORIES:
+                                    pending.append(entry.path)
+                            elif is_json_file(name):
+                                stat = entry.stat()
+                                found.append(
+                                    FileEntry(
+                                        entry.path,
+                                        os.path.relpath(entry.path, self.root),
+                                        stat.st_size,
+                                        stat.st_mtime,
+                                    )
+                                )
+                        except OSError:
+                            continue  # Vanished or unreadable entry
+            except OSError:
+                continue  # Unreadable directory
+            if len(found) - reported >= self.BATCH_SIZE:
+                if incremental:
+                    self.entries.extend(found[reported:])
+                reported = len(found)
+                if on_progress:
+                    on_progress(reported)
+
+        if self.cancelled:
+            return found
+        self.entries = found
+        self.scanned = True
+        size = sum(self.ENTRY_BYTES + len(entry.path) + len(entry.relative_path) for entry in found)
+        if not FileIndex._cache.put(self.root, (mtime, found), size):
+            FileIndex._cache.discard(self.root)  # Over the whole budget: not kept
+        if on_progress:
+            on_progress(len(found))
+        return found
+
+    def search(self, query: str, limit: int) -> list[FileEntry]:
+        """The best `limit` entries for a fuzzy query (most recent first when empty)."""
+        if not query:
+            return heapq.nlargest(limit, self.entries, key=lambda entry: entry.mtime)
+        # A regex rejects most paths in C before any of them is scored in Python
+        pattern = re.compile(".*?".join(map(re.escape, query)), re.IGNORECASE)
+        scored = []
+        for entry in self.entries:
+            if pattern.search(entry.relative_path):
+                score = fuzzy_score(query, entry.relative_path)
+                if score is not None:
+                    scored.append((score, entry))
+        return [entry for _, entry in heapq.nlargest(limit, scored, key=lambda item: item[0])]
+
+
+def format_mtime(mtime: float) -> str:
+    """Modification time for listings: time of day if today, else the date."""
+    if time.strftime("%Y-%m-%d", time.localtime(mtime)) == time.strftime("%Y-%m-%d"):
+        return time.strftime("%H:%M", time.localtime(mtime))
+    return time.strftime("%Y-%m-%d", time.localtime(mtime))
@@ -0,0 +1,167 @@
+import bz2
+import gzip
+import lzma
+import mmap
+import os
+import threading
+from typing import IO, Callable, Optional
+
+
+# (bytes_read, total_bytes); total_bytes is 0 when unknown (pipes)
+ProgressCallback = Callable[[int, int], None]
+
+# Magic bytes -> compression format, and how to stream-decompress a file object of it
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+DECOMPRESSORS: dict[str, Callable[[IO[bytes]], IO[bytes]]] = {
+    "gzip": lambda f: gzip.GzipFile(fileobj=f, mode="rb"),
+    "bz2": lambda f: bz2.BZ2File(f, mode="rb"),
+    "xz": lambda f: lzma.LZMAFile(f, mode="rb"),
+}
+COMPRESSED_EXTENSIONS = (".gz", ".bz2", ".xz")
+
+
+class LoadCancelled(Exception):
+    """Raised inside the loading thread when the UI cancels a load."""
+
+
+class FileLoader:
+    """
+    Reads a file into memory in fixed-size chunks, off the UI thread.
+
+    The file is memory-mapped and copied chunk by chunk into a single
+    pre-sized buffer, so progress can be reported and the load can be
+    cancelled between chunks. The resulting bytes go straight to
+    `JSONProcessor` (orjson parses bytes natively) instead of being
+    decoded into a `TextArea` first.
+
+    Compressed files (gzip, bz2, xz, recognized by their magic bytes) are
+    decompressed on the fly, one chunk at a time, so only the decompressed
+    document is ever held in memory.
+    """
+
+    CHUNK_SIZE = 8 * 1024 * 1024  # 8MB per step
+
+    def __init__(self, file_path: str, chunk_size: int = CHUNK_SIZE) -> None:
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+        # Set by load(): the compression format found, and the bytes it expanded to
+        self.compression: Optional[str] = None
+        self.decompressed_bytes = 0
+
+    def cancel(self) -> None:
+        """Asks the loading thread to stop at the next chunk boundary."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def name(self) -> str:
+        """Short label for notifications and titles."""
+        return os.path.basename(self.file_path)
+
+    @property
+    def document_name(self) -> str:
+        """The name without a compression extension ("events.jsonl.gz" -> "events.jsonl")."""
+        name = self.name
+        for extension in COMPRESSED_EXTENSIONS:
+            if name.lower().endswith(extension):
+                return name[: -len(extension)]
+        return name
+
+    @staticmethod
+    def sniff_compression(head: bytes) -> Optional[str]:
+        """The compression format of a file starting with `head`, None for plain files."""
+        for magic, compression in COMPRESSION_MAGIC.items():
+            if head.startswith(magic):
+                return compression
+        return None
+
+    def load(self, on_progress: Optional[ProgressCallback] = None) -> bytearray:
+        """
+        Reads the whole file and returns its raw bytes.
+
+        Args:
+            on_progress: Called after every chunk with (bytes_read, total_bytes).
+
+        Raises:
+            LoadCancelled: If `cancel()` was called while reading.
+            OSError: If the file cannot be opened or read.
+        """
+        with open(self.file_path, "rb") as f:
+            total = os.fstat(f.fileno()).st_size
+            self.compression = self.sniff_compression(f.read(6))
+            f.seek(0)
+            if self.compression:
+                return self._load_compressed(f, total, on_progress)
+
+            buffer = bytearray(total)
+            if total == 0:
+                return buffer
+
+            view = memoryview(buffer)
+            try:
+                # 1. Map the file so chunks are copied straight from the page cache
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Some files (pipes, special files) cannot be mapped
+                mapped = None
+
+            source = memoryview(mapped) if mapped is not None else None
+            offset = 0
+            try:
+                while offset < total:
+                    if self._cancel_event.is_set():
+                        raise LoadCancelled(self.file_path)
+
+                    end = min(offset + self.chunk_size, total)
+                    # 2. Copy one chunk without creating an intermediate bytes object
+                    if source is not None:
+                        view[offset:end] = source[offset:end]
+                        read = end - offset
+                    else:
+                        read = f.readinto(view[offset:end])
+                        if not read:
+                            break
+                    offset += read
+
+                    if on_progress:
+                        on_progress(offset, total)
+            finally:
+                if source is not None:
+                    source.release()
+                    mapped.close()
+                view.release()
+
+        # The file shrank while we were reading it
+        if offset < total:
+            del buffer[offset:]
+        return buffer
+
+    def _load_compressed(
+        self, f: IO[bytes], total: int, on_progress: Optional[ProgressCallback]
+    ) -> bytearray:
+        """
+        Decompresses chunk by chunk. Progress is reported against the compressed
+        size (the only total known upfront); `decompressed_bytes` tracks the output.
+        """
+        buffer = bytearray()
+        # The decompressors release the GIL, so the UI stays responsive meanwhile
+        with DECOMPRESSORS[self.compression](f) as stream:
+            while True:
+                if self._cancel_event.is_set():
+                    raise LoadCancelled(self.file_path)
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                buffer += chunk
+                self.decompressed_bytes = len(buffer)
+                if on_progress:
+                    on_progress(f.tell(), total)
+        return buffer
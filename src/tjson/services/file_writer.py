@@ -0,0 +1,151 @@
+import contextlib
+import gzip
+import os
+import tempfile
+import threading
+from typing import Optional, Union
+
+from tjson.config import EXPORT_CHUNK_BYTES, GZIP_LEVEL
+from tjson.services.file_loader import ProgressCallback
+
+
+class ExportCancelled(Exception):
+    """Raised inside the export thread when the UI cancels an export."""
+
+
+class AtomicFile:
+    """
+    A temp file next to `path` that replaces `path` on commit.
+
+    The rename is atomic on the same filesystem, so an interrupted run never
+    leaves a half-written file behind. Existing file permissions are kept.
+    Used as a context manager it commits on success and discards on error.
+    With `compress`, everything written is gzip-compressed on the way out.
+    """
+
+    def __init__(self, path: str, compress: bool = False) -> None:
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.temp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+        )
+        self._file = os.fdopen(fd, "wb")
+        self._gzip: Optional[gzip.GzipFile] = None
+        if compress:
+            name = os.path.basename(path).removesuffix(".gz")
+            self._gzip = gzip.GzipFile(
+                filename=name, mode="wb", fileobj=self._file, compresslevel=GZIP_LEVEL
+            )
+        self.bytes_written = 0  # Before compression
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        (self._gzip or self._file).write(data)
+        self.bytes_written += len(data)
+
+    def commit(self) -> None:
+        try:
+            if self._gzip:
+                self._gzip.close()  # Writes the gzip trailer
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            try:
+                os.chmod(self.temp_path, os.stat(self.path).st_mode & 0o7777)
+            except FileNotFoundError:
+                os.chmod(self.temp_path, 0o644)  # New file: mkstemp's default is 0600
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        if self._gzip:
+            # Finish the stream into the doomed temp file; it may fail like the write did
+            with contextlib.suppress(OSError, ValueError):
+                self._gzip.close()
+        self._file.close()
+        try:
+            os.unlink(self.temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "AtomicFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self._file.closed:
+            return  # Already committed or discarded explicitly
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class FileWriter:
+    """Writes files atomically: readers see either the old or the new content."""
+
+    @staticmethod
+    def open_atomic(path: str, compress: bool = False) -> AtomicFile:
+        """Opens a streaming atomic writer, see `AtomicFile`."""
+        return AtomicFile(path, compress)
+
+    @staticmethod
+    def write_atomic(path: str, data: bytes) -> None:
+        """Writes to a temp file in the target directory, then renames it over `path`."""
+        with AtomicFile(path) as f:
+            f.write(data)
+
+
+class FileExporter:
+    """
+    Writes a buffer (e.g. the formatted output) to a file, off the UI thread.
+
+    The buffer is written straight from memoryview slices, one chunk at a
+    time, into an `AtomicFile`, so progress can be reported and the export
+    cancelled between chunks without ever copying the whole output. Paths
+    ending in ".gz" are gzip-compressed unless `compress` says otherwise.
+    """
+
+    def __init__(
+        self, path: str, compress: Optional[bool] = None, chunk_size: int = EXPORT_CHUNK_BYTES
+    ) -> None:
+        self.path = path
+        self.compress = path.lower().endswith(".gz") if compress is None else compress
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Asks the export thread to stop at the next chunk boundary."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def export(
+        self, data: Union[bytes, bytearray], on_progress: Optional[ProgressCallback] = None
+    ) -> int:
+        """
+        Writes `data` and returns the number of bytes written (before compression).
+
+        A bytearray must not be resized while it is being exported.
+
+        Raises:
+            ExportCancelled: If `cancel()` was called; the target is left untouched.
+            OSError: If the file cannot be written.
+        """
+        total = len(data)
+        with FileWriter.open_atomic(self.path, self.compress) as target:
+            with memoryview(data) as view:
+                for offset in range(0, total, self.chunk_size):
+                    if self._cancel_event.is_set():
+                        raise ExportCancelled(self.path)
+                    with view[offset : offset + self.chunk_size] as chunk:
+                        target.write(chunk)
+                    if on_progress:
+                        on_progress(min(offset + self.chunk_size, total), total)
+        return total
@@ -0,0 +1,92 @@
+import os
+import select
+import sys
+import threading
+from typing import Optional
+
+from tjson.services.file_loader import LoadCancelled, ProgressCallback
+
+
+class StdinReader:
+    """
+    Reads piped input (`kubectl get ... -o json | tjson`) incrementally.
+
+    Same interface as `FileLoader`, but the size is unknown up front, so
+    progress only reports the bytes received so far. Reads are polled with a
+    short timeout, so a cancel is honoured even while the producer is silent.
+    """
+
+    CHUNK_SIZE = 1024 * 1024  # 1MB per read
+    POLL_INTERVAL = 0.2  # Seconds between cancellation checks while waiting
+
+    name = "stdin"
+
+    def __init__(self, fd: int, chunk_size: int = CHUNK_SIZE) -> None:
+        self.fd = fd
+        self.chunk_size = chunk_size
+        self._cancel_event = threading.Event()
+
+    @staticmethod
+    def is_piped() -> bool:
+        """True when stdin is a pipe or a redirected file rather than a terminal."""
+        return sys.stdin is not None and not os.isatty(sys.stdin.fileno())
+
+    @classmethod
+    def detach(cls) -> Optional["StdinReader"]:
+        """
+        Takes over piped stdin for the TUI.
+
+        The pipe is moved to a private descriptor and fd 0 is pointed back at
+        the controlling terminal, so Textual keeps reading keystrokes while the
+        document is read in the background. Returns None if stdin is a terminal.
+        Raises OSError, with stdin left as it was, when there is no controlling
+        terminal to read keystrokes from (cron, CI, `docker run` without -t).
+        """
+        if not cls.is_piped():
+            return None
+        terminal = "CONIN$" if os.name == "nt" else "/dev/tty"
+        tty_fd = os.open(terminal, os.O_RDONLY)
+        pipe_fd = os.dup(0)
+        os.dup2(tty_fd, 0)
+        os.close(tty_fd)
+        return cls(pipe_fd)
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _wait_readable(self) -> bool:
+        """Blocks until data (or EOF) is available; False if cancelled meanwhile."""
+        if os.name == "nt":
+            return not self.cancelled  # select() only works on sockets there
+        while not self.cancelled:
+            readable, _, _ = select.select([self.fd], [], [], self.POLL_INTERVAL)
+            if readable:
+                return True
+        return False
+
+    def load(self, on_progress: Optional[ProgressCallback] = None) -> bytearray:
+        """
+        Reads until EOF and returns everything received.
+
+        Raises:
+            LoadCancelled: If `cancel()` was called while reading.
+        """
+        buffer = bytearray()
+        try:
+            while True:
+                if not self._wait_readable():
+                    raise LoadCancelled(self.name)
+                chunk = os.read(self.fd, self.chunk_size)
+                if not chunk:
+                    break  # EOF: the producer closed the pipe
+                buffer += chunk
+                if on_progress:
+                    on_progress(len(buffer), 0)
+        finally:
+            if self.fd != 0:
+                os.close(self.fd)
+        return buffer
@@ -0,0 +1,270 @@
+import time
+from collections import Counter
+
+import orjson
+
+from textual import on, work
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.containers import Horizontal, Vertical
+from textual.screen import Screen
+from textual.timer import Timer
+from textual.widgets import Button, Footer, Header
+from textual.worker import get_current_worker
+
+from tjson.config import DIFF_DEBOUNCE_SECONDS, EDITOR_LOAD_LIMIT, PREVIEW_BYTES
+from tjson.core.diff import JSONDiff, SubtreeHashes
+from tjson.core.line_index import LineIndex
+from tjson.core.metrics import MetricsLog, RunMetrics
+from tjson.core.processor import JSONProcessor
+from tjson.services.file_loader import FileLoader, LoadCancelled
+from tjson.ui.screens.file_picker import FilePickerScreen
+from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.output_viewer import OutputViewer
+from tjson.utils import format_size
+
+SIDES = ("old", "new")
+
+
+class DiffScreen(Screen):
+    """
+    Diff mode: two input panes (OLD, NEW) and the list of changes between them.
+
+    Both sides are parsed with `JSONProcessor` (sharing its cache with the main
+    screen) and compared with `JSONDiff` in a worker, so large documents that
+    are mostly identical are diffed without blocking the UI. Files over
+    EDITOR_LOAD_LIMIT are kept as raw bytes with a read-only preview, like
+    in the main screen.
+    """
+
+    BINDINGS = [
+        # Priority: the OLD/NEW editors would otherwise consume Escape
+        Binding("escape", "app.pop_screen", "Back", priority=True),
+        ("ctrl+o", "load('old')", "Load Old"),
+        ("ctrl+n", "load('new')", "Load New"),
+    ]
+
+    def __init__(self, old: str | bytearray = "", metrics: MetricsLog | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.initial_old = old
+        # Raw bytes of a side too large for its editor, by side
+        self.loaded_bytes: dict[str, bytearray | None] = {side: None for side in SIDES}
+        # Loader currently reading a file into a side, by side
+        self.loaders: dict[str, FileLoader | None] = {side: None for side in SIDES}
+        # Bumped on every new input; diff workers holding an older value are stale
+        self.generation = 0
+        self.debounce_timer: Timer | None = None
+        # Latest subtree hashes of each side; reused while that side's parsed tree
+        # (cached by JSONProcessor) is unchanged, so editing NEW never rehashes OLD
+        self.hashes: dict[str, SubtreeHashes | None] = {side: None for side in SIDES}
+        # Shared with the main screen, so diff runs show up in its HUD and trace
+        self.metrics = metrics or MetricsLog()
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=True)
+
+        with Horizontal(id="main-container"):
+            # --- LEFT PANE (OLD above NEW) ---
+            with Vertical(classes="pane-container"):
+                yield EditorPane(title="OLD", id="old-pane", theme="dracula")
+                yield EditorPane(title="NEW", id="new-pane", theme="dracula")
+
+                with Horizontal(classes="action-bar"):
+                    yield Button("📂 Load Old", id="load-old-btn", variant="primary")
+                    yield Button("📂 Load New", id="load-new-btn", variant="primary")
+
+            # --- RIGHT PANE (CHANGES) ---
+            with Vertical(classes="pane-container"):
+                yield OutputViewer(title="DIFF (Waiting...)", id="diff-pane")
+
+                with Horizontal(classes="action-bar"):
+                    yield Button("⬅ Back", id="back-btn", variant="default")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        if isinstance(self.initial_old, bytearray):
+            self.show_large_side("old", self.initial_old, "current input")
+        elif self.initial_old:
+            self.pane("old").set_text(self.initial_old, notify=False)
+        self.initial_old = ""
+        self.pane("new").text_area.focus()
+        self.run_diff_now()
+
+    def pane(self, side: str) -> EditorPane:
+        return self.query_one(f"#{side}-pane", EditorPane)
+
+    def side_input(self, side: str) -> str | bytearray:
+        """A side's document: a large file's bytes, or the editor text."""
+        data = self.loaded_bytes[side]
+        return data if data is not None else self.pane(side).get_text()
+
+    # --- INPUT ---
+
+    @on(EditorPane.Changed, "#old-pane")
+    @on(EditorPane.Changed, "#new-pane")
+    def on_side_changed(self, event: EditorPane.Changed) -> None:
+        if self.debounce_timer:
+            self.debounce_timer.stop()
+        self.debounce_timer = self.set_timer(DIFF_DEBOUNCE_SECONDS, self.run_diff_now)
+
+    @on(Button.Pressed, "#back-btn")
+    def on_back(self) -> None:
+        self.app.pop_screen()
+
+    @on(Button.Pressed, "#load-old-btn")
+    def on_load_old(self) -> None:
+        self.action_load("old")
+
+    @on(Button.Pressed, "#load-new-btn")
+    def on_load_new(self) -> None:
+        self.action_load("new")
+
+    def action_load(self, side: str) -> None:
+        """Opens the file picker for a side, or cancels that side's load in progress."""
+        loader = self.loaders[side]
+        if loader:
+            loader.cancel()
+            return
+        self.app.push_screen(
+            FilePickerScreen(), callback=lambda path: self.load_side(side, path)
+        )
+
+    def load_side(self, side: str, file_path: str | None) -> None:
+        if not file_path:
+            return
+        loader = FileLoader(file_path)
+        self.loaders[side] = loader
+        self.query_one(f"#load-{side}-btn", Button).label = "✖ Cancel Load"
+        self.pane(side).add_class("processing")
+        self.load_side_background(side, loader)
+
+    @work(thread=True, group="diff-load")
+    def load_side_background(self, side: str, loader: FileLoader) -> None:
+        try:
+            data = loader.load()
+            text = data.decode("utf-8") if len(data) <= EDITOR_LOAD_LIMIT else None
+        except LoadCancelled:
+            self.app.call_from_thread(self.finish_side_load, side, loader, None, None)
+            return
+        except Exception as e:
+            self.app.call_from_thread(self.finish_side_load, side, loader, None, None)
+            self.app.call_from_thread(
+                self.notify, f"Error reading file: {str(e)}", severity="error"
+            )
+            return
+        self.app.call_from_thread(self.finish_side_load, side, loader, data, text)
+
+    def finish_side_load(
+        self, side: str, loader: FileLoader, data: bytearray | None, text: str | None
+    ) -> None:
+        if loader is not self.loaders[side]:
+            return
+        self.loaders[side] = None
+        self.query_one(f"#load-{side}-btn", Button).label = f"📂 Load {side.title()}"
+        self.pane(side).remove_class("processing")
+        if data is None:
+            return  # Cancelled or failed (already reported)
+
+        if text is not None:
+            self.release_side(side)
+            self.pane(side).set_text(text, notify=False)
+        else:
+            self.show_large_side(side, data, loader.name)
+        self.run_diff_now()
+
+    def show_large_side(self, side: str, data: bytearray, name: str) -> None:
+        """Keeps a large document as bytes; its editor gets a read-only preview."""
+        self.loaded_bytes[side] = data
+        pane = self.pane(side)
+        preview = bytes(data[:PREVIEW_BYTES]).decode("utf-8", errors="replace")
+        pane.set_text(preview, notify=False)
+        pane.text_area.read_only = True
+        pane.set_title(f"{side.upper()} ({name} · {format_size(len(data))} · Preview)")
+
+    def release_side(self, side: str) -> None:
+        """Leaves large-file mode for a side and gives its editor back to the user."""
+        if self.loaded_bytes[side] is None:
+            return
+        self.loaded_bytes[side] = None
+        pane = self.pane(side)
+        pane.text_area.read_only = False
+        pane.set_title(pane.title)
+
+    # --- DIFF ---
+
+    def run_diff_now(self) -> None:
+        if self.debounce_timer:
+            self.debounce_timer.stop()
+            self.debounce_timer = None
+        self.generation += 1
+        self.query_one("#diff-pane", OutputViewer).add_class("processing")
+        self.compute_diff(self.side_input("old"), self.side_input("new"), self.generation)
+
+    @work(thread=True, exclusive=True, group="diff")
+    def compute_diff(self, old_raw: str | bytearray, new_raw: str | bytearray, generation: int) -> None:
+        worker = get_current_worker()
+        metrics = RunMetrics("diff", input_bytes=len(old_raw) + len(new_raw))
+        trees = []
+        start = time.perf_counter()
+        for side, raw in zip(SIDES, (old_raw, new_raw)):
+            if JSONProcessor.is_blank(raw):
+                self.app.call_from_thread(self.show_diff, b"", "DIFF (Waiting...)", generation)
+                return
+            try:
+                trees.append(JSONProcessor.parse(raw))
+            except orjson.JSONDecodeError as e:
+                self.app.call_from_thread(
+                    self.show_diff, b"", f"DIFF (Invalid {side.upper()}: {e})", generation, True
+                )
+                return
+        metrics.add_phase("parse", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for side, tree in zip(SIDES, trees):
+            hashes = self.hashes[side]
+            if hashes is None or hashes.tree is not tree:
+                self.hashes[side] = SubtreeHashes(tree)
+        old_hashes, new_hashes = self.hashes["old"], self.hashes["new"]
+        metrics.add_phase("hash", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        counts: Counter = Counter()
+        lines = []
+        for change in JSONDiff.diff(trees[0], trees[1], old_hashes, new_hashes):
+            if worker.is_cancelled:
+                return
+            counts[change.kind] += 1
+            lines.append(JSONDiff.format(change))
+        metrics.add_phase("diff", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        output = "\n".join(lines).encode("utf-8")
+        index = LineIndex(output) if output else None
+        metrics.add_phase("index", time.perf_counter() - start)
+        metrics.output_bytes = len(output)
+
+        if counts:
+            title = (
+                f"DIFF ({counts['added']} added · {counts['removed']} removed · "
+                f"{counts['changed']} changed · {metrics.total_seconds:.2f}s)"
+            )
+        else:
+            title = f"DIFF (Identical · {metrics.total_seconds:.2f}s)"
+        self.metrics.record(metrics)
+        self.app.call_from_thread(self.show_diff, output, title, generation, False, index)
+
+    def show_diff(
+        self,
+        output: bytes,
+        title: str,
+        generation: int,
+        error: bool = False,
+        index: LineIndex | None = None,
+    ) -> None:
+        if generation != self.generation:
+            return  # A newer diff is on its way
+        diff_pane = self.query_one("#diff-pane", OutputViewer)
+        diff_pane.remove_class("processing")
+        diff_pane.set_class(error, "error")
+        diff_pane.set_bytes(output, index)
+        diff_pane.set_title(title)
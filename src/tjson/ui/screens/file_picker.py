@@ -1,13 +1,57 @@
+import os
+import time
+
+from rich.style import Style
+from rich.text import Text
 from textual.screen import ModalScreen
-from textual.widgets import DirectoryTree, Button, Static
+from textual.widgets import DataTable, DirectoryTree, Button, Input, Static
+from textual.widgets.directory_tree import DirEntry
+from textual.widgets.tree import TreeNode
 from textual.containers import Vertical, Horizontal
-from textual import on
+from textual import events, on, work
 from pathlib import Path
+from tjson.config import EDITOR_LOAD_LIMIT, LARGE_FILE_WARNING_MB
 from tjson.services.config_store import ConfigStore
+from tjson.services.file_index import FileEntry, FileIndex, format_mtime
+from tjson.services.file_loader import COMPRESSED_EXTENSIONS
+from tjson.utils import format_size
+
+
+class JSONDirectoryTree(DirectoryTree):
+    """DirectoryTree that tags compressed files (opened transparently by the loader)."""
+
+    COMPRESSED_STYLE = Style(color="#ffb86c", italic=True)
+
+    def render_label(
+        self, node: TreeNode[DirEntry], base_style: Style, style: Style
+    ) -> Text:
+        label = super().render_label(node, base_style, style)
+        if node.data is not None and not node.allow_expand:
+            suffix = node.data.path.suffix.lower()
+            if suffix in COMPRESSED_EXTENSIONS:
+                label.append(f"  {suffix[1:]}", self.COMPRESSED_STYLE)
+        return label
 
 
 class FilePickerScreen(ModalScreen[str]):
-    """A polished, Dracula-themed file picker dialog."""
+    """
+    A polished, Dracula-themed file picker dialog.
+
+    Two modes (Ctrl+F switches, the choice is remembered): a directory tree,
+    and a search mode that indexes the JSON files under the current directory
+    in the background (`FileIndex`) and fuzzy-filters them as you type, with
+    their sizes and modification times. Recent files are listed first.
+    """
+
+    BINDINGS = [
+        ("ctrl+f", "toggle_mode", "Tree / Search"),
+        ("escape", "cancel", "Cancel"),
+    ]
+
+    # Rows shown in search mode
+    MAX_RESULTS = 200
+    # While scanning, results are refreshed at most this often
+    REFRESH_SECONDS = 0.25
 
     CSS = """
     /* --- OVERLAY --- */
@@ -60,6 +104,22 @@ class FilePickerScreen(ModalScreen[str]):
         text-style: bold;
     }
 
+    /* --- BODY (Search mode) --- */
+    #search-input {
+        width: 100%;
+        margin: 1 1 0 1;
+        border: round #6272a4;
+        background: #282a36;
+    }
+    #search-input:focus { border: round #bd93f9; }
+
+    #results {
+        width: 100%;
+        height: 1fr;
+        background: #282a36;
+        padding: 0 1;
+    }
+
     /* --- FOOTER (Action Bar) --- */
     #dialog-footer {
         width: 100%;
@@ -122,6 +182,17 @@ class FilePickerScreen(ModalScreen[str]):
         align: right middle;
     }
 
+    /* Tree / Search: Purple Theme */
+    #btn-mode {
+        background: #282a36;
+        color: #bd93f9;
+        border: round #bd93f9;
+    }
+    #btn-mode:hover {
+        background: #bd93f9;
+        color: #282a36;
+    }
+
     /* Cancel: Red Theme (UPDATED) */
     #btn-cancel {
         background: #282a36;   /* Dark Inside */
@@ -139,19 +210,29 @@ class FilePickerScreen(ModalScreen[str]):
     ScrollBar > .thumb:hover { background: #bd93f9; }
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.mode = ConfigStore.get_picker_mode()
+        # Index of the directory searched in search mode, built on first use
+        self.file_index: FileIndex | None = None
+        self.last_refresh = 0.0
+
     def compose(self):
         with Vertical(id="picker-dialog"):
             # Header
             yield Static("📂 Open File", id="dialog-title")
 
             # Body
-            yield DirectoryTree("./", id="tree")
+            yield JSONDirectoryTree("./", id="tree")
+            yield Input(placeholder="Type to filter JSON files (Enter opens the top match)", id="search-input")
+            yield DataTable(id="results", cursor_type="row", zebra_stripes=True)
 
             # Footer
             with Horizontal(id="dialog-footer"):
                 with Horizontal(id="nav-group"):
                     yield Button("⬆ Up Level", id="btn-up")
                     yield Button("🏠 Home", id="btn-home")
+                    yield Button("🔎 Search", id="btn-mode")
                     yield Button("Cancel", id="btn-cancel")
 
                 # with Horizontal(id="action-group"):
@@ -160,17 +241,143 @@ class FilePickerScreen(ModalScreen[str]):
         tree = self.query_one(DirectoryTree)
         start_path = ConfigStore.get_last_path()
         tree.path = start_path
-        self.update_title(start_path)
-        tree.focus()
+        self.query_one("#results", DataTable).add_columns("File", "Size", "Modified")
+        self.set_mode(self.mode)
 
     def update_title(self, path: str):
-        self.query_one("#dialog-title").update(f"📂 {path}")
+        if self.mode == "search" and self.file_index:
+            count = len(self.file_index.entries)
+            state = "" if self.file_index.scanned else " · scanning…"
+            self.query_one("#dialog-title").update(f"🔎 {path} · {count} JSON files{state}")
+        else:
+            self.query_one("#dialog-title").update(f"📂 {path}")
+
+    def set_mode(self, mode: str) -> None:
+        self.mode = mode
+        search = mode == "search"
+        tree = self.query_one(DirectoryTree)
+        tree.display = not search
+        self.query_one("#search-input").display = search
+        self.query_one("#results").display = search
+        self.query_one("#btn-mode", Button).label = "🌲 Tree" if search else "🔎 Search"
+        if search:
+            self.index_directory(str(tree.path))
+            self.query_one("#search-input").focus()
+        else:
+            tree.focus()
+        self.update_title(str(tree.path))
+
+    def action_toggle_mode(self) -> None:
+        self.set_mode("tree" if self.mode == "search" else "search")
+        ConfigStore.save_picker_mode(self.mode)
+
+    def change_directory(self, path: str) -> None:
+        tree = self.query_one(DirectoryTree)
+        tree.path = path
+        if self.mode == "search":
+            self.index_directory(path)
+            self.query_one("#search-input").focus()
+        else:
+            tree.focus()
+        self.update_title(path)
+
+    def open_file(self, path: str) -> None:
+        ConfigStore.add_recent_file(path)
+        self.dismiss(path)
+
+    # --- SEARCH MODE ---
+
+    def index_directory(self, path: str) -> None:
+        """Searches the cached index of `path` right away and rescans it in the background."""
+        root = os.path.abspath(path)
+        if self.file_index and self.file_index.root == root:
+            return
+        if self.file_index:
+            self.file_index.cancel()
+        self.file_index = FileIndex(root)
+        self.refresh_results()
+        self.scan_background(self.file_index)
+
+    @work(thread=True, exclusive=True, group="file-index")
+    def scan_background(self, index: FileIndex) -> None:
+        index.scan(on_progress=lambda count: self.app.call_from_thread(self.on_scan_progress, index))
+
+    def on_scan_progress(self, index: FileIndex) -> None:
+        if index is not self.file_index:
+            return
+        self.update_title(index.root)
+        now = time.monotonic()
+        if index.scanned or now - self.last_refresh >= self.REFRESH_SECONDS:
+            self.last_refresh = now
+            self.refresh_results()
+
+    @on(Input.Changed, "#search-input")
+    def refresh_results(self) -> None:
+        if self.file_index:
+            query = self.query_one("#search-input", Input).value.strip()
+            self.search_background(self.file_index, query)
+
+    @work(thread=True, exclusive=True, group="file-search")
+    def search_background(self, index: FileIndex, query: str) -> None:
+        entries = index.search(query, self.MAX_RESULTS)
+        recent: list[FileEntry] = []
+        if not query:
+            # Recent files first, wherever they are
+            for path in ConfigStore.get_recent_files():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                recent.append(FileEntry(path, path.replace(str(Path.home()), "~", 1), stat.st_size, stat.st_mtime))
+        self.app.call_from_thread(self.show_results, index, query, recent, entries)
+
+    def show_results(
+        self, index: FileIndex, query: str, recent: list[FileEntry], entries: list[FileEntry]
+    ) -> None:
+        if index is not self.file_index or query != self.query_one("#search-input", Input).value.strip():
+            return  # Stale: another directory or query since
+        table = self.query_one("#results", DataTable)
+        table.clear()
+        recent_paths = {entry.path for entry in recent}
+        shown = set()
+        for entry in recent + entries:
+            if entry.path in shown:
+                continue
+            shown.add(entry.path)
+            label = f"★ {entry.relative_path}" if entry.path in recent_paths else entry.relative_path
+            table.add_row(label, self.size_label(entry.size), format_mtime(entry.mtime), key=entry.path)
+
+    @staticmethod
+    def size_label(size: int) -> Text:
+        # Orange: skips the editor (preview only); red: triggers the large file warning
+        if size > LARGE_FILE_WARNING_MB * 1024 * 1024:
+            return Text(format_size(size), style="bold #ff5555")
+        if size > EDITOR_LOAD_LIMIT:
+            return Text(format_size(size), style="#ffb86c")
+        return Text(format_size(size))
+
+    @on(DataTable.RowSelected, "#results")
+    def on_result_selected(self, event: DataTable.RowSelected) -> None:
+        self.open_file(event.row_key.value)
+
+    @on(Input.Submitted, "#search-input")
+    def on_search_submitted(self) -> None:
+        table = self.query_one("#results", DataTable)
+        if table.row_count:
+            row_key, _ = table.coordinate_to_cell_key((table.cursor_row, 0))
+            self.open_file(row_key.value)
+
+    def on_key(self, event: events.Key) -> None:
+        # Down from the filter moves into the results
+        if event.key == "down" and self.focused is self.query_one("#search-input"):
+            self.query_one("#results").focus()
+            event.stop()
+
+    # --- TREE MODE ---
 
     @on(DirectoryTree.FileSelected)
     def on_file_selected(self, event: DirectoryTree.FileSelected) -> None:
-        selected_path = str(event.path)
-        ConfigStore.save_last_path(selected_path)
-        self.dismiss(selected_path)
+        self.open_file(str(event.path))
 
     @on(DirectoryTree.DirectorySelected)
     def on_dir_selected(self, event: DirectoryTree.DirectorySelected) -> None:
@@ -178,21 +385,21 @@ class FilePickerScreen(ModalScreen[str]):
 
     @on(Button.Pressed, "#btn-up")
     def on_go_up(self) -> None:
-        tree = self.query_one(DirectoryTree)
-        current_path = Path(tree.path)
-        parent_path = str(current_path.parent.resolve())
-        tree.path = parent_path
-        self.update_title(parent_path)
-        tree.focus()
+        current_path = Path(self.query_one(DirectoryTree).path)
+        self.change_directory(str(current_path.parent.resolve()))
 
     @on(Button.Pressed, "#btn-home")
     def on_go_home(self) -> None:
-        home_path = str(Path.home())
-        tree = self.query_one(DirectoryTree)
-        tree.path = home_path
-        self.update_title(home_path)
-        tree.focus()
+        self.change_directory(str(Path.home()))
+
+    @on(Button.Pressed, "#btn-mode")
+    def on_toggle_mode(self) -> None:
+        self.action_toggle_mode()
 
     @on(Button.Pressed, "#btn-cancel")
-    def on_cancel(self) -> None:
+    def action_cancel(self) -> None:
         self.dismiss(None)
+
+    def on_unmount(self) -> None:
+        if self.file_index:
+            self.file_index.cancel()
@@ -6,7 +6,7 @@ from textual import on
 
 
 class FilePromptScreen(ModalScreen[str]):
-    """A modal dialog to ask for a filepath."""
+    """A modal dialog to ask for a filepath (or any other single value)."""
 
     CSS = """
     FilePromptScreen {
@@ -42,12 +42,25 @@ class FilePromptScreen(ModalScreen[str]):
     }
     """
 
+    def __init__(
+        self,
+        question: str = "Enter file path (e.g., data.json):",
+        placeholder: str = "/path/to/file.json",
+        submit_label: str = "Load",
+        value: str = "",
+    ) -> None:
+        super().__init__()
+        self.question = question
+        self.placeholder = placeholder
+        self.submit_label = submit_label
+        self.value = value
+
     def compose(self) -> ComposeResult:
         with Grid(id="dialog"):
-            yield Label("Enter file path (e.g., data.json):", id="question")
-            yield Input(placeholder="/path/to/file.json", id="path-input")
+            yield Label(self.question, id="question")
+            yield Input(value=self.value, placeholder=self.placeholder, id="path-input")
             yield Button("Cancel", variant="error", id="cancel")
-            yield Button("Load", variant="success", id="load")
+            yield Button(self.submit_label, variant="success", id="load")
 
     def on_mount(self) -> None:
         self.query_one(Input).focus()
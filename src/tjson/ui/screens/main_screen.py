@@ -1,27 +1,138 @@
 import os
+import time
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING
+
+import orjson
 
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.containers import Horizontal, Vertical
-from textual.widgets import Header, Footer, Button, Switch, Label
+from textual.binding import Binding
+from textual.widgets import Header, Footer, Button, Switch, Label, Input, Tab, Tabs
 from textual import on, work
 from textual.timer import Timer
+from textual.worker import get_current_worker
 
+from tjson.ui.screens.main_screen_export import ExportMixin
+from tjson.ui.screens.main_screen_follow import FollowMixin
+from tjson.ui.screens.main_screen_tabs import DocumentTabsMixin
 from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.output_viewer import OutputViewer
+from tjson.ui.widgets.perf_hud import PerfHUD
+from tjson.ui.widgets.highlighting_text_area import HighlightingTextArea
+from tjson.core.documents import Settings
+from tjson.core.line_index import LineIndex
+from tjson.core.metrics import MetricsLog, RunMetrics
 from tjson.core.processor import JSONProcessor, ProcessingResult
-from tjson.services.clipboard import ClipboardService
+from tjson.core.scheduler import AdaptiveDebounce
+from tjson.core.search import OutputSearch, SearchCancelled, SearchError, SearchQuery
+from tjson.core.structure_index import StructureIndex
+from tjson.core.validation import ErrorPosition, IncrementalValidator
+from tjson.services.file_loader import FileLoader, LoadCancelled
+from tjson.services.stdin_reader import StdinReader
+from tjson.config import (
+    EDITOR_LOAD_LIMIT,
+    INCREMENTAL_VALIDATION_BYTES,
+    LARGE_FILE_WARNING_MB,
+    PREVIEW_BYTES,
+)
+from tjson.utils import format_size
+
+# Dialogs, diff mode, the clipboard, NDJSON and queries are imported where they
+# are first used, keeping them out of the time to first frame
+# (benchmarks/bench_startup.py)
+if TYPE_CHECKING:
+    from tjson.core.ndjson import LineError
+
+
+class MainScreen(DocumentTabsMixin, FollowMixin, ExportMixin, Screen):
+    """
+    The editor: input on the left, processed output on the right.
 
-# from tjson.ui.screens.file_prompt import FilePromptScreen
-from tjson.ui.screens.file_picker import FilePickerScreen
+    Tabs, Follow and Save Output live in mixins (main_screen_tabs.py,
+    main_screen_follow.py, main_screen_export.py); their @on handlers stay
+    here, because Textual only collects those from the screen class itself.
+    """
 
+    BINDINGS = [
+        ("escape", "cancel_load", "Cancel Load"),
+        ("ctrl+g", "goto_line", "Go to Line"),
+        ("ctrl+t", "toggle_tree", "Tree View"),
+        ("ctrl+k", "focus_query", "Query"),
+        ("f5", "process", "Process"),
+        ("f2", "toggle_hud", "Perf HUD"),
+        ("ctrl+s", "save_output", "Save Output"),
+        ("f3", "open_diff", "Diff"),
+        ("f9", "open_profile", "Profile"),
+        ("f8", "goto_error", "Go to Error"),
+        ("ctrl+l", "toggle_follow", "Follow"),
+        ("ctrl+f", "toggle_search", "Search"),
+        ("f4", "search_next", "Next Match"),
+        ("shift+f4", "search_previous", "Previous Match"),
+        ("ctrl+n", "new_tab", "New Tab"),
+        ("ctrl+f4", "close_tab", "Close Tab"),
+        Binding("ctrl+pagedown", "next_tab", "Next Tab", show=False),
+        Binding("ctrl+pageup", "previous_tab", "Previous Tab", show=False),
+    ]
 
-class MainScreen(Screen):
-    def __init__(self, **kwargs):
+    # Query matches are sent to the output in batches of about this size
+    QUERY_BATCH_BYTES = 1024 * 1024
+
+    def __init__(
+        self,
+        stdin_reader: StdinReader | None = None,
+        trace_path: str | None = None,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self.debounce_timer: Timer | None = None
+        # Loader of the file (or piped stdin) currently being read, None when idle
+        self.file_loader: FileLoader | StdinReader | None = None
+        # Piped input to read once the screen is up
+        self.stdin_reader = stdin_reader
+        # Raw bytes of a large file that bypasses the input editor
+        self.loaded_bytes: bytearray | None = None
+        # Bumped on every new input; workers holding an older value are stale
+        self.generation = 0
+        # Process pool for NDJSON chunks, started on first use
+        self.ndjson_executor: Executor | None = None
+        # Path query applied to the parsed input ("" shows the whole document)
+        self.active_query = ""
+        # Learns processing cost per byte and turns it into a debounce delay
+        self.debounce = AdaptiveDebounce()
+        # A processing worker is running; newer runs wait in pending_run
+        self.processing_busy = False
+        # Latest run requested while busy (older requests are dropped)
+        self.pending_run: tuple | None = None
+        # The input changed but is too large to process without F5
+        self.awaiting_manual = False
+        # Phase timings of recent runs (HUD), optionally traced to a file
+        self.metrics = MetricsLog(trace_path=trace_path)
+        # A clipboard worker is reading (Paste) or writing (Copy)
+        self.pasting = False
+        self.copying = False
+        # Match index of the latest output search, reused while the output is unchanged
+        self.output_search: OutputSearch | None = None
+        # Number of the match shown in the output, None until the first jump
+        self.search_match: int | None = None
+        # The first jump goes to the first match after this output offset
+        self.search_from = 0
+        # Where the input stopped being valid JSON, None while it is valid
+        self.input_error: ErrorPosition | None = None
+        # Last valid input and its skeleton, to recheck edits region by region
+        # (only touched by the processing worker)
+        self.validator = IncrementalValidator()
+        # Path of the last file loaded (plain files only), what Follow tails
+        self.loaded_path: str | None = None
+        # Settings the output on screen was completed with, None while it is
+        # being rebuilt or doesn't match the input; and the input's cache key
+        self.output_settings: Settings | None = None
+        self.output_key = None
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
+        yield Tabs(Tab(self.document.name, id=self.document.id), id="document-tabs")
 
         with Horizontal(id="main-container"):
             # --- LEFT PANE (INPUT) ---
@@ -39,47 +150,154 @@ class MainScreen(Screen):
                 # )
             # --- RIGHT PANE (OUTPUT) ---
             with Vertical(classes="pane-container"):
-                yield EditorPane(
-                    title="OUTPUT (Waiting...)",
-                    id="output-pane",
-                    read_only=True,
-                    theme="monokai",
+                yield Input(
+                    placeholder="Query, e.g. .items[*].metadata.name (Enter to run, empty to clear)",
+                    id="query-input",
                 )
+                with Horizontal(id="search-bar"):
+                    yield Input(
+                        placeholder="Search output: text, /regex/, key:… or value:… (Enter / F4: next)",
+                        id="search-input",
+                    )
+                    yield Label("", id="search-status")
+                yield OutputViewer(title="OUTPUT (Waiting...)", id="output-pane")
 
-                # --- ACTION BAR (Minify Switch + Copy Button) ---
+                # --- ACTION BAR (Minify Switch + Copy/Save Buttons) ---
                 with Horizontal(classes="action-bar"):
                     # 1. Copy Button (Right - Fills remaining space)
                     yield Button("📋 Copy Output", id="copy-btn", variant="success")
+                    yield Button("💾 Save Output", id="save-btn", variant="warning")
 
                     # 2. Minify Controls (Left)
                     with Horizontal(classes="minify-group"):
                         yield Label("Minify", classes="minify-label")
                         yield Switch(value=False, id="minify-switch", animate=True)
 
+                    # 3. JSON Lines mode: one record per line
+                    with Horizontal(classes="minify-group"):
+                        yield Label("NDJSON", classes="minify-label")
+                        yield Switch(value=False, id="ndjson-switch", animate=True)
+
+        hud = PerfHUD(id="perf-hud")
+        hud.display = False
+        yield hud
         yield Footer()
 
     def on_mount(self) -> None:
+        self.query_one("#search-bar").display = False
         self.query_one("#input-pane").text_area.focus()
+        if self.stdin_reader:
+            # `... | tjson`: stream the pipe in like a file load
+            self.file_loader = self.stdin_reader
+            self.stdin_reader = None
+            self.set_loading_state(True)
+            self.load_file_background(self.file_loader)
+
+    def on_unmount(self) -> None:
+        if self.follower:
+            self.follower.cancel()
+        if self.ndjson_executor:
+            self.ndjson_executor.shutdown(wait=False, cancel_futures=True)
+
+    @on(Button.Pressed, "#save-btn")
+    def on_save_pressed(self) -> None:
+        self.action_save_output()
+
+    @on(Tabs.TabActivated, "#document-tabs")
+    def on_tab_activated(self, event: Tabs.TabActivated) -> None:
+        self.activate_tab(event.tabs, event.tab.id)
 
     # --- ACTION HANDLERS ---
 
     @on(Button.Pressed, "#paste-btn")
     def action_paste_from_clipboard(self) -> None:
-        try:
-            import pyperclip
+        """Reads the clipboard in a worker: big clipboards take the tool seconds."""
+        if self.pasting:
+            self.notify("Still reading the clipboard", severity="warning")
+            return
+        self.pasting = True
+        self.query_one("#paste-btn", Button).label = "⏳ Pasting"
+        self.paste_background(self.current_input())
 
-            content = pyperclip.paste()
-            if content:
-                self.query_one("#input-pane", EditorPane).set_text(content)
-                self.notify(f"Pasted {len(content)} characters", title="Success")
-            else:
-                self.notify("Clipboard is empty", severity="warning")
+    @work(thread=True, exclusive=True, group="clipboard-paste")
+    def paste_background(self, current: str | bytearray) -> None:
+        from tjson.services.clipboard import ClipboardService
+
+        metrics = RunMetrics("paste")
+        try:
+            content = ClipboardService.paste_bytes()
         except Exception as e:
-            self.notify(f"Clipboard Error: {str(e)}", severity="error")
+            self.app.call_from_thread(
+                self.finish_paste, None, None, metrics, f"Clipboard Error: {str(e)}"
+            )
+            return
+        metrics.add_phase("clipboard", content.seconds)
+        metrics.input_bytes = len(content.data)
+        if not content.data:
+            self.app.call_from_thread(self.finish_paste, None, None, metrics, "Clipboard is empty")
+            return
+
+        # Pasting what the input already holds would only reprocess it
+        current_bytes = (
+            current.encode("utf-8", "surrogatepass") if isinstance(current, str) else current
+        )
+        if ClipboardService.digest(current_bytes) == content.digest:
+            self.app.call_from_thread(
+                self.finish_paste, None, None, metrics, "The clipboard is already in the input"
+            )
+            return
+
+        if len(content.data) > EDITOR_LOAD_LIMIT:
+            # Too big for the editor: the bytes go to the processor as they are
+            self.app.call_from_thread(
+                self.finish_paste, None, bytearray(content.data), metrics
+            )
+            return
+        start = time.perf_counter()
+        try:
+            text = content.data.decode("utf-8")
+        except UnicodeDecodeError:
+            self.app.call_from_thread(
+                self.finish_paste, None, None, metrics, "The clipboard is not valid text"
+            )
+            return
+        metrics.add_phase("decode", time.perf_counter() - start)
+        self.app.call_from_thread(self.finish_paste, text, None, metrics)
+
+    def finish_paste(
+        self,
+        text: str | None,
+        data: bytearray | None,
+        metrics: RunMetrics,
+        warning: str | None = None,
+    ) -> None:
+        """Runs on the UI thread with the clipboard content (text, or bytes if large)."""
+        self.pasting = False
+        self.query_one("#paste-btn", Button).label = "📋 Paste"
+        if warning:
+            self.notify(warning, severity="warning")
+            return
+
+        clipboard_seconds = metrics.phases.get("clipboard", 0.0)
+        if text is not None:
+            self.release_loaded_file()
+            self.load_editor_text(text, metrics)
+        else:
+            self.show_loaded_bytes(data, "Clipboard", metrics)
+            self.process_now(data)
+        self.notify(
+            f"Pasted {format_size(metrics.input_bytes)} in {clipboard_seconds:.2f}s",
+            title="Success",
+        )
 
     @on(Button.Pressed, "#load-btn")
     def action_load_file(self) -> None:
-        """Switch Input Pane to a File Input mode temporarily"""
+        """Opens the file picker, or cancels the load in progress"""
+        if self.file_loader:
+            self.action_cancel_load()
+            return
+        from tjson.ui.screens.file_picker import FilePickerScreen
+
         self.app.push_screen(FilePickerScreen(), callback=self.load_file_content)
 
     def load_file_content(self, file_path: str | None) -> None:
@@ -91,54 +309,555 @@ class MainScreen(Screen):
             self.notify(f"File not found: {file_path}", severity="error")
             return
 
+        # Check file size (Optional safety check)
+        file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        if file_size_mb > LARGE_FILE_WARNING_MB:
+            self.notify(
+                f"Warning: Loading very large file (>{LARGE_FILE_WARNING_MB}MB)",
+                severity="warning",
+            )
+
+        if not JSONProcessor.is_blank(self.current_input()):
+            self.open_tab()  # Keep the current document: load into a new tab
+
+        self.file_loader = FileLoader(file_path)
+        self.set_loading_state(True)
+        self.load_file_background(self.file_loader)
+
+    def check_action(self, action: str, parameters: tuple[object, ...]) -> bool | None:
+        # Only offer "Cancel Load" in the footer while a file is loading
+        if action == "cancel_load":
+            return self.file_loader is not None
+        # "Process" is only offered when edits are waiting for it
+        if action == "process":
+            return self.awaiting_manual
+        # Match navigation only shows up once a search found something
+        if action in ("search_next", "search_previous"):
+            return self.output_search is not None and len(self.output_search) > 0
+        if action == "goto_error":
+            return self.input_error is not None
+        return True
+
+    def action_cancel_load(self) -> None:
+        if self.file_loader:
+            self.file_loader.cancel()
+
+    @work(thread=True, exclusive=True, group="file-load")
+    def load_file_background(self, loader: FileLoader | StdinReader) -> None:
+        """Reads the file in chunks, then decodes it (small files) or builds a preview."""
+        metrics = RunMetrics("load")
+        start = time.perf_counter()
         try:
-            # Check file size (Optional safety check)
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            if file_size_mb > 500:
-                self.notify(
-                    "Warning: Loading very large file (>500MB)", severity="warning"
+            data = loader.load(
+                on_progress=lambda read, total: self.app.call_from_thread(
+                    self.show_load_progress, loader, read, total
                 )
+            )
+        except LoadCancelled:
+            self.app.call_from_thread(self.finish_file_load, loader, None, None)
+            return
+        except Exception as e:
+            self.app.call_from_thread(self.finish_file_load, loader, None, None)
+            self.app.call_from_thread(
+                self.notify, f"Error reading file: {str(e)}", severity="error"
+            )
+            return
+        compression = loader.compression if isinstance(loader, FileLoader) else None
+        metrics.add_phase(f"read+{compression}" if compression else "read", time.perf_counter() - start)
+        metrics.input_bytes = len(data)
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-                self.query_one("#input-pane", EditorPane).set_text(content)
-                self.notify(f"Loaded {os.path.basename(file_path)}", title="Success")
+        if len(data) <= EDITOR_LOAD_LIMIT:
+            # Small enough for the editor: decode it here, off the UI thread
+            start = time.perf_counter()
+            try:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                self.app.call_from_thread(self.finish_file_load, loader, None, None)
+                self.app.call_from_thread(
+                    self.notify, "Error: File is not valid text/JSON", severity="error"
+                )
+                return
+            metrics.add_phase("decode", time.perf_counter() - start)
+            self.app.call_from_thread(self.finish_file_load, loader, None, text, metrics)
+        else:
+            self.app.call_from_thread(self.finish_file_load, loader, data, None, metrics)
 
-        except UnicodeDecodeError:
-            self.notify("Error: File is not valid text/JSON", severity="error")
-        except Exception as e:
-            self.notify(f"Error reading file: {str(e)}", severity="error")
+    def show_load_progress(
+        self, loader: FileLoader | StdinReader, read: int, total: int
+    ) -> None:
+        if loader is not self.file_loader:
+            return
+        if isinstance(loader, FileLoader) and loader.compression:
+            percent = read * 100 // total
+            title = (
+                f"OUTPUT (Decompressing {percent}% · {format_size(read)} / {format_size(total)}"
+                f" {loader.compression} → {format_size(loader.decompressed_bytes)} ⏳)"
+            )
+        elif total:
+            percent = read * 100 // total
+            title = f"OUTPUT (Loading {percent}% · {format_size(read)} / {format_size(total)} ⏳)"
+        else:
+            # Pipes: the size is only known once the stream ends
+            title = f"OUTPUT (Reading {loader.name} · {format_size(read)} ⏳)"
+        self.query_one("#output-pane", OutputViewer).set_title(title)
+
+    def finish_file_load(
+        self,
+        loader: FileLoader | StdinReader,
+        data: bytearray | None,
+        text: str | None,
+        metrics: RunMetrics | None = None,
+    ) -> None:
+        """Runs on the UI thread once the loading worker is done."""
+        if loader is not self.file_loader:
+            return  # Superseded by a newer load
+        self.file_loader = None
+        self.set_loading_state(False)
+
+        file_name = loader.name
+        if loader.cancelled:
+            self.notify(f"Cancelled loading {file_name}", severity="warning")
+            return
+
+        self.rename_tab(self.document, file_name)
+        if isinstance(loader, FileLoader):
+            self.loaded_path = None if loader.compression else loader.file_path
+            # JSON Lines files switch the NDJSON mode on (without reprocessing twice)
+            ndjson_switch = self.query_one("#ndjson-switch", Switch)
+            with ndjson_switch.prevent(Switch.Changed):
+                ndjson_switch.value = loader.document_name.lower().endswith((".ndjson", ".jsonl"))
+
+        if text is not None:
+            # Process right away rather than after the typing debounce
+            self.release_loaded_file()
+            self.load_editor_text(text, metrics, notify=False)
+            self.process_now(text)
+        elif data is not None:
+            self.show_loaded_bytes(data, file_name, metrics)
+            self.process_now(data)
+        else:
+            return  # Failed, the worker already reported why
+
+        self.notify(f"Loaded {file_name}", title="Success")
+
+    def show_loaded_bytes(self, data: bytearray, name: str, metrics: RunMetrics | None) -> None:
+        """
+        Large input (file or clipboard): the editor only gets a read-only
+        preview, the processor works on the raw bytes directly.
+        """
+        self.loaded_bytes = data
+        preview = bytes(data[:PREVIEW_BYTES]).decode("utf-8", errors="replace")
+        self.load_editor_text(preview, metrics, notify=False)
+        input_pane = self.query_one("#input-pane", EditorPane)
+        input_pane.text_area.read_only = True
+        input_pane.set_title(f"INPUT ({name} · {format_size(len(data))} · Preview)")
+
+    def load_editor_text(
+        self, text: str, metrics: RunMetrics | None, notify: bool = True
+    ) -> None:
+        """Puts text into the input editor, recording how long the editor took."""
+        input_pane = self.query_one("#input-pane", EditorPane)
+        text_area = input_pane.text_area
+        start = time.perf_counter()
+        input_pane.set_text(text, notify=notify)
+        elapsed = time.perf_counter() - start
+        if metrics is None:
+            return
+        # The editor builds its highlights while loading: report them apart
+        highlight = text_area.last_highlight_seconds if isinstance(text_area, HighlightingTextArea) else 0.0
+        metrics.add_phase("editor", elapsed - highlight)
+        metrics.add_phase(f"highlight ({text_area.highlight_tier})", highlight)
+        self.record_metrics(metrics)
+
+    def record_metrics(self, metrics: RunMetrics) -> None:
+        self.metrics.record(metrics)
+        hud = self.query_one("#perf-hud", PerfHUD)
+        if hud.display:
+            hud.show_runs(self.metrics.latest(PerfHUD.ROWS))
+
+    def action_toggle_hud(self) -> None:
+        hud = self.query_one("#perf-hud", PerfHUD)
+        hud.display = not hud.display
+        if hud.display:
+            hud.show_runs(self.metrics.latest(PerfHUD.ROWS))
+
+    def set_loading_state(self, is_loading: bool) -> None:
+        load_btn = self.query_one("#load-btn", Button)
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if is_loading:
+            load_btn.label = "✖ Cancel Load"
+            output_pane.add_class("processing")
+        else:
+            load_btn.label = "📂 Load File"
+            self.set_processing_state(False)
+        self.refresh_bindings()
+
+    def release_loaded_file(self) -> None:
+        """Leaves large-file mode and gives the input editor back to the user."""
+        if self.loaded_bytes is None:
+            return
+        self.loaded_bytes = None
+        input_pane = self.query_one("#input-pane", EditorPane)
+        input_pane.text_area.read_only = False
+        input_pane.set_title(input_pane.title)
 
     @on(EditorPane.Changed, "#input-pane")
     def on_input_changed(self, event: EditorPane.Changed) -> None:
         self.trigger_processing(event.value)
 
     @on(Switch.Changed, "#minify-switch")
-    def on_minify_changed(self, event: Switch.Changed) -> None:
-        # Re-process using current input when switch toggles
-        current_input = self.query_one("#input-pane", EditorPane).get_text()
-        self.trigger_processing(current_input)
+    @on(Switch.Changed, "#ndjson-switch")
+    def on_mode_changed(self, event: Switch.Changed) -> None:
+        # Re-process using current input when a switch toggles. No debounce:
+        # the parsed tree is cached, so only the dump step runs again.
+        self.process_now(self.current_input())
+
+    def current_settings(self) -> Settings:
+        return (
+            self.query_one("#minify-switch", Switch).value,
+            self.query_one("#ndjson-switch", Switch).value,
+            self.active_query,
+        )
+
+    def current_input(self) -> str | bytearray:
+        """The document being worked on: a large file's bytes, or the editor text."""
+        if self.loaded_bytes is not None:
+            return self.loaded_bytes
+        return self.query_one("#input-pane", EditorPane).get_text()
+
+    def action_open_diff(self) -> None:
+        """Opens diff mode with the current input as the OLD side."""
+        from tjson.ui.screens.diff_screen import DiffScreen
+
+        self.app.push_screen(DiffScreen(old=self.current_input(), metrics=self.metrics))
+
+    def action_open_profile(self) -> None:
+        """Opens profile mode on the current input; a path picked there is queried."""
+        if self.query_one("#ndjson-switch", Switch).value:
+            self.notify("Profiles cover a single JSON document", severity="warning")
+            return
+        from tjson.ui.screens.profile_screen import ProfileScreen
+
+        self.app.push_screen(
+            ProfileScreen(self.current_input(), metrics=self.metrics), callback=self.run_query
+        )
+
+    def run_query(self, query: str | None) -> None:
+        if not query:
+            return
+        self.query_one("#query-input", Input).value = query
+        self.apply_query(query)
+
+    def action_focus_query(self) -> None:
+        self.query_one("#query-input", Input).focus()
+
+    @on(Input.Submitted, "#query-input")
+    def on_query_submitted(self, event: Input.Submitted) -> None:
+        self.apply_query(event.value.strip())
+
+    def apply_query(self, query: str) -> None:
+        from tjson.core.query import QueryEngine, QueryError
+
+        if query:
+            try:
+                QueryEngine.compile(query)
+            except QueryError as e:
+                self.notify(str(e), title="Invalid query", severity="error")
+                return
+            if self.query_one("#ndjson-switch", Switch).value:
+                self.notify("Queries run on a single JSON document", severity="warning")
+                return
+        self.active_query = query
+        self.process_now(self.current_input())
+
+    def process_now(self, raw: str | bytearray) -> None:
+        """Processes immediately, skipping (and cancelling) the debounce."""
+        if self.debounce_timer:
+            self.debounce_timer.stop()
+        self.stop_follow()  # The output is about to be replaced
+        self.set_awaiting_manual(False)
+        self.output_settings = None
+        self.generation += 1
+        is_minified = self.query_one("#minify-switch", Switch).value
+        is_ndjson = self.query_one("#ndjson-switch", Switch).value
+        self.start_processing(
+            raw, is_minified, self.generation, is_ndjson, self.active_query
+        )
 
     def trigger_processing(self, text: str) -> None:
         if self.debounce_timer:
             self.debounce_timer.stop()
 
+        # New input: whatever is still running is now stale
+        self.generation += 1
+        self.stop_follow()
+        self.output_settings = None
+        generation = self.generation
+
+        # Debounce sized to the input: instant for snippets, patient for huge
+        # documents, and nothing at all past the on-demand limits
+        delay = self.debounce.delay_for(len(text))
+        if delay is None:
+            self.set_awaiting_manual(True)
+            return
+        self.set_awaiting_manual(False)
+
         # Check toggle state
         is_minified = self.query_one("#minify-switch", Switch).value
+        is_ndjson = self.query_one("#ndjson-switch", Switch).value
+        query = self.active_query
 
-        # Debounce
         self.debounce_timer = self.set_timer(
-            0.6, lambda: self.process_json_background(text, is_minified)
+            delay,
+            lambda: self.start_processing(
+                text, is_minified, generation, is_ndjson, query
+            ),
         )
 
-    @work(thread=True)
-    def process_json_background(self, raw_text: str, minify: bool) -> None:
+    def set_awaiting_manual(self, awaiting: bool) -> None:
+        if awaiting == self.awaiting_manual:
+            return
+        self.awaiting_manual = awaiting
+        self.refresh_bindings()
+        if awaiting:
+            self.query_one("#output-pane", OutputViewer).set_title(
+                "OUTPUT (Input changed · F5 to process)"
+            )
+
+    def action_process(self) -> None:
+        self.process_now(self.current_input())
+
+    def start_processing(
+        self, raw: str | bytearray, minify: bool, generation: int, ndjson: bool, query: str
+    ) -> None:
+        """
+        Starts a processing worker, unless one is still running.
+
+        Workers can only stop between phases, so starting another one would
+        run two full parses side by side. Instead the request waits (replacing
+        any older waiting one) until the running worker is done.
+        """
+        if self.processing_busy:
+            self.pending_run = (raw, minify, generation, ndjson, query)
+            return
+        self.processing_busy = True
+        self.process_json_background(raw, minify, generation, ndjson, query)
+
+    def processing_finished(self) -> None:
+        self.processing_busy = False
+        pending, self.pending_run = self.pending_run, None
+        if pending is not None and pending[2] == self.generation:
+            self.start_processing(*pending)
+
+    @work(thread=True, exclusive=True, group="processing")
+    def process_json_background(
+        self,
+        raw_text: str | bytearray,
+        minify: bool,
+        generation: int,
+        ndjson: bool = False,
+        query: str = "",
+    ) -> None:
+        """
+        Only the newest generation gets to finish: a running job stops at the
+        next phase boundary (parse -> dump -> index) once a newer input exists,
+        and `start_processing` holds the newer run back until then.
+        """
+        try:
+            self.run_processing(raw_text, minify, generation, ndjson, query)
+        finally:
+            self.app.call_from_thread(self.processing_finished)
+
+    def run_processing(
+        self, raw_text: str | bytearray, minify: bool, generation: int, ndjson: bool, query: str
+    ) -> None:
+        worker = get_current_worker()
+
+        def is_stale() -> bool:
+            return worker.is_cancelled or generation != self.generation
+
         self.app.call_from_thread(self.set_processing_state, True)
-        result = JSONProcessor.process(raw_text, minify=minify)
-        self.app.call_from_thread(self.update_ui_with_result, result)
+        if ndjson:
+            self.process_ndjson(raw_text, minify, generation, is_stale)
+            return
+        if query:
+            self.process_query(raw_text, query, minify, generation, is_stale)
+            return
+
+        # An edit of a large document: the container around the edit often
+        # settles whether it is still valid, without a full parse
+        data = verdict = None
+        if isinstance(raw_text, str) and len(raw_text) >= INCREMENTAL_VALIDATION_BYTES:
+            # Lone surrogates (typed or pasted) pass through: the parse rejects them
+            data = raw_text.encode("utf-8", "surrogatepass")
+            verdict = self.validator.check(data)
+            if verdict.valid is False:
+                metrics = RunMetrics("validate", input_bytes=len(data))
+                metrics.add_phase("region", verdict.seconds)
+                result = ProcessingResult(
+                    "", False, str(verdict.error), metrics=metrics, error=verdict.error
+                )
+                self.app.call_from_thread(self.update_ui_with_result, result, None, generation)
+                return
+
+        # Bytes in, bytes out: the output goes to the viewer without a str round trip
+        result = JSONProcessor.process_bytes(raw_text, minify=minify, should_cancel=is_stale)
+        metrics = result.metrics
+        if "parse" in metrics.phases:
+            # A real parse happened: feed its cost to the debounce
+            self.debounce.record(len(raw_text), metrics.total_seconds)
+        if result.cancelled or is_stale():
+            return
+        if verdict:
+            metrics.add_phase("region", verdict.seconds)
+
+        # Index the output here so the UI thread only has to swap buffers
+        output_index = None
+        if result.is_valid and result.formatted_bytes:
+            start = time.perf_counter()
+            output_index = LineIndex(result.formatted_bytes)
+            metrics.add_phase("index", time.perf_counter() - start)
+        if is_stale():
+            return
+        self.app.call_from_thread(
+            self.update_ui_with_result, result, output_index, generation
+        )
+        if data is not None and result.is_valid and not verdict.valid:
+            # A new baseline, once the output is on screen. Edits the region
+            # check validates keep the old one: it stays a valid reference
+            self.validator.rebase(data)
+
+    def process_ndjson(
+        self, raw_text: str | bytearray, minify: bool, generation: int, is_stale
+    ) -> None:
+        """Streams NDJSON chunks into the output as they complete (worker thread)."""
+        from tjson.core.ndjson import NDJSONProcessor
+
+        data = raw_text.encode("utf-8", "surrogatepass") if isinstance(raw_text, str) else raw_text
+        metrics = RunMetrics("ndjson", input_bytes=len(data))
+        start = time.perf_counter()
+        if len(data) > NDJSONProcessor.CHUNK_SIZE and self.ndjson_executor is None:
+            self.ndjson_executor = NDJSONProcessor.create_executor()
+
+        self.app.call_from_thread(self.append_output, b"", generation, True)
+        records = 0
+        errors: list["LineError"] = []
+        error_count = 0
+        for chunk in NDJSONProcessor.process_stream(
+            data, minify, executor=self.ndjson_executor, should_cancel=is_stale
+        ):
+            records += chunk.records
+            error_count += len(chunk.errors)
+            errors.extend(chunk.errors[: 3 - len(errors)])
+            metrics.output_bytes += len(chunk.output)
+            self.app.call_from_thread(self.append_output, chunk.output, generation)
+        if is_stale():
+            return
+        metrics.add_phase("chunks", time.perf_counter() - start)
+        self.app.call_from_thread(
+            self.finish_ndjson, records, error_count, errors, generation, metrics
+        )
+
+    def process_query(
+        self, raw_text: str | bytearray, query: str, minify: bool, generation: int, is_stale
+    ) -> None:
+        """Streams the matches of a query into the output, one document each (worker thread)."""
+        from tjson.core.query import QueryEngine
+
+        metrics = RunMetrics("query", input_bytes=len(raw_text))
+        if JSONProcessor.is_blank(raw_text):
+            # Nothing to query: an empty output, as without a query
+            result = ProcessingResult("", True, None, metrics=metrics, formatted_bytes=b"")
+            self.app.call_from_thread(self.update_ui_with_result, result, None, generation)
+            return
+        start = time.perf_counter()
+        try:
+            # Same cache as process(): a document is parsed once for any number of queries
+            tree = JSONProcessor.parse(raw_text)
+        except orjson.JSONDecodeError as e:
+            result = ProcessingResult("", False, str(e), error=ErrorPosition.from_decode_error(e))
+            self.app.call_from_thread(self.update_ui_with_result, result, None, generation)
+            return
+
+        metrics.add_phase("parse", time.perf_counter() - start)
+        option = orjson.OPT_APPEND_NEWLINE | (0 if minify else orjson.OPT_INDENT_2)
+        start = time.perf_counter()
+        self.app.call_from_thread(self.append_output, b"", generation, True)
+        matches = 0
+        batch: list[bytes] = []
+        batch_size = 0
+        for match in QueryEngine.evaluate(query, tree):
+            matches += 1
+            rendered = orjson.dumps(match, option=option)
+            metrics.output_bytes += len(rendered)
+            batch.append(rendered)
+            batch_size += len(rendered)
+            if batch_size >= self.QUERY_BATCH_BYTES:
+                if is_stale():
+                    return
+                self.app.call_from_thread(self.append_output, b"".join(batch), generation)
+                batch, batch_size = [], 0
+        if is_stale():
+            return
+        self.app.call_from_thread(self.append_output, b"".join(batch), generation)
+        metrics.add_phase("query", time.perf_counter() - start)
+        self.app.call_from_thread(
+            self.finish_query, matches, metrics.phases["query"], generation, metrics
+        )
+
+    def finish_query(
+        self, matches: int, seconds: float, generation: int, metrics: RunMetrics
+    ) -> None:
+        if generation != self.generation:
+            return
+        self.output_settings, self.output_key = self.current_settings(), None
+        self.record_metrics(metrics)
+        self.set_processing_state(False)
+        self.query_one("#input-pane", EditorPane).remove_class("error")
+        self.show_input_error(None)
+        self.query_one("#output-pane", OutputViewer).set_title(
+            f"OUTPUT (Query · {matches:,} matches · {seconds * 1000:.0f} ms)"
+        )
+
+    def append_output(
+        self, data: bytes, generation: int, reset: bool = False
+    ) -> None:
+        """Streams output in (NDJSON chunks, query matches)."""
+        if generation != self.generation:
+            return
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if reset:
+            output_pane.set_bytes(b"")
+            if output_pane.tree_visible:
+                output_pane.show_text()  # Records/matches are separate documents
+        output_pane.append_bytes(data)
+
+    def finish_ndjson(
+        self,
+        records: int,
+        error_count: int,
+        errors: list["LineError"],
+        generation: int,
+        metrics: RunMetrics,
+    ) -> None:
+        if generation != self.generation:
+            return
+        self.output_settings, self.output_key = self.current_settings(), None
+        self.record_metrics(metrics)
+        self.set_processing_state(False)
+        input_pane = self.query_one("#input-pane", EditorPane)
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        output_pane.set_title(f"OUTPUT (NDJSON · {records:,} records · {error_count:,} errors)")
+        if error_count:
+            input_pane.add_class("error")
+            details = "\n".join(f"Line {e.line_number}: {e.message}" for e in errors)
+            self.notify(details, title=f"{error_count:,} invalid lines", severity="error")
+        else:
+            input_pane.remove_class("error")
+        self.show_input_error(None)
 
     def set_processing_state(self, is_processing: bool) -> None:
-        output_pane = self.query_one("#output-pane", EditorPane)
+        output_pane = self.query_one("#output-pane", OutputViewer)
         label = output_pane.query_one(".pane-label")  # This targets the Static title
 
         if is_processing:
@@ -150,23 +869,300 @@ class MainScreen(Screen):
             label.update(title)
             output_pane.remove_class("processing")
 
-    def update_ui_with_result(self, result: ProcessingResult) -> None:
-        output_pane = self.query_one("#output-pane", EditorPane)
+    def update_ui_with_result(
+        self,
+        result: ProcessingResult,
+        output_index: LineIndex | None = None,
+        generation: int | None = None,
+    ) -> None:
+        if generation is not None and generation != self.generation:
+            return  # A newer input arrived while this result was in flight
+
+        output_pane = self.query_one("#output-pane", OutputViewer)
         input_pane = self.query_one("#input-pane", EditorPane)
 
         self.set_processing_state(False)
 
         if result.is_valid:
-            output_pane.set_text(result.formatted_text)
+            start = time.perf_counter()
+            if output_index is not None:
+                output_pane.set_bytes(output_index.data, output_index)
+            else:
+                output_pane.set_bytes(result.to_bytes())
+            if result.metrics:
+                result.metrics.add_phase("viewer", time.perf_counter() - start)
             input_pane.remove_class("error")
+            self.show_input_error(None)
+            self.output_settings = self.current_settings()
+            self.output_key = result.content_key
+            if output_pane.tree_visible:
+                # Keep the tree open across edits: index the new output
+                self.build_structure(output_pane.get_bytes(), self.generation)
         else:
             input_pane.add_class("error")
+            self.show_input_error(result.error)
+            if result.error:
+                output_pane.set_title(f"OUTPUT (Invalid · {result.error} · F8: go to error)")
+            elif result.error_message:
+                output_pane.set_title(f"OUTPUT (Invalid · {result.error_message})")
+        if result.metrics:
+            self.record_metrics(result.metrics)
+
+    def show_input_error(self, error: ErrorPosition | None) -> None:
+        """Marks where the input is invalid (None clears the mark)."""
+        self.input_error = error
+        location = (error.line - 1, error.column - 1) if error else None
+        self.query_one("#input-pane", EditorPane).text_area.mark_error(location)
+        self.refresh_bindings()
+
+    def action_goto_error(self) -> None:
+        error = self.input_error
+        if error is None:
+            return
+        text_area = self.query_one("#input-pane", EditorPane).text_area
+        if error.line > text_area.document.line_count:
+            # A large file: the editor only holds a preview of its first lines
+            self.notify(f"{error} (past the preview)", title="Invalid JSON", severity="error")
+            return
+        text_area.move_cursor((error.line - 1, error.column - 1), center=True)
+        text_area.focus()
 
     @on(Button.Pressed, "#copy-btn")
     def action_copy(self) -> None:
-        text = self.query_one("#output-pane", EditorPane).get_text()
-        if text:
-            if ClipboardService.copy(text):
-                self.notify("Copied to clipboard!", title="Success")
-            else:
-                self.notify("Clipboard Error", severity="error")
+        # Copies the selected line range (shift+arrows in the output), or everything
+        if self.copying:
+            self.notify("Still copying to the clipboard", severity="warning")
+            return
+        data = self.query_one("#output-pane", OutputViewer).get_selected_bytes()
+        if data:
+            self.copying = True
+            self.copy_background(data)
+
+    @work(thread=True, exclusive=True, group="clipboard-copy")
+    def copy_background(self, data: bytes) -> None:
+        from tjson.services.clipboard import ClipboardService
+
+        metrics = RunMetrics("copy", input_bytes=len(data))
+        try:
+            seconds = ClipboardService.copy_bytes(data)
+        except Exception as e:
+            self.app.call_from_thread(self.finish_copy, metrics, f"Clipboard Error: {str(e)}")
+            return
+        metrics.add_phase("clipboard", seconds)
+        self.app.call_from_thread(self.finish_copy, metrics)
+
+    def finish_copy(self, metrics: RunMetrics, error: str | None = None) -> None:
+        self.copying = False
+        if error:
+            self.notify(error, severity="error")
+            return
+        self.record_metrics(metrics)
+        self.notify(
+            f"Copied {format_size(metrics.input_bytes)} in {metrics.total_seconds:.2f}s",
+            title="Success",
+        )
+
+    def action_toggle_tree(self) -> None:
+        """Switches the output between the text view and the structure tree."""
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if output_pane.tree_visible:
+            output_pane.show_text()
+            return
+        if self.query_one("#ndjson-switch", Switch).value or self.active_query:
+            self.notify("Tree view needs a single JSON document", severity="warning")
+            return
+        if output_pane.structure is not None:
+            output_pane.show_tree(output_pane.structure)
+            return
+        data = output_pane.get_bytes()
+        if data:
+            self.build_structure(data, self.generation)
+
+    @work(thread=True, exclusive=True, group="structure")
+    def build_structure(self, data: bytes, generation: int) -> None:
+        """Indexes every object/array of the output off the UI thread."""
+        self.app.call_from_thread(
+            self.query_one("#output-pane", OutputViewer).set_title,
+            "OUTPUT (Indexing structure... ⏳)",
+        )
+        structure = StructureIndex(data)
+        if generation == self.generation:
+            self.app.call_from_thread(self.show_structure, structure, generation)
+
+    def show_structure(self, structure: StructureIndex, generation: int) -> None:
+        if generation != self.generation:
+            return
+        self.set_processing_state(False)
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        output_pane.show_tree(structure)
+        output_pane.set_title(
+            f"OUTPUT (Tree · {len(structure):,} objects/arrays · o: show in text)"
+        )
+
+    def action_goto_line(self) -> None:
+        line_count = self.query_one("#output-pane", OutputViewer).line_view.line_count
+        if not line_count:
+            return
+        from tjson.ui.screens.file_prompt import FilePromptScreen
+
+        self.app.push_screen(
+            FilePromptScreen(
+                question=f"Go to output line (1-{line_count}):",
+                placeholder="Line number",
+                submit_label="Go",
+            ),
+            callback=self.goto_output_line,
+        )
+
+    def goto_output_line(self, value: str | None) -> None:
+        if not value:
+            return
+        try:
+            line_number = int(value.strip())
+        except ValueError:
+            self.notify(f"Not a line number: {value}", severity="error")
+            return
+        self.query_one("#output-pane", OutputViewer).goto_line(line_number)
+
+    # --- SEARCH ---
+
+    def action_toggle_search(self) -> None:
+        """Shows the output search bar, or hides it and drops the search."""
+        search_bar = self.query_one("#search-bar")
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if not search_bar.display:
+            search_bar.display = True
+            self.query_one("#search-input", Input).focus()
+            return
+        search_bar.display = False
+        self.clear_search()
+        output_pane.line_view.clear_match()
+        output_pane.line_view.focus()
+
+    def clear_search(self) -> None:
+        if self.output_search:
+            self.output_search.cancel()
+        self.output_search = None
+        self.search_match = None
+        self.query_one("#search-status", Label).update("")
+        self.refresh_bindings()
+
+    @on(Input.Submitted, "#search-input")
+    def on_search_submitted(self, event: Input.Submitted) -> None:
+        if not event.value:
+            self.clear_search()
+            self.query_one("#output-pane", OutputViewer).line_view.clear_match()
+            return
+        query = SearchQuery.parse(event.value)
+        search = self.output_search
+        if search and search.covers(self.query_one("#output-pane", OutputViewer).buffer, query):
+            self.action_search_next()
+        else:
+            self.run_search(query)
+
+    def run_search(self, query: SearchQuery) -> None:
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        data = output_pane.buffer
+        if not data:
+            self.notify("Nothing to search: the output is empty", severity="warning")
+            return
+        try:
+            search = OutputSearch(data, query)
+        except SearchError as e:
+            self.notify(str(e), title="Invalid search", severity="error")
+            return
+        self.clear_search()
+        self.output_search = search
+        # Start from the cursor, like a search in an editor
+        view = output_pane.line_view
+        self.search_from = view.index.starts[view.cursor_line]
+        self.query_one("#search-status", Label).update("Searching…")
+        self.search_background(search)
+
+    @work(thread=True, exclusive=True, group="search")
+    def search_background(self, search: OutputSearch) -> None:
+        metrics = RunMetrics("search", input_bytes=search.size)
+        start = time.perf_counter()
+        try:
+            search.scan(
+                lambda found, scanned: self.app.call_from_thread(self.show_search_progress, search)
+            )
+        except SearchCancelled:
+            return
+        metrics.add_phase("scan", time.perf_counter() - start)
+        self.app.call_from_thread(self.finish_search, search, metrics)
+
+    def show_search_progress(self, search: OutputSearch) -> None:
+        if search is not self.output_search:
+            return  # Replaced or cleared meanwhile
+        percent = search.scanned * 100 // max(search.size, 1)
+        self.query_one("#search-status", Label).update(f"{len(search):,} matches · {percent}%")
+        self.jump_to_first_match()
+
+    def finish_search(self, search: OutputSearch, metrics: RunMetrics) -> None:
+        if search is not self.output_search:
+            return
+        self.record_metrics(metrics)
+        self.refresh_bindings()
+        self.jump_to_first_match()
+        self.show_search_status()
+
+    def jump_to_first_match(self) -> None:
+        """Shows the first match after the cursor as soon as it is found."""
+        search = self.output_search
+        if search is None or self.search_match is not None:
+            return
+        if not search.covers(self.query_one("#output-pane", OutputViewer).buffer, search.query):
+            return  # The output changed under this scan
+        number = search.first_at_or_after(self.search_from)
+        if number is None:
+            if not search.complete or not len(search):
+                return
+            number = 0  # Nothing below the cursor: wrap around to the top
+        self.show_search_match(number)
+
+    def show_search_match(self, number: int) -> None:
+        search = self.output_search
+        self.search_match = number
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if output_pane.tree_visible:
+            output_pane.show_text()
+        output_pane.line_view.show_match(*search.span(number))
+        self.show_search_status()
+
+    def show_search_status(self) -> None:
+        search = self.output_search
+        if not search.complete:
+            return  # The progress updates own the label until the scan ends
+        total = f"{len(search):,}{'+' if search.truncated else ''}"
+        if not len(search):
+            status = "No matches"
+        elif self.search_match is None:
+            status = f"{total} matches"
+        else:
+            status = f"{self.search_match + 1:,} / {total}"
+        self.query_one("#search-status", Label).update(status)
+
+    def action_search_next(self) -> None:
+        self.step_search(1)
+
+    def action_search_previous(self) -> None:
+        self.step_search(-1)
+
+    def step_search(self, step: int) -> None:
+        """Moves to the next (1) or previous (-1) match, wrapping around once the scan is done."""
+        search = self.output_search
+        if search is None or not len(search):
+            return
+        if not search.covers(self.query_one("#output-pane", OutputViewer).buffer, search.query):
+            self.run_search(search.query)  # The output changed since: search it again
+            return
+        if self.search_match is None:
+            self.jump_to_first_match()
+            return
+        number = self.search_match + step
+        if not 0 <= number < len(search):
+            if not search.complete:
+                return  # More matches may still come
+            number %= len(search)
+        self.show_search_match(number)
@@ -0,0 +1,103 @@
+import os
+import time
+
+from textual import work
+from textual.widgets import Button, Switch
+
+from tjson.core.metrics import RunMetrics
+from tjson.services.file_writer import ExportCancelled, FileExporter
+from tjson.ui.widgets.output_viewer import OutputViewer
+from tjson.utils import format_size
+
+
+class ExportMixin:
+    """
+    Save Output for `MainScreen`: streams the output buffer to a file in a
+    worker, with progress on the Save button (which then cancels the save).
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # "Save Output" in progress, None when idle
+        self.exporter: FileExporter | None = None
+
+    def action_save_output(self) -> None:
+        """Asks where to save the output, or cancels the save in progress."""
+        if self.exporter:
+            self.exporter.cancel()
+            return
+        if self.processing_busy:
+            self.notify("Wait for processing to finish", severity="warning")
+            return
+        if not self.query_one("#output-pane", OutputViewer).buffer:
+            self.notify("Nothing to save", severity="warning")
+            return
+        from tjson.ui.screens.file_prompt import FilePromptScreen
+
+        ndjson = self.query_one("#ndjson-switch", Switch).value
+        self.app.push_screen(
+            FilePromptScreen(
+                question="Save output to (end with .gz to compress):",
+                placeholder="/path/to/output.json",
+                submit_label="Save",
+                value="output.ndjson" if ndjson else "output.json",
+            ),
+            callback=self.save_output_to,
+        )
+
+    def save_output_to(self, path: str | None) -> None:
+        if not path or not path.strip():
+            return
+        data = self.query_one("#output-pane", OutputViewer).buffer
+        if self.follower:
+            # Follow keeps appending to the buffer, which can't grow while exported:
+            # save a snapshot of the records (at most FOLLOW_MAX_RECORDS)
+            data = bytes(data)
+        self.exporter = FileExporter(os.path.expanduser(path.strip()))
+        self.set_saving_state(True)
+        self.export_output_background(self.exporter, data)
+
+    @work(thread=True, exclusive=True, group="export")
+    def export_output_background(self, exporter: FileExporter, data: bytes | bytearray) -> None:
+        """Streams the output buffer to disk in chunks (compressed for .gz)."""
+        metrics = RunMetrics("export", input_bytes=len(data))
+        start = time.perf_counter()
+        try:
+            exporter.export(
+                data,
+                on_progress=lambda written, total: self.app.call_from_thread(
+                    self.show_save_progress, exporter, written, total
+                ),
+            )
+        except ExportCancelled:
+            self.app.call_from_thread(self.finish_export, exporter, None)
+            return
+        except OSError as e:
+            self.app.call_from_thread(self.finish_export, exporter, None, str(e))
+            return
+        metrics.add_phase("gzip+write" if exporter.compress else "write", time.perf_counter() - start)
+        metrics.output_bytes = os.path.getsize(exporter.path)
+        self.app.call_from_thread(self.finish_export, exporter, metrics)
+
+    def show_save_progress(self, exporter: FileExporter, written: int, total: int) -> None:
+        if exporter is self.exporter:
+            self.query_one("#save-btn", Button).label = f"✖ Saving {written * 100 // total}%"
+
+    def finish_export(
+        self, exporter: FileExporter, metrics: RunMetrics | None, error: str | None = None
+    ) -> None:
+        self.exporter = None
+        self.set_saving_state(False)
+        if exporter.cancelled:
+            self.notify(f"Cancelled saving {exporter.name}", severity="warning")
+        elif error:
+            self.notify(f"Error saving output: {error}", severity="error")
+        elif metrics:
+            size = format_size(metrics.input_bytes)
+            if exporter.compress:
+                size += f" ({format_size(metrics.output_bytes)} gzipped)"
+            self.notify(f"Saved {size} to {exporter.path}", title="Success")
+            self.record_metrics(metrics)
+
+    def set_saving_state(self, is_saving: bool) -> None:
+        self.query_one("#save-btn", Button).label = "✖ Saving..." if is_saving else "💾 Save Output"
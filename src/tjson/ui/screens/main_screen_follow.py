@@ -0,0 +1,140 @@
+import time
+from typing import TYPE_CHECKING
+
+from textual import work
+from textual.widgets import Switch
+
+from tjson.config import FOLLOW_MAX_RECORDS
+from tjson.core.metrics import RunMetrics
+from tjson.services.file_follower import FileFollower, FollowError, FollowUpdate, RecordRing
+from tjson.ui.widgets.output_viewer import OutputViewer
+
+if TYPE_CHECKING:
+    from tjson.core.ndjson import ChunkResult
+
+
+class FollowMixin:
+    """
+    Follow mode for `MainScreen`: tails a growing JSON Lines file and keeps
+    its latest records in the output. Any new run on the input ends it.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # The file being tailed and its latest records
+        self.follower: FileFollower | None = None
+        self.follow_ring = RecordRing(FOLLOW_MAX_RECORDS)
+        self.follow_errors = 0
+
+    def action_toggle_follow(self) -> None:
+        """Tails the loaded file (or one picked now) as it grows, or stops doing so."""
+        if self.follower:
+            self.stop_follow()
+            return
+        if self.loaded_path:
+            self.start_follow(self.loaded_path)
+            return
+        from tjson.ui.screens.file_picker import FilePickerScreen
+
+        self.app.push_screen(FilePickerScreen(), callback=self.start_follow)
+
+    def start_follow(self, file_path: str | None) -> None:
+        if not file_path:
+            return
+        # Whatever was processing is now stale, and new runs end the follow
+        if self.debounce_timer:
+            self.debounce_timer.stop()
+        self.generation += 1
+        self.output_settings = None
+        self.follower = FileFollower(file_path)
+        self.follow_ring.clear()
+        self.follow_errors = 0
+
+        ndjson_switch = self.query_one("#ndjson-switch", Switch)
+        with ndjson_switch.prevent(Switch.Changed):
+            ndjson_switch.value = True
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if output_pane.tree_visible:
+            output_pane.show_text()
+        output_pane.set_bytes(b"")
+        output_pane.set_title(f"OUTPUT (Following {self.follower.name} ⏳)")
+        self.refresh_bindings()
+        minify = self.query_one("#minify-switch", Switch).value
+        self.follow_background(self.follower, minify, self.generation)
+
+    def stop_follow(self) -> None:
+        if self.follower is None:
+            return
+        self.follower.cancel()
+        self.notify(f"Stopped following {self.follower.name}")
+        self.follower = None
+        self.refresh_bindings()
+
+    @work(thread=True, exclusive=True, group="follow")
+    def follow_background(self, follower: FileFollower, minify: bool, generation: int) -> None:
+        from tjson.core.ndjson import NDJSONProcessor, process_chunk
+
+        def on_update(update: FollowUpdate) -> None:
+            metrics = RunMetrics("follow", input_bytes=len(update.lines))
+            start = time.perf_counter()
+            # Small batches, so the ring can drop old records in small steps
+            chunks = [
+                process_chunk(update.lines[begin:end], minify)
+                for begin, end in NDJSONProcessor.iter_chunks(update.lines, RecordRing.BATCH_BYTES)
+            ]
+            metrics.add_phase("parse", time.perf_counter() - start)
+            metrics.output_bytes = sum(len(chunk.output) for chunk in chunks)
+            self.app.call_from_thread(
+                self.append_follow, follower, update, chunks, generation, metrics
+            )
+
+        try:
+            follower.follow(on_update)
+        except (FollowError, OSError) as e:
+            self.app.call_from_thread(self.finish_follow, follower, str(e))
+
+    def append_follow(
+        self,
+        follower: FileFollower,
+        update: FollowUpdate,
+        chunks: list["ChunkResult"],
+        generation: int,
+        metrics: RunMetrics,
+    ) -> None:
+        """Runs on the UI thread with the records of newly appended lines."""
+        if follower is not self.follower:
+            return
+        if generation != self.generation:
+            # The input was processed since, replacing the followed records
+            self.stop_follow()
+            return
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        view = output_pane.line_view
+        # Stay at the bottom when already there, like `tail -f`
+        at_bottom = view.cursor_line >= view.line_count - 1
+        if update.reset:
+            self.follow_ring.clear()
+            self.follow_errors = 0
+            self.notify(f"{follower.name} was {update.reset}, following it from the start")
+        dropped = False
+        for chunk in chunks:
+            dropped |= self.follow_ring.append(chunk.records, chunk.output)
+            self.follow_errors += len(chunk.errors)
+        if dropped or update.reset:
+            output_pane.set_bytes(self.follow_ring.to_bytes())
+        else:
+            output_pane.append_bytes(b"".join(chunk.output for chunk in chunks))
+        if at_bottom:
+            view.action_cursor_bottom()
+        output_pane.set_title(
+            f"OUTPUT (Following {follower.name} · last {self.follow_ring.records:,} records"
+            f" · {self.follow_errors:,} invalid lines · Ctrl+L: stop)"
+        )
+        self.record_metrics(metrics)
+
+    def finish_follow(self, follower: FileFollower, error: str) -> None:
+        if follower is not self.follower:
+            return
+        self.follower = None
+        self.refresh_bindings()
+        self.notify(error, title="Follow stopped", severity="error")
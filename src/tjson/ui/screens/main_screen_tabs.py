@@ -0,0 +1,186 @@
+import time
+
+from textual.widgets import Input, Switch, Tab, Tabs
+
+from tjson.core.documents import Document, DocumentState, DocumentTabs
+from tjson.core.metrics import RunMetrics
+from tjson.core.processor import JSONProcessor
+from tjson.core.validation import IncrementalValidator
+from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.output_viewer import OutputViewer
+
+
+class DocumentTabsMixin:
+    """
+    Tabs for `MainScreen`: one document per tab. Switching parks the current
+    document (input, settings and, within the `DocumentTabs` budget, its
+    output) and shows the other one, from its kept state or rebuilt.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Open documents (tabs) and the parsed/rendered state kept for them
+        self.tabs = DocumentTabs()
+        self.document: Document | None = self.tabs.open()
+
+    def action_new_tab(self) -> None:
+        self.open_tab()
+
+    def open_tab(self) -> None:
+        """Opens an empty document next to the current one and shows it."""
+        if not self.can_switch_tab():
+            return
+        document = self.tabs.open(after=self.document)
+        self.query_one("#document-tabs", Tabs).add_tab(
+            Tab(document.name, id=document.id), after=self.document.id
+        )
+        self.switch_document(document)
+
+    def action_close_tab(self) -> None:
+        if not self.can_switch_tab():
+            return
+        closing = self.document
+        neighbour = self.tabs.close(closing)
+        tabs = self.query_one("#document-tabs", Tabs)
+        if neighbour is None:
+            # Closing the last tab leaves an empty one
+            neighbour = self.tabs.open()
+            tabs.add_tab(Tab(neighbour.name, id=neighbour.id))
+        self.document = None  # Closed: nothing to keep
+        self.switch_document(neighbour)
+        tabs.remove_tab(closing.id)
+
+    def action_next_tab(self) -> None:
+        self.query_one("#document-tabs", Tabs).action_next_tab()
+
+    def action_previous_tab(self) -> None:
+        self.query_one("#document-tabs", Tabs).action_previous_tab()
+
+    def activate_tab(self, tabs: Tabs, tab_id: str) -> None:
+        """Shows the document of a tab the user picked."""
+        document = self.tabs.get(tab_id)
+        if document is None or document is self.document:
+            return
+        if not self.can_switch_tab():
+            # Put the highlight back on the tab still being worked on
+            with tabs.prevent(Tabs.TabActivated):
+                tabs.active = self.document.id
+            return
+        self.switch_document(document)
+
+    def can_switch_tab(self) -> bool:
+        if self.file_loader:
+            self.notify("Wait for the load to finish (Esc cancels it)", severity="warning")
+            return False
+        return True
+
+    def rename_tab(self, document: Document, name: str) -> None:
+        document.name = name
+        self.query_one(f"#document-tabs #{document.id}", Tab).label = name
+
+    def switch_document(self, document: Document) -> None:
+        """Keeps the current document (and its output) aside and shows another one."""
+        if document is self.document:
+            return
+        if self.document is not None:
+            self.park_document(self.document)
+        self.document = document
+        tabs = self.query_one("#document-tabs", Tabs)
+        if tabs.active != document.id and tabs.query(f"#{document.id}"):
+            with tabs.prevent(Tabs.TabActivated):
+                tabs.active = document.id
+        else:
+            # Not mounted yet (a new tab): activate it once it is
+            self.call_after_refresh(self.highlight_tab, document)
+        self.show_document(document)
+
+    def highlight_tab(self, document: Document) -> None:
+        tabs = self.query_one("#document-tabs", Tabs)
+        if document is self.document and tabs.active != document.id:
+            with tabs.prevent(Tabs.TabActivated):
+                tabs.active = document.id
+
+    def park_document(self, document: Document) -> None:
+        """Saves the input and settings of the document being left, and its output if complete."""
+        if self.debounce_timer:
+            self.debounce_timer.stop()
+        self.stop_follow()
+        self.clear_search()
+        if self.loaded_bytes is not None:
+            document.data, document.text = self.loaded_bytes, ""
+        else:
+            document.data = None
+            document.text = self.query_one("#input-pane", EditorPane).get_text()
+        document.minify, document.ndjson, document.query = self.current_settings()
+        document.file_path = self.loaded_path
+        if self.output_settings is None:
+            # Nothing complete on screen (or an edited input): rebuilt when shown again
+            self.tabs.forget(document)
+            return
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        tree = JSONProcessor.cached_tree(self.output_key) if self.output_key else None
+        self.tabs.store(
+            document,
+            DocumentState(
+                self.output_settings,
+                output_pane.buffer,
+                output_pane.line_view.index,
+                tree,
+                self.output_key if tree is not None else None,
+                len(document.raw),
+            ),
+        )
+
+    def show_document(self, document: Document) -> None:
+        """Shows a document's input, and its kept output or (in a worker) a rebuilt one."""
+        # Anything still running belongs to the previous document
+        self.generation += 1
+        self.set_awaiting_manual(False)
+        self.validator = IncrementalValidator()
+        self.active_query = document.query
+        self.loaded_path = document.file_path
+        self.query_one("#query-input", Input).value = document.query
+        for switch_id, value in (
+            ("#minify-switch", document.minify),
+            ("#ndjson-switch", document.ndjson),
+        ):
+            switch = self.query_one(switch_id, Switch)
+            with switch.prevent(Switch.Changed):
+                switch.value = value
+
+        if document.data is not None:
+            self.show_loaded_bytes(document.data, document.name, None)
+        else:
+            self.release_loaded_file()
+            self.query_one("#input-pane", EditorPane).set_text(document.text, notify=False)
+
+        output_pane = self.query_one("#output-pane", OutputViewer)
+        if output_pane.tree_visible:
+            output_pane.show_text()
+        self.query_one("#input-pane", EditorPane).remove_class("error")
+        self.show_input_error(None)
+        state = self.tabs.state_of(document)
+        if state is None:
+            # Never processed, or evicted from the budget: rebuild from the input
+            self.output_settings = None
+            if JSONProcessor.is_blank(document.raw):
+                output_pane.set_bytes(b"")
+                output_pane.set_title("OUTPUT (Waiting...)")
+            else:
+                self.process_now(document.raw)
+            return
+
+        metrics = RunMetrics("tab", input_bytes=state.input_bytes, output_bytes=len(state.output))
+        start = time.perf_counter()
+        output_pane.set_bytes(state.output, state.index)
+        if state.tree is not None:
+            # Queries and mode toggles on this tab skip the parse again
+            JSONProcessor.remember_tree(state.tree_key, state.tree, state.input_bytes)
+        metrics.add_phase("viewer", time.perf_counter() - start)
+        self.output_settings, self.output_key = state.settings, state.tree_key
+        self.set_processing_state(False)
+        if state.settings[1]:
+            output_pane.set_title(f"OUTPUT (NDJSON · {document.name})")
+        elif state.settings[2]:
+            output_pane.set_title(f"OUTPUT (Query · {state.settings[2]})")
+        self.record_metrics(metrics)
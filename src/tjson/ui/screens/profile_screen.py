@@ -0,0 +1,151 @@
+import time
+
+import orjson
+
+from rich.text import Text
+from textual import on, work
+from textual.app import ComposeResult
+from textual.containers import Vertical
+from textual.screen import Screen
+from textual.widgets import DataTable, Footer, Header, Static
+
+from tjson.core.metrics import MetricsLog, RunMetrics
+from tjson.core.processor import JSONProcessor
+from tjson.core.profile import DocumentProfile, PathStats
+from tjson.utils import format_size
+
+# Table columns: label and the DocumentProfile sort order of each
+COLUMNS = (
+    ("Path", "path"),
+    ("Size", "bytes"),
+    ("%", "bytes"),
+    ("Count", "count"),
+    ("Items", "items"),
+    ("Depth", "depth"),
+    ("Types", None),
+)
+
+
+class ProfileScreen(Screen[str]):
+    """
+    Profile mode: where the bytes of the current input are, path by path.
+
+    The document is parsed with `JSONProcessor` (sharing its cache with the
+    main screen) and profiled with `DocumentProfile` in a worker. Clicking a
+    column header sorts by it, re-sorting every path rather than only the
+    rows shown; Enter on a row closes the screen and runs that path in the
+    query bar.
+    """
+
+    BINDINGS = [
+        ("escape", "app.pop_screen", "Back"),
+        ("s", "sort('bytes')", "By Size"),
+        ("c", "sort('count')", "By Count"),
+        ("p", "sort('path')", "By Path"),
+    ]
+
+    # Rows shown (the largest, or first, in the current order)
+    MAX_ROWS = 2000
+
+    def __init__(self, raw: str | bytearray, metrics: MetricsLog | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.raw = raw
+        self.profile: DocumentProfile | None = None
+        self.sort = "bytes"
+        # Shared with the main screen, so profile runs show up in its HUD and trace
+        self.metrics = metrics or MetricsLog()
+
+    def compose(self) -> ComposeResult:
+        yield Header(show_clock=True)
+        with Vertical(id="profile-container"):
+            yield Static("PROFILE (Profiling… ⏳)", id="profile-summary")
+            yield DataTable(id="profile-table", cursor_type="row", zebra_stripes=True)
+        yield Footer()
+
+    def on_mount(self) -> None:
+        table = self.query_one("#profile-table", DataTable)
+        for label, _ in COLUMNS:
+            table.add_column(label, key=label)
+        table.focus()
+        self.build_profile(self.raw)
+        self.raw = ""  # The worker has it; don't pin a large input here
+
+    @work(thread=True, exclusive=True, group="profile")
+    def build_profile(self, raw: str | bytearray) -> None:
+        metrics = RunMetrics("profile", input_bytes=len(raw))
+        if JSONProcessor.is_blank(raw):
+            self.app.call_from_thread(self.show_error, "Nothing to profile")
+            return
+        start = time.perf_counter()
+        try:
+            tree = JSONProcessor.parse(raw)
+        except orjson.JSONDecodeError as e:
+            self.app.call_from_thread(self.show_error, f"Invalid JSON: {e}")
+            return
+        metrics.add_phase("parse", time.perf_counter() - start)
+
+        start = time.perf_counter()
+        profile = DocumentProfile(tree)
+        metrics.add_phase("profile", time.perf_counter() - start)
+        metrics.output_bytes = profile.total_bytes
+        self.metrics.record(metrics)
+        self.app.call_from_thread(self.show_profile, profile, metrics)
+
+    def show_error(self, message: str) -> None:
+        self.query_one("#profile-summary", Static).update(f"PROFILE ({message})")
+
+    def show_profile(self, profile: DocumentProfile, metrics: RunMetrics) -> None:
+        self.profile = profile
+        summary = Text()
+        summary.append(
+            f"PROFILE ({format_size(profile.total_bytes)} minified · {len(profile.paths):,} paths"
+            f" · depth {profile.max_depth} · {metrics.total_seconds:.2f}s)\n",
+            style="bold #bd93f9",
+        )
+        summary.append("Types  ", style="#6272a4")
+        summary.append(" · ".join(f"{name} {count:,}" for name, count in profile.types.most_common()))
+        summary.append("\nKeys   ", style="#6272a4")
+        summary.append(
+            " · ".join(f"{key} {count:,}" for key, count in profile.keys.most_common(12))
+            or "none"
+        )
+        self.query_one("#profile-summary", Static).update(summary)
+        self.fill_table()
+
+    def fill_table(self) -> None:
+        if self.profile is None:
+            return
+        table = self.query_one("#profile-table", DataTable)
+        table.clear()
+        total = self.profile.total_bytes or 1
+        for stats in self.profile.sorted_paths(self.sort, self.MAX_ROWS):
+            table.add_row(*self.row(stats, total), key=stats.path)
+        if len(self.profile.paths) > self.MAX_ROWS:
+            self.notify(f"Showing the first {self.MAX_ROWS:,} of {len(self.profile.paths):,} paths")
+
+    @staticmethod
+    def row(stats: PathStats, total: int) -> tuple:
+        return (
+            stats.path,
+            Text(format_size(stats.bytes), justify="right"),
+            Text(f"{stats.bytes * 100 / total:.1f}", justify="right"),
+            Text(f"{stats.count:,}", justify="right"),
+            Text(f"{stats.items:,}", justify="right") if stats.items else "",
+            Text(str(stats.depth), justify="right"),
+            " ".join(f"{name}×{count:,}" for name, count in stats.types.most_common()),
+        )
+
+    def action_sort(self, sort: str) -> None:
+        if sort != self.sort:
+            self.sort = sort
+            self.fill_table()
+
+    @on(DataTable.HeaderSelected, "#profile-table")
+    def on_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        sort = dict(COLUMNS)[event.column_key.value]
+        if sort:
+            self.action_sort(sort)
+
+    @on(DataTable.RowSelected, "#profile-table")
+    def on_row_selected(self, event: DataTable.RowSelected) -> None:
+        self.dismiss(event.row_key.value)
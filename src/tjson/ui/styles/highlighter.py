@@ -0,0 +1,54 @@
+import re
+
+from rich.style import Style
+from rich.text import Text
+
+from tjson.ui.styles.syntax_theme import CYBERPUNK_THEME
+
+# One regex pass per line. Group names map onto the theme's syntax style names.
+_TOKEN_PATTERN = re.compile(
+    r'(?P<key>"(?:[^"\\]|\\.)*"(?=\s*:))'
+    r'|(?P<string>"(?:[^"\\]|\\.)*"?)'
+    r"|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<boolean>\btrue\b|\bfalse\b)"
+    r"|(?P<null>\bnull\b)"
+    r"|(?P<punctuation>[{}\[\]])"
+    r"|(?P<delimiter>[,:])"
+)
+
+_GROUP_TO_STYLE_NAME = {
+    "key": "string.label",
+    "string": "string",
+    "number": "number",
+    "boolean": "boolean",
+    "null": "null",
+    "punctuation": "punctuation",
+    "delimiter": "punctuation.delimiter",
+}
+
+
+class JSONLineHighlighter:
+    """
+    Cheap tokenizer-based JSON highlighter that works one line at a time.
+
+    Unlike tree-sitter it needs no parse of the whole document, so it can
+    style just the lines that are on screen. Colors come from
+    `CYBERPUNK_THEME.syntax_styles`.
+    """
+
+    def __init__(self, syntax_styles: dict[str, Style] | None = None) -> None:
+        styles = syntax_styles or CYBERPUNK_THEME.syntax_styles
+        self._styles = {
+            group: styles[name]
+            for group, name in _GROUP_TO_STYLE_NAME.items()
+            if name in styles
+        }
+
+    def highlight(self, line: str) -> Text:
+        text = Text(line, no_wrap=True, end="")
+        styles = self._styles
+        for match in _TOKEN_PATTERN.finditer(line):
+            style = styles.get(match.lastgroup)
+            if style is not None:
+                text.stylize(style, match.start(), match.end())
+        return text
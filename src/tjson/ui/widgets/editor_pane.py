@@ -5,9 +5,16 @@ from textual.widget import Widget
 from textual.message import Message
 from textual import on
 
+from tjson.ui.widgets.highlighting_text_area import HighlightingTextArea
+
 
 class EditorPane(Widget):
-    """A composite widget containing a label and a text editor."""
+    """
+    A composite widget containing a label and a text editor.
+
+    The label also shows the editor's current highlighting tier, which
+    drops to cheaper modes as the document grows.
+    """
 
     class Changed(Message):
         control: Widget | None = None
@@ -24,13 +31,17 @@ class EditorPane(Widget):
         self.title = title
         self.read_only = read_only
         self.theme = theme
+        # Title currently shown in the label (set_title), without the tier
+        self._label_title = title
+        # Number of programmatic loads whose Changed event should not bubble up
+        self._silent_loads = 0
 
     def compose(self) -> ComposeResult:
         with Vertical():
             yield Static(self.title, classes="pane-label")
 
             # --- ENABLE SYNTAX HIGHLIGHTING HERE ---
-            ta = TextArea.code_editor(
+            ta = HighlightingTextArea.code_editor(
                 language="json",  # Tells it to look for JSON syntax
                 theme=getattr(
                     self, "theme", "dracula"
@@ -42,6 +53,9 @@ class EditorPane(Widget):
 
             yield ta
 
+    def on_mount(self) -> None:
+        self.set_title(self._label_title)
+
     @property
     def text_area(self) -> TextArea:
         return self.query_one(TextArea)
@@ -49,10 +63,36 @@ class EditorPane(Widget):
     def get_text(self) -> str:
         return self.text_area.text
 
-    def set_text(self, text: str) -> None:
+    def set_text(self, text: str, notify: bool = True) -> None:
+        """Replaces the editor content. With notify=False no Changed message is sent."""
+        if not notify:
+            self._silent_loads += 1
         self.text_area.text = text
 
+    def set_title(self, title: str) -> None:
+        self._label_title = title
+        self.query_one(".pane-label", Static).update(self._label_text())
+
+    def _label_text(self) -> str:
+        text_areas = self.query(HighlightingTextArea)
+        if not text_areas:
+            return self._label_title
+        return f"{self._label_title} · Highlight: {text_areas.first().highlight_tier}"
+
+    @on(HighlightingTextArea.TierChanged)
+    def _on_tier_changed(self, event: HighlightingTextArea.TierChanged) -> None:
+        event.stop()
+        if self.is_mounted:
+            self.set_title(self._label_title)
+
     @on(TextArea.Changed)
     def _on_internal_change(self, event: TextArea.Changed) -> None:
         event.stop()
-        self.post_message(self.Changed(self, self.text_area.text))
+        text = self.text_area.text
+        if not self.read_only:
+            # Typing or pasting may have pushed the document across a tier limit
+            self.text_area.update_tier(len(text))
+        if self._silent_loads:
+            self._silent_loads -= 1
+            return
+        self.post_message(self.Changed(self, text))
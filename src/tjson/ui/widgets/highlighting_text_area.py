@@ -0,0 +1,181 @@
+import time
+
+from rich.style import Style
+from rich.text import Text
+from textual.message import Message
+from textual.widgets import TextArea
+
+from tjson.config import (
+    HIGHLIGHT_FULL_LIMIT,
+    HIGHLIGHT_MARGIN_LINES,
+    HIGHLIGHT_TOKENIZER_LIMIT,
+    HIGHLIGHT_VIEWPORT_LIMIT,
+)
+from tjson.ui.styles.highlighter import JSONLineHighlighter
+
+# Highlighting tiers, from the most to the least expensive
+TIER_FULL = "full"
+TIER_VIEWPORT = "viewport"
+TIER_TOKENIZER = "tokenizer"
+TIER_NONE = "none"
+
+
+def tier_for_size(size: int) -> str:
+    if size <= HIGHLIGHT_FULL_LIMIT:
+        return TIER_FULL
+    if size <= HIGHLIGHT_VIEWPORT_LIMIT:
+        return TIER_VIEWPORT
+    if size <= HIGHLIGHT_TOKENIZER_LIMIT:
+        return TIER_TOKENIZER
+    return TIER_NONE
+
+
+class HighlightingTextArea(TextArea):
+    """
+    TextArea whose syntax highlighting cost is bounded by the document size.
+
+    The stock TextArea queries tree-sitter for the whole document after every
+    load and edit. Here only small documents do that ("full"). Larger ones
+    only query the rows around the viewport and re-query as the view scrolls
+    out of that window ("viewport"); past that no syntax tree is built at all
+    and visible lines are colored by the regex tokenizer ("tokenizer"), or
+    not at all ("none"). Bracket matching is also limited to the "full" tier.
+    Thresholds live in `tjson.config`.
+    """
+
+    class TierChanged(Message):
+        def __init__(self, text_area: "HighlightingTextArea", tier: str) -> None:
+            self.text_area = text_area
+            self.tier = tier
+            super().__init__()
+
+        @property
+        def control(self) -> "HighlightingTextArea":
+            return self.text_area
+
+    # Class level defaults: TextArea.__init__ builds the first document
+    # before this class' __init__ body runs
+    highlight_tier = TIER_FULL
+    # Rows (first, last) covered by the current viewport-tier highlights
+    _highlighted_rows = (0, -1)
+    _tokenizer: JSONLineHighlighter | None = None
+    # Duration of the latest highlight map build (performance HUD)
+    last_highlight_seconds = 0.0
+    # (row, column) of the character where the document stops being valid JSON
+    error_location: tuple[int, int] | None = None
+
+    ERROR_STYLE = Style(color="#f8f8f2", bgcolor="#ff5555")
+
+    # --- TIER SELECTION ---
+
+    def _set_document(self, text: str, language: str | None) -> None:
+        tier = tier_for_size(len(text))
+        if tier in (TIER_TOKENIZER, TIER_NONE):
+            language = None  # Plain document: no tree-sitter parse
+        self._set_tier(tier)
+        super()._set_document(text, language)
+
+    def _set_tier(self, tier: str) -> None:
+        if tier == self.highlight_tier:
+            return
+        self.highlight_tier = tier
+        # Matching the bracket under the cursor walks the document character
+        # by character (seconds for a top-level bracket in a few MB)
+        self.match_cursor_bracket = tier == TIER_FULL
+        self.post_message(self.TierChanged(self, tier))
+
+    def update_tier(self, size: int) -> None:
+        """Re-checks the tier after edits changed the document size to `size`."""
+        tier = tier_for_size(size)
+        if tier == self.highlight_tier:
+            return
+        uses_tree = (TIER_FULL, TIER_VIEWPORT)
+        if tier in uses_tree and self.highlight_tier in uses_tree:
+            # Same tree-sitter document, only the query range changes
+            self._set_tier(tier)
+            self._build_highlight_map()
+            self.refresh()
+            return
+        # Switching between a syntax-aware and a plain document
+        selection = self.selection
+        scroll = self.scroll_offset
+        self._set_document(self.text, self.language)
+        self.selection = selection
+        self.scroll_to(scroll.x, scroll.y, animate=False)
+
+    # --- HIGHLIGHTING ---
+
+    def _build_highlight_map(self) -> None:
+        start = time.perf_counter()
+        if self.highlight_tier == TIER_FULL:
+            super()._build_highlight_map()
+        else:
+            self._line_cache.clear()
+            self._highlights.clear()
+            self._highlighted_rows = (0, -1)
+            if self.highlight_tier == TIER_VIEWPORT:
+                self._highlight_viewport()
+        self.last_highlight_seconds = time.perf_counter() - start
+
+    def _highlight_viewport(self) -> None:
+        """Queries tree-sitter for the visible rows plus a margin on each side."""
+        if not self._highlight_query:
+            return
+        top, bottom = self._visible_line_indices
+        first = max(top - HIGHLIGHT_MARGIN_LINES, 0)
+        last = min(bottom + HIGHLIGHT_MARGIN_LINES, self.document.line_count - 1)
+
+        highlights = self._highlights
+        highlights.clear()
+        self._line_cache.clear()
+        captures = self.document.query_syntax_tree(
+            self._highlight_query, start_point=(first, 0), end_point=(last + 1, 0)
+        )
+        # Same mapping as TextArea._build_highlight_map, on a window of rows
+        for highlight_name, nodes in captures.items():
+            for node in nodes:
+                start_row, start_column = node.start_point
+                end_row, end_column = node.end_point
+                if start_row == end_row:
+                    highlights[start_row].append((start_column, end_column, highlight_name))
+                else:
+                    highlights[start_row].append((start_column, None, highlight_name))
+                    for row in range(start_row + 1, end_row):
+                        highlights[row].append((0, None, highlight_name))
+                    highlights[end_row].append((0, end_column, highlight_name))
+        self._highlighted_rows = (first, last)
+
+    def _watch_scroll_y(self) -> None:
+        super()._watch_scroll_y()
+        if self.highlight_tier != TIER_VIEWPORT:
+            return
+        top, bottom = self._visible_line_indices
+        first, last = self._highlighted_rows
+        if top < first or min(bottom, self.document.line_count - 1) > last:
+            # Scrolled out of the highlighted window
+            self._highlight_viewport()
+            self.refresh()
+
+    def get_line(self, line_index: int) -> Text:
+        if self.highlight_tier != TIER_TOKENIZER:
+            line = super().get_line(line_index)
+        else:
+            # Only called for rendered rows, so this is viewport-limited by nature
+            if self._tokenizer is None:
+                self._tokenizer = JSONLineHighlighter()
+            line = self._tokenizer.highlight(self.document.get_line(line_index))
+        if self.error_location and self.error_location[0] == line_index:
+            # Errors at the end of a line (or of the data) mark its last character
+            column = max(min(self.error_location[1], len(line) - 1), 0)
+            line.stylize(self.ERROR_STYLE, column, column + 1)
+        return line
+
+    # --- ERRORS ---
+
+    def mark_error(self, location: tuple[int, int] | None) -> None:
+        """Marks the character at (row, column) as the parse error, or clears the mark."""
+        if location == self.error_location:
+            return
+        self.error_location = location
+        self._line_cache.clear()
+        self.refresh()
@@ -0,0 +1,362 @@
+from rich.segment import Segment
+from rich.style import Style
+from rich.text import Text
+from textual import on
+from textual.app import ComposeResult
+from textual.binding import Binding
+from textual.cache import LRUCache
+from textual.containers import Vertical
+from textual.events import Click
+from textual.geometry import Region, Size
+from textual.reactive import reactive
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.widgets import Static
+
+from tjson.core.line_index import LineIndex
+from tjson.core.structure_index import StructureIndex
+from tjson.ui.styles.highlighter import JSONLineHighlighter
+from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.structure_tree import StructureTree
+
+
+class LineView(ScrollView, can_focus=True):
+    """
+    Line API view over a `LineIndex`.
+
+    Only the rows inside the viewport are ever decoded and highlighted;
+    recently rendered rows are kept in a small LRU cache for scrolling.
+    """
+
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "cursor_page_up", "Page Up", show=False),
+        Binding("pagedown", "cursor_page_down", "Page Down", show=False),
+        Binding("ctrl+home", "cursor_top", "Top", show=False),
+        Binding("ctrl+end", "cursor_bottom", "Bottom", show=False),
+        Binding("shift+up", "select_up", "Select Up", show=False),
+        Binding("shift+down", "select_down", "Select Down", show=False),
+        Binding("shift+pageup", "select_page_up", "Select Page Up", show=False),
+        Binding("shift+pagedown", "select_page_down", "Select Page Down", show=False),
+    ]
+
+    # Lines longer than this (e.g. minified output) are only decoded and
+    # highlighted around the horizontal scroll position
+    LONG_LINE = 4096
+
+    GUTTER_STYLE = Style(color="#6272a4")
+    CURSOR_STYLE = Style(bgcolor="#44475a")
+    SELECTION_STYLE = Style(bgcolor="#33467c")
+    MATCH_STYLE = Style(color="#282a36", bgcolor="#f1fa8c")
+
+    cursor_line: reactive[int] = reactive(0)
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.index: LineIndex | None = None
+        # Line where a shift-selection started (None when nothing is selected)
+        self.selection_anchor: int | None = None
+        # Byte range of the current search match, highlighted when visible
+        self.match: tuple[int, int] | None = None
+        self._highlighter = JSONLineHighlighter()
+        self._line_cache: LRUCache[tuple[int, int], Strip] = LRUCache(1024)
+
+    # --- CONTENT ---
+
+    def load(self, index: LineIndex | None) -> None:
+        self.index = index
+        self._line_cache.clear()
+        self.selection_anchor = None
+        self.match = None
+        self.cursor_line = 0
+        if index is None:
+            self.virtual_size = Size(0, 0)
+        else:
+            self.virtual_size = Size(index.max_width + self.gutter_width, index.line_count)
+        self.scroll_to(0, 0, animate=False)
+        self.refresh()
+
+    def content_extended(self) -> None:
+        """Call after the index grew (streamed output); keeps cursor and scroll."""
+        self.virtual_size = Size(
+            self.index.max_width + self.gutter_width, self.index.line_count
+        )
+        self._line_cache.clear()  # The previously last line may have grown
+        self.refresh()
+
+    @property
+    def line_count(self) -> int:
+        return self.index.line_count if self.index else 0
+
+    @property
+    def gutter_width(self) -> int:
+        return len(str(self.line_count)) + 2
+
+    @property
+    def selected_lines(self) -> tuple[int, int] | None:
+        """(first, last) selected lines, inclusive and 0-based."""
+        if self.selection_anchor is None or not self.index:
+            return None
+        return (
+            min(self.selection_anchor, self.cursor_line),
+            max(self.selection_anchor, self.cursor_line),
+        )
+
+    # --- RENDERING ---
+
+    def _render_content(self, line_no: int, scroll_x: int, width: int) -> Strip:
+        """The visible part of a line, starting at scroll_x."""
+        if self.index.line_length(line_no) <= self.LONG_LINE:
+            window_start = 0
+        else:
+            window_start = scroll_x
+
+        key = (line_no, window_start)
+        strip = self._line_cache.get(key)
+        if strip is None:
+            if window_start:
+                # Highlighting is per token, so a window cut mid-token may be
+                # colored slightly off at its edges; that's the price of O(width)
+                line = self.index.line_slice(line_no, window_start, window_start + width)
+            else:
+                line = self.index.line(line_no)
+            text = self._highlighter.highlight(line)
+            if self.match:
+                self._stylize_match(text, line_no, window_start)
+            strip = Strip(text.render(self.app.console))
+            self._line_cache[key] = strip
+        offset = scroll_x - window_start
+        return strip.crop_extend(offset, offset + width, self.rich_style)
+
+    def _column(self, line_no: int, offset: int) -> int:
+        """Column of a buffer offset in its line (in bytes for long lines, like their windows)."""
+        line_start = self.index.starts[line_no]
+        if self.index.line_length(line_no) > self.LONG_LINE:
+            return offset - line_start
+        return len(bytes(self.index.data[line_start:offset]).decode("utf-8", errors="replace"))
+
+    def _stylize_match(self, text: Text, line_no: int, window_start: int) -> None:
+        start, end = self.match
+        line_start = self.index.starts[line_no]
+        line_end = line_start + self.index.line_length(line_no)
+        if end <= line_start or start > line_end:
+            return
+        first = self._column(line_no, max(start, line_start)) - window_start
+        last = self._column(line_no, min(end, line_end)) - window_start
+        text.stylize(self.MATCH_STYLE, max(first, 0), max(last, 0))
+
+    def show_match(self, start: int, end: int) -> None:
+        """Moves to a search match (a byte range of the buffer) and highlights it."""
+        line_no = self.index.line_at_offset(start)
+        self.match = (start, end)
+        self._line_cache.clear()
+        self.goto_line(line_no)
+        # Scroll sideways when the match is out of view
+        column = self._column(line_no, start)
+        width = max(self.size.width - self.gutter_width, 1)
+        scroll_x = self.scroll_offset.x
+        if column < scroll_x or column + (end - start) > scroll_x + width:
+            self.scroll_to(x=max(column - width // 3, 0), animate=False)
+
+    def clear_match(self) -> None:
+        if self.match:
+            self.match = None
+            self._line_cache.clear()
+            self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        line_no = scroll_y + y
+        width = self.size.width
+        base_style = self.rich_style
+        if self.index is None or line_no >= self.index.line_count:
+            return Strip.blank(width, base_style)
+
+        gutter_width = self.gutter_width
+        gutter = Strip(
+            [Segment(f"{line_no + 1:>{gutter_width - 1}} ", base_style + self.GUTTER_STYLE)]
+        )
+        content_width = max(width - gutter_width, 0)
+        content = self._render_content(line_no, scroll_x, content_width)
+
+        selected = self.selected_lines
+        if selected and selected[0] <= line_no <= selected[1]:
+            content = content.apply_style(self.SELECTION_STYLE)
+        elif line_no == self.cursor_line and self.has_focus:
+            content = content.apply_style(self.CURSOR_STYLE)
+        return Strip.join([gutter, content.apply_style(base_style)])
+
+    # --- CURSOR & SELECTION ---
+
+    def move_cursor(self, line_no: int, select: bool = False) -> None:
+        if not self.index:
+            return
+        if select and self.selection_anchor is None:
+            self.selection_anchor = self.cursor_line
+        elif not select:
+            self.selection_anchor = None
+        self.cursor_line = max(0, min(line_no, self.index.line_count - 1))
+        self.scroll_to_region(
+            Region(0, self.cursor_line, 1, 1), animate=False, immediate=True
+        )
+        self.refresh()
+
+    def goto_line(self, line_no: int) -> None:
+        """Moves to a 0-based line and centers it in the viewport."""
+        self.move_cursor(line_no)
+        self.scroll_to(y=max(self.cursor_line - self.size.height // 2, 0), animate=False)
+
+    def _watch_has_focus(self, focus: bool) -> None:
+        self.refresh()
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(self.cursor_line - 1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(self.cursor_line + 1)
+
+    def action_cursor_page_up(self) -> None:
+        self.move_cursor(self.cursor_line - self.size.height)
+
+    def action_cursor_page_down(self) -> None:
+        self.move_cursor(self.cursor_line + self.size.height)
+
+    def action_cursor_top(self) -> None:
+        self.move_cursor(0)
+
+    def action_cursor_bottom(self) -> None:
+        self.move_cursor(self.line_count - 1)
+
+    def action_select_up(self) -> None:
+        self.move_cursor(self.cursor_line - 1, select=True)
+
+    def action_select_down(self) -> None:
+        self.move_cursor(self.cursor_line + 1, select=True)
+
+    def action_select_page_up(self) -> None:
+        self.move_cursor(self.cursor_line - self.size.height, select=True)
+
+    def action_select_page_down(self) -> None:
+        self.move_cursor(self.cursor_line + self.size.height, select=True)
+
+    def on_click(self, event: Click) -> None:
+        self.move_cursor(self.scroll_offset.y + event.y, select=event.shift)
+
+
+class OutputViewer(EditorPane):
+    """
+    Read-only, virtualized drop-in for the output EditorPane.
+
+    The formatted output stays a single bytes buffer with a newline-offset
+    index; nothing is split into lines or highlighted until it scrolls into
+    view, so multi-hundred-MB results load in the time it takes to index them.
+    The same buffer can be browsed as a collapsible tree (`show_tree`).
+    """
+
+    def __init__(self, title: str, id: str) -> None:
+        super().__init__(title=title, id=id, read_only=True)
+        # Structure of the current output, built on demand for the tree view
+        self.structure: StructureIndex | None = None
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Static(self.title, classes="pane-label")
+            yield LineView()
+            tree = StructureTree()
+            tree.display = False
+            yield tree
+
+    @property
+    def line_view(self) -> LineView:
+        return self.query_one(LineView)
+
+    @property
+    def structure_tree(self) -> StructureTree:
+        return self.query_one(StructureTree)
+
+    @property
+    def tree_visible(self) -> bool:
+        return self.structure_tree.display
+
+    def show_tree(self, structure: StructureIndex) -> None:
+        """Swaps the text view for a tree over `structure` (built from `get_bytes()`)."""
+        if structure is not self.structure:
+            self.structure = structure
+            self.structure_tree.load(structure)
+        self.line_view.display = False
+        self.structure_tree.display = True
+        self.structure_tree.focus()
+
+    def show_text(self) -> None:
+        self.structure_tree.display = False
+        self.line_view.display = True
+        self.line_view.focus()
+
+    def _invalidate_structure(self) -> None:
+        if self.structure is None:
+            return
+        self.structure = None
+        self.structure_tree.load(None)
+
+    @on(StructureTree.ShowOffset)
+    def _on_show_offset(self, event: StructureTree.ShowOffset) -> None:
+        event.stop()
+        index = self.line_view.index
+        if index is None:
+            return
+        self.show_text()
+        self.line_view.goto_line(index.line_at_offset(event.offset))
+
+    @property
+    def buffer(self) -> bytes | bytearray:
+        """The output buffer itself (not a copy); don't hold on to it across updates."""
+        index = self.line_view.index
+        return index.data if index else b""
+
+    def get_bytes(self) -> bytes:
+        index = self.line_view.index
+        return bytes(index.data) if index else b""
+
+    def get_text(self) -> str:
+        # Decoded straight from the buffer, without a bytes copy of it first
+        index = self.line_view.index
+        return str(index.data, "utf-8") if index else ""
+
+    def set_text(self, text: str, notify: bool = True) -> None:
+        self.set_bytes(text.encode("utf-8"))
+
+    def set_bytes(self, data: bytes, index: LineIndex | None = None) -> None:
+        """Shows the buffer. Pass a prebuilt `index` to skip indexing on the UI thread."""
+        if index is None and data:
+            index = LineIndex(data)
+        self._invalidate_structure()
+        self.line_view.load(index)
+
+    def append_bytes(self, data: bytes) -> None:
+        """Appends to the output (e.g. streamed NDJSON records) and indexes only the new part."""
+        view = self.line_view
+        if data:
+            self._invalidate_structure()
+        if view.index is None:
+            view.load(LineIndex(bytearray(data)))
+        elif data:
+            view.index.extend(data)
+            view.content_extended()
+
+    def get_selected_text(self) -> str:
+        """The selected line range, or the whole output when nothing is selected."""
+        return self.get_selected_bytes().decode("utf-8")
+
+    def get_selected_bytes(self) -> bytes:
+        """`get_selected_text` as UTF-8, a copy safe to hand to a worker."""
+        view = self.line_view
+        selected = view.selected_lines
+        if not selected:
+            return self.get_bytes()
+        return view.index.range_bytes(*selected)
+
+    def goto_line(self, line_number: int) -> None:
+        """Jumps to a 1-based line number."""
+        self.line_view.goto_line(line_number - 1)
+        self.line_view.focus()
@@ -0,0 +1,34 @@
+from rich.text import Text
+from textual.widgets import Static
+
+from tjson.core.metrics import RunMetrics
+from tjson.utils import format_size
+
+
+class PerfHUD(Static):
+    """Footer panel listing the phase timings of the most recent runs."""
+
+    # Runs shown, newest first
+    ROWS = 4
+
+    def show_runs(self, runs: list[RunMetrics]) -> None:
+        text = Text(no_wrap=True, overflow="ellipsis")
+        if not runs:
+            text.append("No runs recorded yet", style="#6272a4")
+        for row, run in enumerate(runs[: self.ROWS]):
+            if row:
+                text.append("\n")
+            text.append(f"{run.kind:<8}", style="bold #bd93f9")
+            sizes = format_size(run.input_bytes)
+            if run.output_bytes:
+                sizes += f" → {format_size(run.output_bytes)}"
+            text.append(f"{sizes:<22}", style="#8be9fd")
+            text.append(
+                " · ".join(
+                    f"{name} {seconds * 1000:.0f}ms" for name, seconds in run.phases.items()
+                )
+            )
+            text.append(f"  = {run.total_seconds * 1000:.0f}ms", style="bold #50fa7b")
+            if run.peak_growth_bytes:
+                text.append(f"  peak +{format_size(run.peak_growth_bytes)}", style="#6272a4")
+        self.update(text)
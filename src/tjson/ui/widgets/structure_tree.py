@@ -0,0 +1,130 @@
+from dataclasses import dataclass
+from itertools import islice
+
+from rich.text import Text
+from textual.binding import Binding
+from textual.message import Message
+from textual.widgets import Tree
+from textual.widgets.tree import TreeNode
+
+from tjson.core.structure_index import Member, StructureIndex
+from tjson.utils import format_size
+
+
+@dataclass
+class MoreMembers:
+    """Placeholder for the members of `node` that were not listed yet."""
+
+    node: int
+    from_offset: int
+    position: int
+
+
+class StructureTree(Tree):
+    """
+    Collapsible tree over a `StructureIndex`.
+
+    Nodes are only created when their parent is expanded, a page at a time,
+    so drilling into a huge document never materializes more than what is
+    on screen. Containers show their child count and size in bytes.
+    """
+
+    BINDINGS = [
+        Binding("o", "show_in_output", "Show in Output"),
+    ]
+
+    # Members listed per expansion; the rest sit behind a "more" node
+    PAGE_SIZE = 200
+    # Scalar values are cut to this many bytes in labels
+    VALUE_PREVIEW = 80
+
+    class ShowOffset(Message):
+        """Asks the owner to show the given byte offset in the text view."""
+
+        def __init__(self, offset: int) -> None:
+            self.offset = offset
+            super().__init__()
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__("(empty)", **kwargs)
+        self.index: StructureIndex | None = None
+
+    def load(self, index: StructureIndex | None) -> None:
+        self.index = index
+        self.clear()
+        if not index or not len(index):
+            self.root.set_label("(no objects or arrays)")
+            return
+        root = Member("$", 0, index.starts[0], index.ends[0], 0)
+        self.root.data = root
+        self.root.set_label(self._label(root))
+        self._add_members(self.root, 0)
+        self.root.expand()
+
+    # --- LABELS ---
+
+    def _label(self, member: Member) -> Text:
+        index = self.index
+        label = Text()
+        if member.key is not None:
+            label.append(member.key, style="#8be9fd")
+        else:
+            label.append(f"[{member.position}]", style="#6272a4")
+
+        if member.node >= 0:
+            count = index.child_counts[member.node]
+            if index.is_object(member.node):
+                label.append("  {…}  ", style="#f8f8f2")
+                label.append(f"{count:,} keys", style="#bd93f9")
+            else:
+                label.append("  […]  ", style="#f8f8f2")
+                label.append(f"{count:,} items", style="#bd93f9")
+            label.append(f" · {format_size(index.size(member.node))}", style="#6272a4")
+        else:
+            value = index.value_bytes(member, self.VALUE_PREVIEW).decode("utf-8", errors="replace")
+            if member.end - member.start > self.VALUE_PREVIEW:
+                value += "…"
+            label.append(": ", style="#f8f8f2")
+            label.append(value, style="#50fa7b" if value.startswith('"') else "#ff79c6")
+        return label
+
+    # --- LAZY EXPANSION ---
+
+    def _add_members(
+        self, parent: TreeNode, node: int, from_offset: int | None = None, position: int = 0
+    ) -> None:
+        """Adds the next page of `node`'s members under `parent`."""
+        index = self.index
+        last = None
+        for member in islice(index.members(node, from_offset, position), self.PAGE_SIZE):
+            if member.node >= 0:
+                parent.add(self._label(member), data=member, allow_expand=True)
+            else:
+                parent.add_leaf(self._label(member), data=member)
+            last = member
+
+        listed = 0 if last is None else last.position + 1
+        remaining = index.child_counts[node] - listed
+        if last is not None and remaining > 0:
+            parent.add_leaf(
+                Text(f"… {remaining:,} more", style="italic #6272a4"),
+                data=MoreMembers(node, last.end, listed),
+            )
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        member = event.node.data
+        if isinstance(member, Member) and member.node >= 0 and not event.node.children:
+            self._add_members(event.node, member.node)
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected) -> None:
+        more = event.node.data
+        if isinstance(more, MoreMembers):
+            event.stop()
+            parent = event.node.parent
+            event.node.remove()
+            self._add_members(parent, more.node, more.from_offset, more.position)
+
+    def action_show_in_output(self) -> None:
+        node = self.cursor_node
+        if node is not None and isinstance(node.data, Member):
+            self.post_message(self.ShowOffset(node.data.start))
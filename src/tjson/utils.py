@@ -0,0 +1,8 @@
+def format_size(num_bytes: float) -> str:
+    """Human readable byte count, e.g. 1536 -> '1.5 KB'."""
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} B" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
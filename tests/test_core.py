@@ -0,0 +1,1061 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+import pyperclip
+import pytest
+
+from tjson import cli
+from tjson.core.cache import ResultCache
+from tjson.core.diff import JSONDiff, SubtreeHashes
+from tjson.core.documents import DocumentState, DocumentTabs
+from tjson.core.line_index import LineIndex
+from tjson.core import metrics
+from tjson.core.metrics import MetricsLog, RunMetrics
+from tjson.core.ndjson import NDJSONProcessor, process_chunk
+from tjson.core.processor import JSONProcessor
+from tjson.core.profile import DocumentProfile
+from tjson.core.query import QueryEngine, QueryError
+from tjson.core.scheduler import AdaptiveDebounce
+from tjson.core.search import OutputSearch, SearchError, SearchQuery
+from tjson.core.structure_index import StructureIndex
+from tjson.core.validation import IncrementalValidator
+from tjson.services import clipboard, file_loader, stdin_reader
+from tjson.services.clipboard import ClipboardService, ClipboardTimeout
+from tjson.services.config_store import ConfigStore
+from tjson.services.file_follower import ROTATED, TRUNCATED, FileFollower, FollowError, RecordRing
+from tjson.services.file_index import FileIndex, fuzzy_score, is_json_file
+from tjson.services.file_loader import FileLoader, LoadCancelled
+from tjson.services.file_writer import AtomicFile, ExportCancelled, FileExporter
+from tjson.services.stdin_reader import StdinReader
+
+
+@pytest.fixture(autouse=True)
+def clear_processor_cache():
+    JSONProcessor.cache.clear()
+    yield
+    JSONProcessor.cache.clear()
+
+
+def pipe_with(data: bytes) -> int:
+    """A pipe's read end, with `data` written and the write end closed."""
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, data)
+    os.close(write_fd)
+    return read_fd
+
+
+# The benchmark scripts import their helpers as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks"))
+
+
+# --- FILE LOADER ---
+
+
+def test_file_loader_reads_in_chunks(tmp_path):
+    path = tmp_path / "data.json"
+    data = b'{"items": [' + b",".join(b"%d" % i for i in range(5000)) + b"]}"
+    path.write_bytes(data)
+    progress = []
+    loaded = FileLoader(str(path), chunk_size=4096).load(
+        on_progress=lambda read, total: progress.append((read, total))
+    )
+    assert loaded == data
+    assert isinstance(loaded, bytearray)
+    assert progress[-1] == (len(data), len(data))
+    assert len(progress) == -(-len(data) // 4096)
+
+
+def test_file_loader_empty_file(tmp_path):
+    path = tmp_path / "empty.json"
+    path.write_bytes(b"")
+    assert FileLoader(str(path)).load() == bytearray()
+
+
+def test_file_loader_cancel_between_chunks(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(b"x" * 10_000)
+    loader = FileLoader(str(path), chunk_size=1000)
+    with pytest.raises(LoadCancelled):
+        loader.load(on_progress=lambda read, total: loader.cancel())
+    assert loader.cancelled
+
+
+def test_file_loader_missing_file(tmp_path):
+    with pytest.raises(OSError):
+        FileLoader(str(tmp_path / "missing.json")).load()
+
+
+def test_file_loader_reads_without_mmap(tmp_path, monkeypatch):
+    path = tmp_path / "data.json"
+    path.write_bytes(b"[1, 2, 3]" * 1000)
+
+    def unmappable(*args, **kwargs):
+        raise OSError("cannot map")
+
+    monkeypatch.setattr(file_loader.mmap, "mmap", unmappable)
+    assert FileLoader(str(path), chunk_size=1000).load() == path.read_bytes()
+
+
+# --- LINE INDEX ---
+
+
+def test_line_index_slices_lines():
+    index = LineIndex(b'{\n  "a": "\xc3\xa9t\xc3\xa9",\n  "b": 2\n}')
+    assert index.line_count == 4
+    assert index.line(1) == '  "a": "été",'
+    assert index.line_length(1) == len('  "a": "été",'.encode())
+    assert index.line_slice(1, 2, 5) == '"a"'
+    assert index.range_bytes(2, 3) == b'  "b": 2\n}'
+    assert index.line_at_offset(0) == 0
+    assert index.line_at_offset(3) == 1
+    assert index.max_width == index.line_length(1)
+
+
+def test_line_index_without_trailing_newline():
+    index = LineIndex(b"a\n")
+    assert index.line_count == 2
+    assert index.line(1) == ""
+
+
+# --- PROCESSOR ---
+
+
+def test_process_pretty_and_minified():
+    assert JSONProcessor.process('{"a": [1, 2]}', minify=True).formatted_text == '{"a":[1,2]}'
+    result = JSONProcessor.process('{"a":1}')
+    assert result.is_valid
+    assert result.formatted_text == '{\n  "a": 1\n}'
+
+
+def test_process_caches_by_content_and_mode():
+    first = JSONProcessor.process('{"a": 1}')
+    hits = JSONProcessor.cache.stats().hits
+    assert JSONProcessor.process('{"a": 1}').formatted_text == first.formatted_text
+    assert JSONProcessor.cache.stats().hits > hits
+    # Same content as bytes or another mode: another output, same content key
+    assert JSONProcessor.process('{"a": 1}', minify=True).formatted_text == '{"a":1}'
+    assert JSONProcessor.content_key('{"a": 1}') != JSONProcessor.content_key('{"a": 2}')
+    assert JSONProcessor.content_key(b"[1]") == JSONProcessor.content_key(bytearray(b"[1]"))
+
+
+def test_content_key_does_not_trust_str_hash():
+    class Colliding(str):
+        def __hash__(self) -> int:
+            return 0
+
+    one, two = Colliding("[1]"), Colliding("[2]")
+    assert hash(one) == hash(two)
+    assert JSONProcessor.content_key(one) != JSONProcessor.content_key(two)
+    assert JSONProcessor.content_key("\ud800") != JSONProcessor.content_key("\ud801")
+
+
+def test_process_without_cache():
+    JSONProcessor.process("[1]", use_cache=False)
+    assert JSONProcessor.cache.stats().entries == 0
+
+
+# --- RESULT CACHE ---
+
+
+def test_cache_evicts_least_recently_used_past_budget():
+    cache = ResultCache(max_bytes=100)
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3, 40)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size_bytes == 80
+
+
+def test_cache_rejects_values_over_budget():
+    cache = ResultCache(max_bytes=10)
+    assert not cache.put("big", "x", 11)
+    assert cache.get("big") is None
+    cache.put("a", 1, 5)
+    cache.put("a", 2, 8)  # Replacing an entry charges its new size only
+    assert cache.stats().size_bytes == 8
+    cache.clear()
+    assert cache.stats().size_bytes == 0
+
+
+# --- CLI ---
+
+
+def test_cli_fmt_rewrites_files_atomically(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_bytes(b'{"a":[1,2]}')
+    path.chmod(0o640)
+    assert cli.main(["fmt", "-j", "1", "-q", str(path)]) == 0
+    assert path.read_bytes() == b'{\n  "a": [\n    1,\n    2\n  ]\n}\n'
+    assert path.stat().st_mode & 0o777 == 0o640  # Permissions kept
+    assert os.listdir(tmp_path) == ["a.json"]  # No temp file left behind
+
+
+def test_cli_leaves_unchanged_files_alone(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_bytes(b'{"a":1}\n')
+    os.utime(path, (1_000_000, 1_000_000))
+    assert cli.main(["min", "-j", "1", "-q", str(path)]) == 0
+    assert path.stat().st_mtime == 1_000_000
+
+
+def test_cli_check_mode_writes_nothing(tmp_path):
+    formatted, unformatted = tmp_path / "ok.json", tmp_path / "ugly.json"
+    formatted.write_bytes(b'{\n  "a": 1\n}\n')
+    unformatted.write_bytes(b'{"a":1}')
+    assert cli.main(["fmt", "-j", "1", "--check", str(formatted)]) == 0
+    assert cli.main(["fmt", "-j", "1", "--check", str(tmp_path)]) == 1
+    assert unformatted.read_bytes() == b'{"a":1}'
+
+
+def test_cli_exit_codes(tmp_path, capsys):
+    valid, invalid = tmp_path / "valid.json", tmp_path / "invalid.json"
+    valid.write_bytes(b"[1]")
+    invalid.write_bytes(b"[1,")
+    assert cli.main(["check", "-j", "1", str(valid)]) == 0
+    assert cli.main(["check", "-j", "1", str(valid), str(invalid)]) == 1
+    assert "FAIL" in capsys.readouterr().out
+    assert cli.main(["check", "-j", "1", str(tmp_path / "missing*.json")]) == 1
+    assert cli.main(["fmt", "-j", "1", str(invalid)]) == 1
+    assert invalid.read_bytes() == b"[1,"
+
+
+def test_cli_output_dir_mirrors_paths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "in").mkdir()
+    (tmp_path / "in" / "a.json").write_bytes(b"[1, 2]")
+    assert cli.main(["min", "-j", "1", "-q", "-o", "out", "in"]) == 0
+    assert (tmp_path / "out" / "in" / "a.json").read_bytes() == b"[1,2]\n"
+    assert (tmp_path / "in" / "a.json").read_bytes() == b"[1, 2]"
+
+
+def test_cli_process_pool(tmp_path):
+    for i in range(4):
+        (tmp_path / f"{i}.json").write_bytes(b'{"n":%d}' % i)
+    assert cli.main(["min", "-j", "2", "-q", str(tmp_path)]) == 0
+    assert (tmp_path / "3.json").read_bytes() == b'{"n":3}\n'
+
+
+# --- LINE INDEX ---
+
+
+def test_line_index_extend_indexes_new_lines():
+    index = LineIndex(b"one\ntw")
+    index.extend(b"o\nthree")
+    assert index.line_count == 3
+    assert [index.line(i) for i in range(3)] == ["one", "two", "three"]
+    assert index.line_at_offset(5) == 1
+    assert index.max_width == 5
+
+
+# --- NDJSON ---
+
+
+def test_ndjson_renumbers_errors_across_chunks():
+    lines = [b'{"n": %d}' % i for i in range(30)]
+    lines[3] = b"{bad"
+    lines[25] = b"[1,"
+    data = b"\n".join(lines) + b"\n"
+    with ThreadPoolExecutor(2) as executor:
+        results = list(
+            NDJSONProcessor.process_stream(data, minify=True, executor=executor, chunk_size=64)
+        )
+    assert len(results) > 1
+    assert [error.line_number for result in results for error in result.errors] == [4, 26]
+    assert sum(result.records for result in results) == 28
+    output = b"".join(result.output for result in results)
+    assert output.splitlines()[3] == b'{"n":4}'
+
+
+def test_ndjson_skips_blank_lines():
+    result = process_chunk(b'{"a":1}\n\n  \n[2]\n', minify=True)
+    assert result.records == 2
+    assert result.line_count == 4
+    assert result.output == b'{"a":1}\n[2]\n'
+
+
+def test_ndjson_chunks_end_on_line_boundaries():
+    data = b"".join(b'{"n": %d}\n' % i for i in range(100)) + b'{"last": true}'
+    spans = list(NDJSONProcessor.iter_chunks(data, chunk_size=50))
+    assert spans[0][0] == 0 and spans[-1][1] == len(data)
+    for (_, end), (start, _) in zip(spans, spans[1:]):
+        assert end == start and data[end - 1 : end] == b"\n"
+
+
+def test_cli_ndjson_keeps_file_with_broken_lines(tmp_path, capsys):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"a": 1}\n{bad\n')
+    assert cli.main(["min", "-j", "1", "--ndjson", str(path)]) == 1
+    assert "line 2" in capsys.readouterr().out
+    assert path.read_bytes() == b'{"a": 1}\n{bad\n'
+    path.write_bytes(b'{"a": 1}\n\n[1, 2]\n')
+    assert cli.main(["min", "-j", "1", "-q", str(path)]) == 0  # By extension
+    assert path.read_bytes() == b'{"a":1}\n[1,2]\n'
+
+
+
+def test_cli_ndjson_check_and_unchanged_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"a":1}\n[1,2]\n')
+    os.utime(path, (1_000_000, 1_000_000))
+    assert cli.main(["min", "-j", "1", "-q", str(path)]) == 0
+    assert path.stat().st_mtime == 1_000_000
+    assert cli.main(["fmt", "-j", "1", "-q", "--check", str(path)]) == 1
+    assert path.read_bytes() == b'{"a":1}\n[1,2]\n'
+    assert cli.main(["check", "-j", "1", "-q", str(path)]) == 0
+
+
+def test_cli_ndjson_reports_unwritable_target(tmp_path, monkeypatch, capsys):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(b'{"a": 1}\n')
+
+    def unwritable(path, compress=False):
+        raise PermissionError(13, "Permission denied", path)
+
+    monkeypatch.setattr(cli.FileWriter, "open_atomic", unwritable)
+    assert cli.main(["min", "-j", "1", str(path)]) == 1
+    out = capsys.readouterr().out
+    assert "FAIL" in out and "Permission denied" in out
+    assert path.read_bytes() == b'{"a": 1}\n'
+    assert os.listdir(tmp_path) == ["events.jsonl"]
+
+
+# --- STDIN ---
+
+
+def test_stdin_reader_reads_to_eof():
+    progress = []
+    reader = StdinReader(pipe_with(b'{"a": 1}' * 100), chunk_size=64)
+    data = reader.load(lambda done, total: progress.append(done))
+    assert data == b'{"a": 1}' * 100
+    assert progress[-1] == len(data) and len(progress) > 1
+
+
+def test_stdin_reader_cancels_while_producer_is_idle():
+    read_fd, write_fd = os.pipe()
+    reader = StdinReader(read_fd)
+    threading.Timer(0.1, reader.cancel).start()
+    try:
+        with pytest.raises(LoadCancelled):
+            reader.load()
+    finally:
+        os.close(write_fd)
+
+
+def test_cli_filters_stdin_to_stdout(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdin", os.fdopen(pipe_with(b'{"a": [1, 2]}'), "rb", closefd=False))
+    monkeypatch.setattr(sys, "stdout", stdout)
+    assert cli.main(["min", "-q", "-"]) == 0
+    assert stdout.buffer.getvalue() == b'{"a":[1,2]}\n'
+    assert cli.main(["fmt", "-", "a.json"]) == 2
+
+
+
+def test_cli_without_terminal_filters_stdin(monkeypatch, capsys):
+    def no_terminal(path, flags, *args):
+        raise OSError(6, "No such device or address", path)
+
+    stdin = os.fdopen(pipe_with(b'{"a":1}'), "rb", closefd=False)
+    monkeypatch.setattr(sys, "stdin", stdin)
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+    monkeypatch.setattr(stdin_reader.os, "open", no_terminal)
+    with pytest.raises(OSError):
+        StdinReader.detach()
+    assert cli.main([]) == 0
+    out, err = capsys.readouterr()
+    assert out == '{\n  "a": 1\n}\n'
+    assert "no terminal" in err
+
+
+# --- STRUCTURE INDEX ---
+
+
+def test_structure_index_lists_members():
+    data = b'{"a": [1, {"b": 2}], "c": {}}'
+    index = StructureIndex(data)
+    assert len(index) == 4
+    assert list(index.child_counts) == [2, 2, 1, 0]
+    members = list(index.members(0))
+    assert [(member.key, member.node) for member in members] == [("a", 1), ("c", 3)]
+    items = list(index.members(1))
+    assert index.value_bytes(items[0], 10) == b"1"
+    assert items[1].node == 2
+
+
+def test_structure_index_resumes_after_a_member():
+    data = b'[ "x,]" , [1, 2] ,3 ]'
+    index = StructureIndex(data)
+    assert list(index.child_counts) == [3, 2]  # Brackets and commas in strings ignored
+    first, *_ = index.members(0)
+    rest = list(index.members(0, first.end, first.position + 1))
+    assert [(member.position, member.node) for member in rest] == [(1, 1), (2, -1)]
+    assert data[rest[1].start : rest[1].end] == b"3"
+    assert index.node_at(rest[0].start) == 1
+    assert index.subtree_end(0) == 2
+
+
+# --- QUERY ---
+
+
+DOCUMENT = {
+    "items": [
+        {"name": "a", "tags": {"app.kubernetes.io/name": "web"}},
+        {"name": "b", "tags": {}},
+        {"name": "c", "meta": {"name": "nested"}},
+    ]
+}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (".items[*].name", ["a", "b", "c"]),
+        ("$.items[*].name", ["a", "b", "c"]),
+        (".items[-1].name", ["c"]),
+        (".items[0:2].name", ["a", "b"]),
+        (".items[0, 2].name", ["a", "c"]),
+        ('.items[0].tags["app.kubernetes.io/name"]', ["web"]),
+        ("..name", ["a", "b", "c", "nested"]),
+        (".items[1].missing", []),
+    ],
+)
+def test_query_evaluates(query, expected):
+    assert list(QueryEngine.evaluate(query, DOCUMENT)) == expected
+
+
+@pytest.mark.parametrize("query", [".items[", ".items[0", '.a["b]', "items"])
+def test_query_rejects_invalid(query):
+    with pytest.raises(QueryError):
+        QueryEngine.compile(query)
+
+
+def test_query_shares_parsed_tree_with_process():
+    raw = '{"a": [1, 2]}'
+    JSONProcessor.process(raw)
+    assert JSONProcessor.parse(raw) is JSONProcessor.parse(raw)
+    assert QueryEngine.compile(".a[*]") is QueryEngine.compile(".a[*]")
+
+
+# --- SCHEDULER ---
+
+
+def test_debounce_follows_measured_cost():
+    debounce = AdaptiveDebounce()
+    small = debounce.delay_for(100)
+    debounce.record(1024 * 1024, 1.0)  # 1s per MB
+    assert debounce.delay_for(100) == small
+    assert debounce.delay_for(1024 * 1024) > small
+    assert debounce.delay_for(100 * 1024 * 1024) is None  # On demand only
+
+
+def test_debounce_ignores_tiny_runs_and_smooths_samples():
+    debounce = AdaptiveDebounce()
+    debounce.record(10, 5.0)  # Fixed overhead, not a cost per byte
+    assert debounce.samples == 0
+    debounce.record(1024 * 1024, 0.01)
+    debounce.record(1024 * 1024, 0.02)
+    assert debounce.samples == 2
+    assert 0.01 < debounce.estimate(1024 * 1024) < 0.02
+
+
+# --- METRICS ---
+
+
+def test_metrics_log_keeps_latest_runs(tmp_path):
+    trace = tmp_path / "runs.jsonl"
+    log = MetricsLog(capacity=2, trace_path=str(trace))
+    for kind in ("load", "process", "query"):
+        run = RunMetrics(kind)
+        run.add_phase("parse", 0.25)
+        log.record(run)
+    assert [run.kind for run in log.latest(5)] == ["query", "process"]
+    lines = [orjson.loads(line) for line in trace.read_bytes().splitlines()]
+    assert [line["kind"] for line in lines] == ["load", "process", "query"]
+    assert lines[0]["total_seconds"] == 0.25
+
+
+def test_metrics_record_peak_growth_of_the_run(monkeypatch):
+    peaks = iter([100_000, 250_000])
+    monkeypatch.setattr(metrics, "peak_memory_bytes", lambda: next(peaks))
+    run = RunMetrics("process")  # Starts at the first peak
+    MetricsLog().record(run)
+    assert run.peak_growth_bytes == 150_000
+
+    monkeypatch.setattr(metrics, "peak_memory_bytes", lambda: None)  # Windows
+    run = RunMetrics("process")
+    MetricsLog().record(run)
+    assert run.peak_growth_bytes is None
+
+
+def test_process_records_phase_timings():
+    raw = '{"a": [1, 2, 3]}'
+    metrics = JSONProcessor.process(raw).metrics
+    assert list(metrics.phases)[:3] == ["hash", "parse", "dump"]
+    assert metrics.input_bytes == len(raw)
+    assert metrics.output_bytes == len(b'{\n  "a": [\n    1,\n    2,\n    3\n  ]\n}')
+    # A cache hit gets its own metrics: only the lookup ran
+    hit = JSONProcessor.process(raw).metrics
+    assert hit is not metrics
+    assert "parse" not in hit.phases and "dump" not in hit.phases
+    minified = JSONProcessor.process(raw, minify=True).metrics
+    assert "parse" not in minified.phases and "dump" in minified.phases  # The tree was cached
+
+
+# --- BENCHMARKS ---
+
+
+@pytest.mark.parametrize("shape", ["deep", "wide", "long_strings", "many_keys", "records"])
+def test_generators_build_valid_documents_of_the_requested_size(shape):
+    from generators import SHAPES
+
+    data = SHAPES[shape](64 * 1024)
+    assert 64 * 1024 <= len(data) < 96 * 1024  # Overshoots by at most one item
+    assert SHAPES[shape](64 * 1024) == data  # Deterministic
+    orjson.loads(data)
+
+
+def test_ndjson_generator_and_sizes():
+    from generators import ndjson, parse_size
+
+    assert parse_size("16MB") == 16 * 1024 * 1024
+    assert parse_size("1.5KB") == 1536
+    lines = ndjson(4096).splitlines()
+    assert all(orjson.loads(line)["level"] == "info" for line in lines)
+
+
+def test_compare_flags_regressions_beyond_threshold(tmp_path, capsys):
+    from common import BenchResult, compare, save_baseline
+
+    baseline = str(tmp_path / "base.json")
+    save_baseline(
+        baseline, [BenchResult("a", 1.0), BenchResult("b", 1.0, peak_rss_bytes=100 << 20)]
+    )
+    assert compare(baseline, [BenchResult("a", 1.1), BenchResult("b", 0.5)]) == 0
+    assert compare(baseline, [BenchResult("a", 1.2)]) == 1
+    assert compare(baseline, [BenchResult("b", 1.0, peak_rss_bytes=200 << 20)]) == 1
+    assert compare(baseline, [BenchResult("new", 1.0)]) == 0
+    assert "faster" in capsys.readouterr().out
+
+
+def test_reference_baseline_covers_default_core_sizes():
+    from bench_core import DEFAULT_SIZES
+    from common import load_baseline
+    from generators import SHAPES
+
+    measured = {case.rsplit("/", 1)[0] for case in load_baseline("reference")}
+    for size in DEFAULT_SIZES.split(","):
+        assert {f"core/{shape}/{size}" for shape in SHAPES} <= measured
+
+
+# --- BYTES PATH ---
+
+
+def test_process_bytes_reads_buffers_in_place(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(b'{"a": "\xc3\xa9"}')
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        result = JSONProcessor.process_bytes(data, minify=True)
+    assert result.formatted_bytes == '{"a":"é"}'.encode()
+    assert result.formatted_text == ""  # Never decoded
+    assert result.to_bytes() is result.formatted_bytes
+    assert JSONProcessor.process_bytes(memoryview(b"[1]")).formatted_bytes == b"[\n  1\n]"
+
+
+def test_process_same_invalid_input_twice():
+    # The second run is a cache hit on an error result (no output bytes)
+    first = JSONProcessor.process("{bad")
+    second = JSONProcessor.process("{bad")
+    assert not first.is_valid and not second.is_valid
+    assert second.error_message == first.error_message
+    assert second.metrics.output_bytes == 0
+
+
+def test_process_reuses_cached_tree_across_modes():
+    raw = b'{"a": [1, 2, 3]}'
+    JSONProcessor.process_bytes(raw)
+    result = JSONProcessor.process_bytes(raw, minify=True)
+    assert result.formatted_bytes == b'{"a":[1,2,3]}'
+    assert "parse" not in result.metrics.phases
+
+
+def test_is_blank():
+    assert JSONProcessor.is_blank(" \n\t")
+    assert JSONProcessor.is_blank(bytearray(b"\r\n"))
+    assert not JSONProcessor.is_blank(b" 1")
+    assert JSONProcessor.process_bytes(b"  \n").formatted_bytes == b""
+
+
+def test_cli_keeps_unchanged_file_with_trailing_whitespace(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_bytes(b"[1,2]\n")
+    os.utime(path, (1_000_000, 1_000_000))
+    assert cli.main(["min", "-j", "1", "-q", str(path)]) == 0
+    assert path.stat().st_mtime == 1_000_000
+    path.write_bytes(b"[1,2]\n\n")  # Not byte-identical to the output: rewritten
+    assert cli.main(["min", "-j", "1", "-q", str(path)]) == 0
+    assert path.read_bytes() == b"[1,2]\n"
+
+
+# --- EXPORT ---
+
+
+def test_exporter_writes_chunks_and_gzips_by_extension(tmp_path):
+    data = bytearray(b'{"n": 1}\n' * 1000)
+    progress = []
+    path = tmp_path / "out.json.gz"
+    exporter = FileExporter(str(path), chunk_size=1024)
+    assert exporter.export(data, lambda done, total: progress.append(done)) == len(data)
+    assert gzip.decompress(path.read_bytes()) == data
+    assert progress[-1] == len(data) and len(progress) == -(-len(data) // 1024)
+    assert os.listdir(tmp_path) == ["out.json.gz"]
+
+    FileExporter(str(tmp_path / "plain.json.gz"), compress=False).export(b"[]")
+    assert (tmp_path / "plain.json.gz").read_bytes() == b"[]"
+
+
+def test_cancelled_export_leaves_target_untouched(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_bytes(b"old")
+    exporter = FileExporter(str(path), chunk_size=10)
+    with pytest.raises(ExportCancelled):
+        exporter.export(b"x" * 100, lambda done, total: exporter.cancel())
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["out.json"]  # Temp file removed
+
+
+def test_atomic_file_discards_on_error(tmp_path):
+    path = tmp_path / "out.json"
+    with pytest.raises(RuntimeError):
+        with AtomicFile(str(path), compress=True) as target:
+            target.write(b"partial")
+            raise RuntimeError("write failed")
+    assert os.listdir(tmp_path) == []
+
+
+def test_cli_gzip_needs_output_dir(tmp_path):
+    path = tmp_path / "a.json"
+    path.write_bytes(b"[1, 2]")
+    assert cli.main(["min", "-j", "1", "--gzip", str(path)]) == 2
+    out = tmp_path / "out"
+    assert cli.main(["min", "-j", "1", "-q", "--gzip", "-o", str(out), str(path)]) == 0
+    [written] = [child for child in out.rglob("*") if child.is_file()]
+    assert written.name == "a.json.gz"
+    assert gzip.decompress(written.read_bytes()) == b"[1,2]\n"
+
+
+# --- COMPRESSED FILES ---
+
+
+@pytest.mark.parametrize(
+    "extension, compress, expected",
+    [(".gz", gzip.compress, "gzip"), (".bz2", bz2.compress, "bz2"), (".xz", lzma.compress, "xz")],
+)
+def test_file_loader_decompresses_by_magic_bytes(tmp_path, extension, compress, expected):
+    data = b'{"n": 1}\n' * 5000
+    path = tmp_path / f"events.jsonl{extension}"
+    path.write_bytes(compress(data))
+    progress = []
+    loader = FileLoader(str(path), chunk_size=4096)
+    assert loader.load(lambda read, total: progress.append((read, total))) == data
+    assert loader.compression == expected
+    assert loader.decompressed_bytes == len(data)
+    assert loader.document_name == "events.jsonl"
+    assert progress[-1][1] == os.path.getsize(path)  # Against the compressed size
+
+
+def test_file_loader_sniffs_content_not_extension(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_bytes(gzip.compress(b"[1]"))
+    loader = FileLoader(str(path))
+    assert loader.load() == b"[1]"
+    assert loader.compression == "gzip"
+    assert FileLoader.sniff_compression(b"[1]") is None
+
+
+def test_file_loader_rejects_corrupt_archives(tmp_path):
+    path = tmp_path / "data.json.gz"
+    path.write_bytes(gzip.compress(b"[1, 2, 3]")[:-6])
+    with pytest.raises(EOFError):
+        FileLoader(str(path)).load()
+
+
+# --- DIFF ---
+
+
+def test_diff_reports_changes_with_paths():
+    old = {"a": 1, "b": {"c": [1, 2]}, "gone": True}
+    new = {"a": 2, "b": {"c": [1, 2]}, "added": None}
+    changes = {(change.kind, change.path) for change in JSONDiff.diff(old, new)}
+    assert changes == {("changed", ".a"), ("removed", ".gone"), ("added", ".added")}
+
+
+def test_diff_aligns_inserted_array_items():
+    old = [{"id": i} for i in range(5)]
+    new = old[:2] + [{"id": "new"}] + old[2:]
+    changes = list(JSONDiff.diff(old, new))
+    assert [(change.kind, change.path) for change in changes] == [("added", ".[2]")]
+
+
+def test_diff_identical_subtrees_hash_equal():
+    old, new = {"x": [1, {"y": 1.0}]}, {"x": [1, {"y": 1.0}]}
+    assert SubtreeHashes(old).of(old) == SubtreeHashes(new).of(new)
+    assert list(JSONDiff.diff(old, new)) == []
+    # Same value, different type
+    assert [change.kind for change in JSONDiff.diff([1], [1.0])] == ["changed"]
+
+
+@pytest.mark.parametrize("a, b", [(-1, -2), (1, 1 + 2**61 - 1)])
+def test_diff_confirms_colliding_hashes(a, b):
+    assert hash(a) == hash(b)
+    for old, new, path in (
+        ({"k": a}, {"k": b}, ".k"),
+        ([a], [b], ".[0]"),
+        ({"k": [a]}, {"k": [b]}, ".k[0]"),
+        ([[a], 0], [[b], 0], ".[0][0]"),
+    ):
+        changes = list(JSONDiff.diff(old, new))
+        assert [(change.kind, change.path) for change in changes] == [("changed", path)]
+
+
+def test_align_pairs_edits_in_place():
+    assert list(JSONDiff.align([1, 2, 3], [1, 9, 3])) == [(1, 1)]
+    assert list(JSONDiff.align([1, 2, 3], [1, 3])) == [(1, None)]
+
+
+def test_cli_diff_exit_codes(tmp_path, capsys):
+    old, new = tmp_path / "old.json", tmp_path / "new.json.gz"
+    old.write_bytes(b'{"a": 1, "b": [1, 2]}')
+    new.write_bytes(gzip.compress(b'{"b": [1, 2], "a": 1}'))
+    assert cli.main(["diff", str(old), str(new)]) == 0
+    new.write_bytes(gzip.compress(b'{"a": 2, "b": [1, 2]}'))
+    assert cli.main(["diff", str(old), str(new)]) == 1
+    assert ".a" in capsys.readouterr().out
+    assert cli.main(["diff", str(old), str(tmp_path / "missing.json")]) == 2
+
+
+# --- CLIPBOARD ---
+
+
+def test_clipboard_gives_up_on_a_hung_tool(monkeypatch):
+    monkeypatch.setattr(clipboard.pyperclip, "paste", lambda: time.sleep(1))
+    with pytest.raises(ClipboardTimeout):
+        ClipboardService.paste_bytes(timeout=0.05)
+
+
+def test_clipboard_reraises_tool_errors(monkeypatch):
+    def fail(text):
+        raise pyperclip.PyperclipException("no clipboard mechanism")
+
+    monkeypatch.setattr(clipboard.pyperclip, "copy", fail)
+    with pytest.raises(pyperclip.PyperclipException):
+        ClipboardService.copy_bytes("é".encode())
+    assert ClipboardService.copy("x") is False
+
+
+def test_clipboard_round_trips_bytes(monkeypatch):
+    copied = []
+    monkeypatch.setattr(clipboard.pyperclip, "copy", copied.append)
+    monkeypatch.setattr(clipboard.pyperclip, "paste", lambda: None)
+    ClipboardService.copy_bytes("é".encode())
+    assert copied == ["é"]
+    assert ClipboardService.paste_bytes().data == b""
+
+
+# --- FILE INDEX ---
+
+
+def test_file_index_finds_json_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileIndex, "_cache", ResultCache(max_bytes=10_000))
+    for name in ("a/users.json", "a/b/events.jsonl.gz", "node_modules/x.json", ".git/y.json"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("{}")
+    (tmp_path / "readme.md").write_text("")
+    index = FileIndex(str(tmp_path))
+    found = sorted(entry.relative_path for entry in index.scan())
+    assert found == [os.path.join("a", "b", "events.jsonl.gz"), os.path.join("a", "users.json")]
+    assert [entry.relative_path for entry in index.search("usr", 5)] == [
+        os.path.join("a", "users.json")
+    ]
+    assert index.search("zzz", 5) == []
+
+
+def test_fuzzy_score_prefers_file_names_and_word_starts():
+    assert fuzzy_score("evt", "events.json") is not None
+    assert fuzzy_score("tve", "events.json") is None
+    assert fuzzy_score("data", "data/x.json") < fuzzy_score("data", "x/data.json")
+    assert is_json_file("A.JSON.XZ") and not is_json_file("a.gz")
+
+
+def test_file_index_cache_dropped_when_directory_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileIndex, "_cache", ResultCache(max_bytes=10_000))
+    (tmp_path / "a.json").write_text("{}")
+    (tmp_path / "notes.txt").write_text("")
+    FileIndex(str(tmp_path)).scan()
+    assert [entry.relative_path for entry in FileIndex.cached(str(tmp_path))] == ["a.json"]
+
+    (tmp_path / "b.jsonl.gz").write_bytes(b"")
+    os.utime(tmp_path, (0, 0))  # Whatever the filesystem's mtime resolution
+    assert FileIndex.cached(str(tmp_path)) == []
+
+
+def test_file_index_cache_is_bounded(tmp_path, monkeypatch):
+    roots = [tmp_path / name for name in ("one", "two")]
+    # Room for one scan of a single file
+    entry_bytes = FileIndex.ENTRY_BYTES + len(str(roots[0] / "data.json")) + len("data.json")
+    monkeypatch.setattr(FileIndex, "_cache", ResultCache(max_bytes=entry_bytes * 3 // 2))
+    for root in roots:
+        root.mkdir()
+        (root / "data.json").write_text("{}")
+        FileIndex(str(root)).scan()
+    assert FileIndex.cached(str(roots[0])) == []  # Least recently scanned, evicted
+    assert len(FileIndex.cached(str(roots[1]))) == 1
+
+
+def test_config_store_keeps_recent_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigStore, "CONFIG_FILE", tmp_path / "config.json")
+    monkeypatch.setattr(ConfigStore, "RECENT_FILES_LIMIT", 2)
+    paths = [tmp_path / f"{i}.json" for i in range(3)]
+    for path in paths:
+        path.write_text("{}")
+        ConfigStore.add_recent_file(str(path))
+    ConfigStore.save_picker_mode("search")
+    assert ConfigStore.get_recent_files() == [str(paths[2]), str(paths[1])]
+    assert ConfigStore.get_picker_mode() == "search"
+    paths[2].unlink()
+    assert ConfigStore.get_recent_files() == [str(paths[1])]
+
+
+def test_cache_discard_forgets_one_entry():
+    cache = ResultCache(max_bytes=100)
+    cache.put("a", 1, 40)
+    cache.put("b", 2, 40)
+    cache.discard("a")
+    cache.discard("missing")
+    assert cache.get("a") is None and cache.get("b") == 2
+    assert cache.stats().size_bytes == 40
+
+
+# --- STARTUP ---
+
+
+def test_headless_commands_import_no_tui_or_pools():
+    from bench_startup import LAZY_HEADLESS, eager_imports
+
+    # A fresh interpreter: this one already imported everything
+    code = "import sys; from tjson import cli; print(' '.join(sys.modules))"
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert "tjson.cli" in loaded
+    assert eager_imports(set(loaded), LAZY_HEADLESS) == []
+
+
+# --- SEARCH ---
+
+
+SEARCH_OUTPUT = b'{\n  "name": "name",\n  "label": "the name",\n  "count": 12\n}'
+
+
+def search(text: str) -> list[bytes]:
+    found = OutputSearch(SEARCH_OUTPUT, SearchQuery.parse(text))
+    found.scan()
+    return [SEARCH_OUTPUT[slice(*found.span(i))] for i in range(len(found))]
+
+
+def test_search_scopes_keys_and_values():
+    assert len(search("name")) == 3
+    assert len(search("key:name")) == 1
+    assert len(search("value:name")) == 2
+    assert search("value:12") == [b"12"]
+    assert search("key:12") == []
+
+
+def test_search_regex_and_smart_case():
+    assert search("/na.e/") == [b"name"] * 3
+    assert search("NAME") == []
+    assert SearchQuery.parse("Name").ignore_case is False
+    with pytest.raises(SearchError):
+        search("/(/")
+
+
+def test_search_navigates_around_offset():
+    found = OutputSearch(SEARCH_OUTPUT, SearchQuery.parse("name"))
+    found.scan()
+    first, _ = found.span(0)
+    assert found.first_at_or_after(first + 1) == 1
+    assert found.last_before(first) is None
+
+
+# --- VALIDATION ---
+
+
+def test_process_reports_error_position():
+    result = JSONProcessor.process('{\n  "a": 1,\n  "b": }')
+    assert not result.is_valid
+    assert result.error.line == 3
+    assert result.error.offset == len('{\n  "a": 1,\n  "b": ')
+
+
+def test_validator_revalidates_edited_region():
+    validator = IncrementalValidator()
+    validator.rebase(b'{"a": [1, 2], "b": {"c": 3}}')
+    verdict = validator.check(b'{"a": [1, 2], "b": {"c": 30}}')
+    assert verdict.valid is True
+    assert verdict.region_bytes == len(b'{"c": 30}')
+
+
+def test_validator_locates_error_in_region():
+    validator = IncrementalValidator()
+    validator.rebase(b'{"a": [1, 2],\n "b": {"c": 3}}')
+    verdict = validator.check(b'{"a": [1, 2],\n "b": {"c": 3x}}')
+    assert verdict.valid is False
+    assert verdict.error.line == 2
+    assert verdict.error.offset == len(b'{"a": [1, 2],\n "b": {"c": 3')
+
+
+def test_validator_defers_structural_edits():
+    validator = IncrementalValidator()
+    validator.rebase(b'{"a": [1, 2], "b": {"c": 3}}')
+    # A removed bracket can pair containers differently: only a full parse can tell
+    assert validator.check(b'{"a": [1, 2, "b": {"c": 3}}').valid is None
+
+
+# --- FOLLOW ---
+
+
+def test_follower_starts_at_the_tail_and_waits_for_whole_lines(tmp_path):
+    path = tmp_path / "app.jsonl"
+    path.write_bytes(b'{"n": 1}\n{"n": 2}\n')
+    follower = FileFollower(str(path), tail_bytes=12)
+    assert follower.poll().lines == b'{"n": 2}\n'  # The cut first line is skipped
+    assert follower.poll() is None
+
+    with path.open("ab") as f:
+        f.write(b'{"n": 3}\n{"n"')
+    assert follower.poll().lines == b'{"n": 3}\n'
+    with path.open("ab") as f:
+        f.write(b": 4}\n")
+    assert follower.poll().lines == b'{"n": 4}\n'
+
+
+def test_follower_restarts_on_truncation_and_rotation(tmp_path):
+    path = tmp_path / "app.jsonl"
+    path.write_bytes(b'{"n": 1}\n{"n": 2}\n')
+    follower = FileFollower(str(path))
+    follower.poll()
+
+    path.write_bytes(b'{"n": 9}\n')
+    update = follower.poll()
+    assert (update.reset, update.lines) == (TRUNCATED, b'{"n": 9}\n')
+
+    path.rename(tmp_path / "app.jsonl.1")
+    assert follower.poll() is None  # Not recreated yet
+    path.write_bytes(b'{"n": 1}\n')
+    update = follower.poll()
+    assert (update.reset, update.lines) == (ROTATED, b'{"n": 1}\n')
+
+
+def test_follower_catches_up_in_bounded_reads(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileFollower, "READ_LIMIT", 10)
+    path = tmp_path / "app.jsonl"
+    path.write_bytes(b"")
+    follower = FileFollower(str(path))
+    follower.poll()
+    path.write_bytes(b'{"n": 1}\n{"n": 2}\n')
+    lines = []
+    while (update := follower.poll()) is not None or follower.behind:
+        lines.append(update.lines if update else b"")
+    assert b"".join(lines) == b'{"n": 1}\n{"n": 2}\n'
+    assert len(lines) > 1
+
+
+def test_follower_rejects_compressed_files(tmp_path):
+    path = tmp_path / "app.jsonl.gz"
+    path.write_bytes(gzip.compress(b"{}\n"))
+    with pytest.raises(FollowError):
+        FileFollower(str(path)).poll()
+
+
+def test_record_ring_drops_whole_batches():
+    ring = RecordRing(capacity=4)
+    assert not ring.append(2, b"a\nb\n")
+    assert not ring.append(2, b"c\nd\n")
+    assert not ring.append(1, b"e\n")  # A quarter over capacity is tolerated
+    assert ring.append(1, b"f\n")
+    assert (ring.records, ring.to_bytes()) == (4, b"c\nd\ne\nf\n")
+    assert ring.append(9, b"x\n" * 9)  # The newest batch stays, whatever its size
+    assert ring.records == 9 and ring.to_bytes() == b"x\n" * 9
+    ring.clear()
+    assert (ring.records, ring.to_bytes()) == (0, b"")
+
+
+# --- PROFILE ---
+
+
+def test_profile_sizes_add_up_to_minified_document():
+    tree = {"items": [{"id": 1, "name": "a"}, {"id": 22, "tags": ["x", "y"]}], "ok": True}
+    profile = DocumentProfile(tree)
+    assert profile.total_bytes == len(orjson.dumps(tree))
+    item = profile.paths[".items[*]"]
+    assert (item.count, item.items) == (2, 4)
+    assert profile.paths[".items[*].id"].bytes == len(b"122")
+    assert profile.paths[".items[*].tags[*]"].types == {"string": 2}
+    assert profile.keys["id"] == 2
+    assert profile.max_depth == 4
+
+
+def test_profile_folds_map_keys():
+    tree = {str(i): i for i in range(DocumentProfile.MAX_KEYS + 50)}
+    profile = DocumentProfile(tree)
+    assert profile.paths[".*"].count == 50
+    assert profile.total_bytes == len(orjson.dumps(tree))
+    assert [stats.path for stats in profile.sorted_paths("bytes", 1)] == ["."]
+
+
+def test_cli_profile_prints_json_report(tmp_path, capsysbinary):
+    path = tmp_path / "data.json.gz"
+    path.write_bytes(gzip.compress(b'{"a": [1, 2], "b": "text"}'))
+    assert cli.main(["profile", "-n", "2", str(path)]) == 0
+    report = orjson.loads(capsysbinary.readouterr().out)
+    assert report["bytes"] == len(b'{"a":[1,2],"b":"text"}')
+    assert [entry["path"] for entry in report["paths"]] == [".", ".b"]
+    path.write_bytes(b"{bad")
+    assert cli.main(["profile", str(path)]) == 2
+
+
+# --- DOCUMENTS ---
+
+
+def test_document_state_dropped_when_settings_change():
+    tabs = DocumentTabs(max_bytes=10_000)
+    document = tabs.open()
+    tabs.store(document, DocumentState(document.settings, b"{}", None))
+    assert tabs.state_of(document) is not None
+    document.minify = True
+    assert tabs.state_of(document) is None
+
+
+def test_document_states_share_one_budget():
+    tabs = DocumentTabs(max_bytes=300)
+    first, second = tabs.open(), tabs.open()
+    tabs.store(first, DocumentState(first.settings, b"x" * 100, None))
+    tabs.store(second, DocumentState(second.settings, b"y" * 100, None))
+    assert tabs.state_of(first) is None  # Evicted, but the document stays open
+    assert tabs.state_of(second) is not None
+    assert tabs.documents == [first, second]
+    assert tabs.close(second) is first
+    assert tabs.close(first) is None
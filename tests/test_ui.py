@@ -0,0 +1,532 @@
+import asyncio
+
+import pyperclip
+from textual.app import App
+from textual.widgets import Input, Label, Static, Switch, Tabs
+
+from tjson.app import TJSONApp
+from tjson.core.documents import DocumentTabs
+from tjson.core.line_index import LineIndex
+from tjson.core.processor import JSONProcessor
+from tjson.core.structure_index import StructureIndex
+from tjson.services import clipboard
+from tjson.ui.screens import main_screen
+from tjson.ui.screens.diff_screen import DiffScreen
+from tjson.ui.widgets import highlighting_text_area
+from tjson.ui.widgets.editor_pane import EditorPane
+from tjson.ui.widgets.highlighting_text_area import HighlightingTextArea
+from tjson.ui.widgets.output_viewer import LineView, OutputViewer
+from tjson.ui.widgets.perf_hud import PerfHUD
+from tjson.ui.widgets.structure_tree import MoreMembers, StructureTree
+
+
+def run_app(app, test) -> None:
+    """Runs `test(app, pilot)` against `app`, headless."""
+
+    async def main():
+        async with app.run_test(size=(160, 50)) as pilot:
+            await test(app, pilot)
+
+    asyncio.run(main())
+
+
+async def wait_for(pilot, condition, timeout: float = 5.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "timed out"
+        await pilot.pause(0.05)
+
+
+class LineViewApp(App):
+    def compose(self):
+        yield LineView()
+
+
+class StructureTreeApp(App):
+    def compose(self):
+        yield StructureTree()
+
+
+class EditorPaneApp(App):
+    def compose(self):
+        yield EditorPane(title="INPUT", id="input-pane")
+
+
+# --- OUTPUT VIEWER ---
+
+
+def test_line_view_renders_only_the_viewport():
+    lines = [f'  "key{i}": {i},' for i in range(10_000)]
+    index = LineIndex("\n".join(lines).encode())
+
+    async def test(app, pilot):
+        view = app.query_one(LineView)
+        view.load(index)
+        await pilot.pause()
+        assert view.line_count == 10_000
+        assert view.virtual_size.height == 10_000
+        first = "".join(segment.text for segment in view.render_line(0))
+        assert "key0" in first
+        assert first.lstrip().startswith("1 ")  # Gutter with the line number
+        assert len(view._line_cache) <= view.size.height
+
+    run_app(LineViewApp(), test)
+
+
+def test_line_view_cursor_scrolls_and_selects():
+    index = LineIndex("\n".join(f"line {i}" for i in range(1000)).encode())
+
+    async def test(app, pilot):
+        view = app.query_one(LineView)
+        view.load(index)
+        view.focus()
+        await pilot.pause()
+        view.move_cursor(500)
+        await pilot.pause()
+        assert view.cursor_line == 500
+        assert view.scroll_offset.y <= 500 < view.scroll_offset.y + view.size.height
+        view.move_cursor(502, select=True)
+        assert view.selected_lines == (500, 502)
+        view.move_cursor(5000)
+        assert view.cursor_line == 999 and view.selected_lines is None
+
+    run_app(LineViewApp(), test)
+
+
+def test_line_view_windows_long_lines():
+    long_line = "[" + ",".join(str(i) for i in range(20_000)) + "]"
+    index = LineIndex(long_line.encode())
+
+    async def test(app, pilot):
+        view = app.query_one(LineView)
+        view.load(index)
+        await pilot.pause()
+        view.scroll_to(x=50_000, animate=False)
+        await pilot.pause()
+        text = "".join(segment.text for segment in view.render_line(0))
+        offset = int(view.scroll_offset.x)
+        visible = long_line[offset : offset + 10]
+        assert visible in text
+
+    run_app(LineViewApp(), test)
+
+
+# --- STRUCTURE TREE ---
+
+
+def test_structure_tree_lists_members_a_page_at_a_time():
+    data = b"[" + b",".join(b'{"n": %d}' % i for i in range(450)) + b"]"
+
+    async def test(app, pilot):
+        tree = app.query_one(StructureTree)
+        tree.load(StructureIndex(data))
+        root = tree.root
+        assert len(root.children) == StructureTree.PAGE_SIZE + 1
+        more = root.children[-1]
+        assert isinstance(more.data, MoreMembers)
+        assert "250 more" in str(more.label)
+
+        tree.select_node(more)
+        await pilot.pause()
+        assert len(root.children) == 2 * StructureTree.PAGE_SIZE + 1
+        assert root.children[StructureTree.PAGE_SIZE].data.position == StructureTree.PAGE_SIZE
+
+        item = root.children[0]
+        assert not item.children  # Listed on expansion only
+        item.expand()
+        await pilot.pause()
+        assert [str(child.label) for child in item.children] == ["n: 0"]
+
+    run_app(StructureTreeApp(), test)
+
+
+# --- QUERY ---
+
+
+async def run_query(pilot, screen, query: str) -> None:
+    query_input = screen.query_one("#query-input", Input)
+    query_input.focus()
+    query_input.value = query
+    await pilot.press("enter")
+
+
+def test_query_streams_matches_into_output():
+    document = '{"items": [%s]}' % ", ".join('{"id": %d}' % i for i in range(50))
+
+    async def test(app, pilot):
+        screen = app.screen
+        output = screen.query_one("#output-pane", OutputViewer)
+        screen.QUERY_BATCH_BYTES = 64  # Several batches
+        appended = []
+        append = output.append_bytes
+        output.append_bytes = lambda data: (appended.append(data), append(data))
+        screen.query_one("#input-pane").set_text(document)
+        await run_query(pilot, screen, ".items[*].id")
+        expected = b"".join(b"%d\n" % i for i in range(50))
+        await wait_for(pilot, lambda: output.get_bytes() == expected)
+        assert len([data for data in appended if data]) > 1
+
+        await run_query(pilot, screen, "")  # Back to the whole document
+        await wait_for(pilot, lambda: output.get_bytes().startswith(b'{\n  "items"'))
+
+    run_app(TJSONApp(), test)
+
+
+def test_query_on_blank_input_clears_output():
+    async def test(app, pilot):
+        screen = app.screen
+        output = screen.query_one("#output-pane", OutputViewer)
+        editor = screen.query_one("#input-pane")
+        editor.set_text('{"a": [1, 2]}')
+        await run_query(pilot, screen, ".a[*]")
+        await wait_for(pilot, lambda: output.get_bytes() == b"1\n2\n")
+
+        editor.set_text("  \n")
+        await wait_for(pilot, lambda: output.get_bytes() == b"")
+        await wait_for(pilot, lambda: not screen.processing_busy)
+        assert not editor.has_class("error")
+        assert screen.input_error is None
+        assert "Invalid" not in str(output.query_one(".pane-label", Static).render())
+
+    run_app(TJSONApp(), test)
+
+
+# --- HIGHLIGHTING ---
+
+
+def test_highlighting_tier_follows_document_size(monkeypatch):
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_FULL_LIMIT", 1000)
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_VIEWPORT_LIMIT", 10_000)
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_TOKENIZER_LIMIT", 100_000)
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_MARGIN_LINES", 5)
+    lines = 2000  # 25 bytes each
+
+    async def test(app, pilot):
+        pane = app.query_one(EditorPane)
+        text_area = pane.text_area
+
+        pane.set_text('{"a": 1}')
+        await pilot.pause()
+        assert text_area.highlight_tier == "full"
+        assert text_area.match_cursor_bracket
+
+        pane.set_text("[\n" + '  {"key": "value", "n": 1},\n' * (lines // 10) + "  0\n]")
+        await pilot.pause()
+        assert text_area.highlight_tier == "viewport"
+        assert not text_area.match_cursor_bracket
+        first, last = text_area._highlighted_rows
+        assert first == 0 and last <= text_area.size.height + 5
+        assert max(text_area._highlights) <= last
+
+        text_area.scroll_to(0, 150, animate=False)
+        await pilot.pause()
+        first, last = text_area._highlighted_rows
+        assert first <= 150 <= last
+        assert min(text_area._highlights) >= first
+
+        pane.set_text("[\n" + '  {"key": "value", "n": 1},\n' * lines + "  0\n]")
+        await pilot.pause()
+        assert text_area.highlight_tier == "tokenizer"
+        assert text_area.document.__class__.__name__ == "Document"  # No syntax tree
+        assert text_area.get_line(1).spans  # Colored by the line tokenizer
+        assert "Highlight: tokenizer" in str(pane.query_one(".pane-label").render())
+
+        text_area.clear()  # An edit back under the limit re-enables the tree
+        await pilot.pause()
+        assert text_area.highlight_tier == "full"
+        assert text_area.document.__class__.__name__ == "SyntaxAwareDocument"
+
+    run_app(EditorPaneApp(), test)
+
+
+# --- PERF HUD ---
+
+
+def test_perf_hud_lists_recent_runs():
+    async def test(app, pilot):
+        screen = app.screen
+        hud = screen.query_one("#perf-hud", PerfHUD)
+        assert not hud.display
+        screen.query_one("#input-pane").set_text('{"a": 1}')
+        await wait_for(pilot, lambda: [run.kind for run in screen.metrics.latest()] == ["process"])
+        await pilot.press("f2")
+        assert hud.display
+        assert "process" in str(hud.render())
+        await pilot.press("f2")
+        assert not hud.display
+
+    run_app(TJSONApp(), test)
+
+
+# --- PROCESSING ---
+
+
+def test_minify_toggle_on_invalid_input():
+    async def test(app, pilot):
+        JSONProcessor.clear_cache()
+        screen = app.screen
+        screen.query_one("#input-pane").set_text("{bad")
+        await pilot.pause(0.3)
+        minify = screen.query_one("#minify-switch", Switch)
+        # Off again: the same invalid input and mode as the first run (a cache hit)
+        for value in (True, False):
+            minify.value = value
+            await pilot.pause(0.3)
+        assert screen.query_one("#input-pane").has_class("error")
+
+    run_app(TJSONApp(), test)
+
+
+# --- DIFF ---
+
+
+def test_escape_leaves_diff_from_editor():
+    async def test(app, pilot):
+        main = app.screen
+        await pilot.press("f3")
+        await pilot.pause(0.1)
+        assert isinstance(app.screen, DiffScreen)
+        app.screen.query_one("#new-pane").text_area.focus()
+        await pilot.press("escape")
+        await pilot.pause(0.1)
+        assert app.screen is main
+
+    run_app(TJSONApp(), test)
+
+
+# --- CLIPBOARD ---
+
+
+def test_clipboard_errors_are_reported(monkeypatch):
+    def fail(*args):
+        raise pyperclip.PyperclipException("no clipboard mechanism")
+
+    monkeypatch.setattr(clipboard.pyperclip, "paste", fail)
+    monkeypatch.setattr(clipboard.pyperclip, "copy", fail)
+
+    async def test(app, pilot):
+        screen = app.screen
+        notes = []
+        screen.notify = lambda message, **kwargs: notes.append(message)
+        screen.query_one("#input-pane").set_text("[1]")
+        screen.action_paste_from_clipboard()
+        await wait_for(pilot, lambda: not screen.pasting)
+        assert notes == ["Clipboard Error: no clipboard mechanism"]
+        assert screen.query_one("#input-pane").get_text() == "[1]"
+
+        await wait_for(pilot, lambda: screen.query_one("#output-pane", OutputViewer).get_bytes())
+        screen.action_copy()
+        await wait_for(pilot, lambda: not screen.copying)
+        assert notes[-1] == "Clipboard Error: no clipboard mechanism"
+
+    run_app(TJSONApp(), test)
+
+
+def test_paste_skips_content_already_in_the_input(monkeypatch):
+    monkeypatch.setattr(clipboard.pyperclip, "paste", lambda: '{"a": 1}')
+
+    async def test(app, pilot):
+        screen = app.screen
+        notes = []
+        screen.notify = lambda message, **kwargs: notes.append(message)
+        screen.query_one("#input-pane").set_text('{"a": 1}')
+        await wait_for(pilot, lambda: screen.query_one("#output-pane", OutputViewer).get_bytes())
+        screen.action_paste_from_clipboard()
+        await wait_for(pilot, lambda: not screen.pasting)
+        assert notes == ["The clipboard is already in the input"]
+
+    run_app(TJSONApp(), test)
+
+
+# --- SEARCH ---
+
+
+def test_search_steps_through_matches():
+    async def test(app, pilot):
+        screen = app.screen
+        output = screen.query_one("#output-pane", OutputViewer)
+        screen.query_one("#input-pane").set_text('[{"id": 1}, {"id": 2}, {"id": 3}]')
+        await wait_for(pilot, lambda: output.buffer)
+        status = screen.query_one("#search-status", Label)
+        await pilot.press("ctrl+f")
+        await pilot.press(*'"id"', "enter")
+        await wait_for(pilot, lambda: screen.search_match == 0)
+        assert str(status.render()) == "1 / 3"
+        await pilot.press("f4", "f4", "f4")  # Wraps around
+        assert screen.search_match == 0
+        await pilot.press("shift+f4")
+        assert str(status.render()) == "3 / 3"
+        await pilot.press("ctrl+f")
+        assert screen.output_search is None
+
+    run_app(TJSONApp(), test)
+
+
+# --- ERRORS ---
+
+
+def test_goto_error_moves_the_cursor_to_it():
+    async def test(app, pilot):
+        screen = app.screen
+        editor = screen.query_one("#input-pane")
+        editor.set_text('{\n  "a": 1,\n  "b": }')
+        await wait_for(pilot, lambda: screen.input_error is not None)
+        assert (screen.input_error.line, screen.input_error.column) == (3, 8)
+        await pilot.press("f8")
+        assert editor.text_area.cursor_location == (2, 7)
+
+        editor.set_text('{"b": 1}')
+        await wait_for(pilot, lambda: screen.input_error is None)
+        assert not editor.has_class("error")
+
+    run_app(TJSONApp(), test)
+
+
+def test_lone_surrogate_is_reported_as_invalid(monkeypatch):
+    # Tree-sitter can't hold a lone surrogate, a plain (unhighlighted) document can.
+    # Large enough for the region check, which encodes the editor text itself
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_FULL_LIMIT", 0)
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_VIEWPORT_LIMIT", 0)
+    monkeypatch.setattr(highlighting_text_area, "HIGHLIGHT_TOKENIZER_LIMIT", 0)
+    monkeypatch.setattr(main_screen, "INCREMENTAL_VALIDATION_BYTES", 0)
+
+    async def test(app, pilot):
+        screen = app.screen
+        editor = screen.query_one("#input-pane")
+        output = screen.query_one("#output-pane", OutputViewer)
+        editor.set_text('{"a": "\ud800"}')
+        await wait_for(pilot, lambda: screen.input_error is not None)
+        assert "surrogates" in screen.input_error.message
+
+        screen.query_one("#ndjson-switch", Switch).value = True
+        label = output.query_one(".pane-label", Static)
+        await wait_for(pilot, lambda: "1 errors" in str(label.render()))
+
+    run_app(TJSONApp(), test)
+
+
+# --- FOLLOW ---
+
+
+def test_follow_appends_while_saving(tmp_path):
+    log = tmp_path / "service.jsonl"
+    log.write_text('{"n": 1}\n{"n": 2}\n')
+
+    async def test(app, pilot):
+        screen = app.screen
+        output = screen.query_one("#output-pane", OutputViewer)
+        screen.start_follow(str(log))
+        await wait_for(pilot, lambda: output.buffer.count(b'"n"') == 2)
+
+        # Keep a view on the saved buffer, as FileExporter.export does while writing
+        exported = []
+        export = screen.export_output_background
+        screen.export_output_background = lambda exporter, data: (
+            exported.append(memoryview(data)),
+            export(exporter, data),
+        )
+        screen.save_output_to(str(tmp_path / "saved.json"))
+        assert exported
+
+        with log.open("a") as f:
+            f.write('{"n": 3}\n')
+        await wait_for(pilot, lambda: output.buffer.count(b'"n"') == 3)
+        assert screen.follower is not None
+        assert bytes(exported[0]).count(b'"n"') == 2  # A snapshot: it didn't grow
+        exported[0].release()
+
+    run_app(TJSONApp(), test)
+
+
+# --- TABS ---
+
+
+def test_switching_tabs_restores_each_document():
+    async def test(app, pilot):
+        screen = app.screen
+        output = screen.query_one("#output-pane", OutputViewer)
+        editor = screen.query_one("#input-pane")
+        editor.set_text('{"tab": 1}')
+        await wait_for(pilot, lambda: b'"tab": 1' in output.get_bytes())
+        first = screen.document
+
+        await pilot.press("ctrl+n")
+        await wait_for(pilot, lambda: screen.document is not first)
+        second = screen.document
+        assert editor.get_text() == ""
+        editor.set_text('{"tab": 2}')
+        await wait_for(pilot, lambda: b'"tab": 2' in output.get_bytes())
+
+        await pilot.press("ctrl+pageup")
+        await wait_for(pilot, lambda: screen.document is first)
+        assert editor.get_text() == '{"tab": 1}'
+        assert b'"tab": 1' in output.get_bytes()
+        assert screen.query_one("#document-tabs", Tabs).active == first.id
+
+        await pilot.press("ctrl+pagedown")
+        await wait_for(pilot, lambda: screen.document is second)
+        assert editor.get_text() == '{"tab": 2}'
+
+    run_app(TJSONApp(), test)
+
+
+def test_clicking_a_tab_shows_its_document():
+    async def test(app, pilot):
+        screen = app.screen
+        first = screen.document
+        await pilot.press("ctrl+n")
+        await wait_for(pilot, lambda: screen.document is not first)
+        await pilot.click(f"#{first.id}")
+        await wait_for(pilot, lambda: screen.document is first)
+
+    run_app(TJSONApp(), test)
+
+
+def test_closing_the_last_tab_leaves_an_empty_one():
+    async def test(app, pilot):
+        screen = app.screen
+        editor = screen.query_one("#input-pane")
+        editor.set_text('{"a": 1}')
+        await pilot.press("ctrl+n")
+        await wait_for(pilot, lambda: len(screen.tabs.documents) == 2)
+        first, second = screen.tabs.documents
+
+        await pilot.press("ctrl+f4")
+        await wait_for(pilot, lambda: screen.document is first)
+        assert screen.tabs.documents == [first]
+        assert editor.get_text() == '{"a": 1}'
+
+        await pilot.press("ctrl+f4")
+        await wait_for(pilot, lambda: screen.document is not first)
+        assert screen.tabs.documents == [screen.document]
+        assert editor.get_text() == ""
+
+    run_app(TJSONApp(), test)
+
+
+def test_evicted_tab_rebuilds_its_output():
+    async def test(app, pilot):
+        screen = app.screen
+        # Room for one parked document's state (about 3KB with its tree), not two
+        screen.tabs.states = DocumentTabs(max_bytes=5_000).states
+        output = screen.query_one("#output-pane", OutputViewer)
+        editor = screen.query_one("#input-pane")
+        documents = []
+        for n in range(3):
+            if n:
+                await pilot.press("ctrl+n")
+                await wait_for(pilot, lambda: screen.document not in documents)
+            documents.append(screen.document)
+            editor.set_text('{"n": %d, "pad": "%s"}' % (n, "x" * 400))
+            await wait_for(pilot, lambda: b'"n": %d' % n in output.get_bytes())
+
+        first, second, third = documents
+        assert screen.tabs.state_of(first) is None  # Evicted when the second was parked
+        assert screen.tabs.state_of(second) is not None
+
+        screen.switch_document(first)
+        await wait_for(pilot, lambda: b'"n": 0' in output.get_bytes())
+        assert editor.get_text().startswith('{"n": 0')
+
+    run_app(TJSONApp(), test)